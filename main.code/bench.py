@@ -0,0 +1,215 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Benchmark suite
+# Times the game's hot paths against the simulated hardware (no RPi, Tk, or audio needed) and reports
+#  the throughput, per-call latency percentiles, and allocations of each, optionally compared against a stored baseline
+# usage: python3 bench.py [--seconds S] [--rounds N] [--output FILE] [--baseline FILE] [--save-baseline] [--threshold PCT] [NAME ...]
+#################################
+
+# import the puzzle generators, the phases, the simulated hardware, and the game logic
+from bomb_puzzle import genSerial, genKeypadCombination
+from bomb_phases import NumericPhase
+import bomb_sim
+import bomb_game
+# other imports
+import gc
+import sys
+import json
+import random
+import platform
+import tracemalloc
+from time import perf_counter
+from argparse import ArgumentParser
+
+# the name of the reference benchmark
+REFERENCE = "reference"
+# the stored baseline (next to this file)
+BASELINE = f"{__file__.rsplit('/', 1)[0] if '/' in __file__ else '.'}/bench_baseline.json"
+
+###########
+# functions
+###########
+# sets up a headless game (like bomb_game.main, but without running its event loop) and returns it
+# the scanner and keypad driver are stopped, so that the benchmarks step the phases themselves
+def setupGame(seed=0):
+    random.seed(seed)
+    gui = bomb_sim.SimLcd()
+    game = bomb_game.Bomb(bomb_sim.setupComponents(), gui, bomb_sim.SimAudio(), debug=False, dump=False)
+    gui.setup()
+    game.setup_phases()
+    game.scanner._running = False
+    game.keypad._keys.close()
+    game.scanner.join()
+    # the timer has started counting down
+    game.timer.scan()
+    return game
+
+# returns a numeric phase with n simulated pins (in a random state, with a random target)
+def numericPhase(n, seed=0):
+    rng = random.Random(seed)
+    pins = [ bomb_sim.SimPin(rng.random() < 0.5) for i in range(n) ]
+    phase = NumericPhase(f"Numeric{n}", pins, rng.getrandbits(n), n)
+    phase._prev_value = phase._value ^ 1
+    return phase
+
+# returns the benchmarks: name -> function to time (each one is set up once)
+def benchmarks():
+    game = setupGame()
+    wires = numericPhase(5)
+    switches = numericPhase(32, 1)
+
+    # a check_phases pass (the scheduled next pass is dropped, so that the event loop's queue doesn't grow)
+    def check_phases():
+        game.check_phases()
+        game.gui._events.clear()
+
+    # a check_phases pass that has a (timer) value change to handle and draw
+    def check_phases_event():
+        game.timer._publish()
+        check_phases()
+
+    # a fixed workload that doesn't depend on the game: the other benchmarks are compared relative to it,
+    #  so that a machine that is faster or slower overall (or between runs) doesn't look like a change
+    def reference():
+        total = 0
+        for i in range(100):
+            total += i * i
+        return str(total)
+
+    return { REFERENCE: reference,\
+             "genSerial": genSerial,\
+             "genKeypadCombination": genKeypadCombination,\
+             "numeric_get_int_state_5": wires._get_int_state,\
+             "numeric_check_state_5": wires._check_state,\
+             "numeric_get_int_state_32": switches._get_int_state,\
+             "numeric_check_state_32": switches._check_state,\
+             "str_timer": game.timer.__str__,\
+             "str_keypad": game.keypad.__str__,\
+             "str_wires": game.wires.__str__,\
+             "str_button": game.button.__str__,\
+             "str_toggles": game.toggles.__str__,\
+             "check_phases_idle": check_phases,\
+             "check_phases_event": check_phases_event,\
+             "timer_tick": game.timer.scan }
+
+# returns the batch size for a function: enough calls to take at least 200us (so that the timer overhead doesn't matter)
+def batchSize(function):
+    batch = 1
+    while (True):
+        start = perf_counter()
+        for i in range(batch):
+            function()
+        if (perf_counter() - start >= 0.0002):
+            return batch
+        batch *= 2
+
+# times batches of calls to a function for the specified time; returns the per-call times (in seconds) of the batches
+# (the garbage collector is off while timing, like timeit, so that its pauses don't land on random benchmarks)
+def timeBatches(function, batch, seconds):
+    times = []
+    gc.disable()
+    try:
+        began = perf_counter()
+        while (perf_counter() - began < seconds or len(times) < 10):
+            start = perf_counter()
+            for i in range(batch):
+                function()
+            times.append((perf_counter() - start) / batch)
+    finally:
+        gc.enable()
+    return times
+
+# returns the memory allocated (at its peak) and still held after a batch of calls to a function (in bytes)
+def allocations(function, batch):
+    tracemalloc.start()
+    function()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(batch):
+        function()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - before, after - before
+
+# runs the benchmarks (all of them, or the named ones) for about the specified time each
+# the time is split into rounds (each round runs every benchmark once, right after the reference benchmark), and each
+#  benchmark's speed relative to the reference is the median over the rounds of its median per-call time over the
+#  reference's in the same round, which keeps the comparison steady on a noisy (or differently clocked) machine
+# returns the results: name -> the throughput (calls/s), the per-call latency percentiles (us) over all of the rounds,
+#  the best round's median (us), the relative time, and the allocations (bytes) of one batch
+def runBenchmarks(names=None, seconds=0.5, rounds=10):
+    functions = { name: function for name, function in benchmarks().items() if (not names or name in names or name == REFERENCE) }
+    batches = { name: batchSize(function) for name, function in functions.items() }
+    times = { name: [] for name in functions }
+    medians = { name: [] for name in functions }
+    relative = { name: [] for name in functions }
+    for i in range(rounds):
+        for name, function in functions.items():
+            if (name == REFERENCE):
+                continue
+            for timed in (REFERENCE, name):
+                batch = sorted(timeBatches(functions[timed], batches[timed], seconds / rounds / (2 if timed == REFERENCE else 1)))
+                times[timed] += batch
+                medians[timed].append(batch[len(batch) // 2])
+            relative[name].append(medians[name][-1] / medians[REFERENCE][-1])
+    results = {}
+    for name, function in functions.items():
+        batch = sorted(times[name])
+        percentile = lambda p: batch[min(int(len(batch) * p / 100), len(batch) - 1)] * 1000000
+        peak, held = allocations(function, batches[name])
+        results[name] = { "ops_per_sec": len(batch) / sum(batch), "p50_us": percentile(50), "p90_us": percentile(90),\
+                          "p99_us": percentile(99), "best_p50_us": min(medians[name]) * 1000000,\
+                          "relative": (sorted(relative[name])[len(relative[name]) // 2] if relative[name] else 1), "batch": batches[name],\
+                          "alloc_peak_bytes": peak, "alloc_held_bytes": held }
+    return results
+
+# compares the results against the baseline
+# returns name -> the change in the time relative to the reference (e.g., 0.25 -> 25% slower), for the benchmarks in both
+def compare(results, baseline):
+    return { name: result["relative"] / baseline[name]["relative"] - 1 for name, result in results.items()\
+             if name in baseline and name != REFERENCE }
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Benchmarks the game's hot paths on the simulated hardware.")
+    parser.add_argument("names", nargs="*", help="the benchmarks to run (all of them if none are specified)")
+    parser.add_argument("--seconds", type=float, default=1, help="how long to time each benchmark")
+    parser.add_argument("--rounds", type=int, default=10, help="the number of rounds to split that time into")
+    parser.add_argument("--output", default="bench_results.json", help="the file to write the results to (JSON)")
+    parser.add_argument("--baseline", default=BASELINE, help="the baseline results to compare against (JSON)")
+    parser.add_argument("--save-baseline", action="store_true", help="also save the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=25, help="the slowdown (%%) that counts as a regression")
+    args = parser.parse_args()
+
+    results = runBenchmarks(args.names, args.seconds, args.rounds)
+    report = { "python": platform.python_version(), "machine": platform.machine(), "platform": platform.platform(),\
+               "results": results }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if (args.save_baseline):
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+
+    # compare against the baseline (if there is one)
+    try:
+        with open(args.baseline) as f:
+            changes = compare(results, json.load(f)["results"])
+    except FileNotFoundError:
+        changes = {}
+    regressions = []
+    print(f"{'benchmark':<26} {'ops/s':>12} {'p50':>9} {'p90':>9} {'p99':>9} {'best p50':>9} {'alloc':>9} {'vs baseline':>12}")
+    for name, result in results.items():
+        change = ""
+        if (name in changes):
+            change = f"{changes[name] * 100:+.1f}%"
+            if (changes[name] * 100 > args.threshold):
+                regressions.append(name)
+                change += " !"
+        print(f"{name:<26} {result['ops_per_sec']:>12,.0f} {result['p50_us']:>7.2f}us {result['p90_us']:>7.2f}us "\
+              f"{result['p99_us']:>7.2f}us {result['best_p50_us']:>7.2f}us {result['alloc_peak_bytes']:>8}B {change:>12}")
+    print(f"Results written to {args.output}")
+    if (regressions):
+        print(f"Regressions (more than {args.threshold:.0f}% slower than the baseline): {', '.join(regressions)}")
+        sys.exit(1)
@@ -0,0 +1,76 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Numeric phase microbenchmarks
+# Times reading and checking the pin states of a numeric phase (toggles/wires), for the current (bitmask)
+#  implementation and the original (string) one, with 5 to 32 pins
+# usage: python3 bench_phases.py [--number N] [--pins 5 16 32]
+#################################
+
+# import the numeric phase and the simulated pins
+from bomb_phases import NumericPhase
+from bomb_inputs import SimPin
+# other imports
+import random
+from timeit import Timer
+from argparse import ArgumentParser
+
+#########
+# classes
+#########
+# the original (string-based) pin state conversion and check, for comparison
+class LegacyPhase(NumericPhase):
+    def _check_state(self):
+        states = self._get_bool_state()
+        prev_states = [ bool(int(c)) for c in bin(self._prev_value)[2:].zfill(self._display_length) ]
+        valid_states = [ bool(int(c)) for c in bin(self._target)[2:].zfill(self._display_length) ]
+        for i in range(len(states)):
+            if (states[i] != prev_states[i] and states[i] != valid_states[i]):
+                return False
+        return True
+
+    def _get_int_state(self):
+        return int("".join([ str(int(n)) for n in self._get_bool_state() ]), 2)
+
+###########
+# functions
+###########
+# returns a phase of each of the specified classes on the same n (simulated) pins in a random state
+#  (with a random target, and the last pin just changed)
+def makePhases(classes, n):
+    pins = [ SimPin(random.random() < 0.5) for i in range(n) ]
+    target = random.getrandbits(n)
+    phases = [ cls(f"{cls.__name__}{n}", pins, target, n) for cls in classes ]
+    for phase in phases:
+        phase._prev_value = phase._value ^ 1
+    return phases
+
+# returns the time (us) per call of each operation on the phase: name -> time
+def bench(phase, number):
+    return { "read": min(Timer(phase._get_int_state).repeat(5, number)) / number * 1e6,\
+             "check": min(Timer(phase._check_state).repeat(5, number)) / number * 1e6 }
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Times the numeric phase pin state reads and checks.")
+    parser.add_argument("--number", type=int, default=100000, help="the number of calls per timing")
+    parser.add_argument("--pins", type=int, nargs="+", default=[ 5, 16, 32 ], help="the numbers of pins to time")
+    args = parser.parse_args()
+
+    print(f"{'pins':>4} {'op':>6} {'legacy (us)':>12} {'bitmask (us)':>13} {'speedup':>8}")
+    for n in args.pins:
+        legacy, current = makePhases([ LegacyPhase, NumericPhase ], n)
+        # both implementations must agree (also with a target that is wider than the pins, like the wires' initial one)
+        assert legacy._get_int_state() == current._get_int_state() and legacy._check_state() == current._check_state()
+        for phase in (legacy, current):
+            phase._target, target = (1 << n) * 3 + 4, phase._target
+        assert legacy._check_state() == current._check_state()
+        for phase in (legacy, current):
+            phase._target = target
+        before = bench(legacy, args.number)
+        after = bench(current, args.number)
+        for op in before:
+            print(f"{n:>4} {op:>6} {before[op]:>12.3f} {after[op]:>13.3f} {before[op] / after[op]:>7.1f}x")
+        legacy._edges.close()
+        current._edges.close()
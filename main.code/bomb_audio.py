@@ -0,0 +1,105 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Game audio
+#################################
+
+# import the configs
+from bomb_configs import *
+# other imports
+import pygame
+from collections import deque
+from bomb_inputs import EdgeInput
+from bomb_clock import getClock
+
+#########
+# classes
+#########
+# the game audio
+# every sound is decoded once (at startup) and played on a dedicated mixer channel,
+#  so sound effects don't cut off the tick loop (and nothing is reloaded from disk mid-game)
+class Audio:
+    # the dedicated mixer channels
+    CHANNELS = [ "tick", "effects", "alarm", "ding" ]
+    # the sounds: name -> (file, channel, priority)
+    # a sound only interrupts a sound on the same channel that has the same or a lower priority
+    SOUNDS = { "tick": (TICK, "tick", 0),\
+               "strike": (STRIKE, "effects", 1),\
+               "defused": (DEFUSED, "effects", 1),\
+               "ding": (DING, "ding", 0),\
+               "exploding": (EXPLODING, "alarm", 2),\
+               "success": (SUCCESS[1], "alarm", 3),\
+               "explode": (EXPLODE[1], "alarm", 3) }
+
+    def __init__(self, clock=None):
+        # the clock that the event-to-sound latencies are measured with (the events' times are from the same clock)
+        self._clock = (clock or getClock())
+        # reserve the dedicated channels (so that nothing else plays on them)
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), len(Audio.CHANNELS)))
+        pygame.mixer.set_reserved(len(Audio.CHANNELS))
+        self._channels = { name: pygame.mixer.Channel(i) for i, name in enumerate(Audio.CHANNELS) }
+        # the priority of the sound playing on each channel
+        self._priorities = { name: 0 for name in Audio.CHANNELS }
+        # decode every sound
+        self._sounds = { name: pygame.mixer.Sound(file) for name, (file, channel, priority) in Audio.SOUNDS.items() }
+        # the event-to-sound latencies (seconds) of the recent plays of each sound
+        self._latencies = { name: deque(maxlen=EdgeInput.HISTORY) for name in Audio.SOUNDS }
+        # each channel posts an end event when its sound finishes
+        self._end_events = { pygame.USEREVENT + i: name for i, name in enumerate(Audio.CHANNELS) }
+        for event, name in self._end_events.items():
+            self._channels[name].set_endevent(event)
+        # the callbacks waiting for a channel to finish: channel -> [ (callback, args) ]
+        self._waiting = { name: [] for name in Audio.CHANNELS }
+
+    # plays a sound (since is the clock time of the event that triggered it, if known)
+    # returns True if the sound was played
+    def play(self, name, loops=0, since=None):
+        file, channel, priority = Audio.SOUNDS[name]
+        # don't interrupt a more important sound
+        if (self._channels[channel].get_busy() and priority < self._priorities[channel]):
+            return False
+        self._channels[channel].play(self._sounds[name], loops)
+        self._priorities[channel] = priority
+        # only the sounds that an event triggered have an event-to-sound latency
+        if (since is not None):
+            self._latencies[name].append(self._clock.now() - since)
+        return True
+
+    # stops the sound playing on a channel
+    def stop(self, channel):
+        self._channels[channel].stop()
+
+    # is a sound playing on the channel?
+    def busy(self, channel):
+        return self._channels[channel].get_busy()
+
+    # calls the callback once the sound playing on the channel finishes (right away if nothing is playing)
+    # the callback is called from pump, so it runs on whichever thread pumps the audio (i.e., the GUI thread)
+    def when_done(self, channel, callback, *args):
+        self._waiting[channel].append((callback, args))
+
+    # handles the end events of the channels; returns True if a callback is still waiting
+    def pump(self):
+        finished = set()
+        try:
+            for event in pygame.event.get(list(self._end_events)):
+                finished.add(self._end_events[event.type])
+        # no event queue (e.g., no video system): just check which channels are idle
+        except pygame.error:
+            pass
+        waiting = False
+        for channel, callbacks in self._waiting.items():
+            if (callbacks and (channel in finished or not self.busy(channel))):
+                self._waiting[channel] = []
+                for callback, args in callbacks:
+                    callback(*args)
+            waiting = waiting or bool(self._waiting[channel])
+        return waiting
+
+    # returns the event-to-sound latency report as a string
+    def report(self):
+        lines = []
+        for name, latencies in self._latencies.items():
+            if (latencies):
+                average = sum(latencies) / len(latencies)
+                lines.append(f"Audio {name}: {len(latencies)} plays, event-to-sound latency avg={average * 1000:.3f}ms max={max(latencies) * 1000:.3f}ms")
+        return "\n".join(lines)
@@ -0,0 +1,189 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Puzzle bank
+# A precomputed file of fixed-size puzzle records, grouped (and indexed) by their attributes, that the game
+#  memory-maps at boot to pick a puzzle in constant time (without repeating one until its group runs out)
+# usage: python3 bomb_bank.py build [--count N] [--seed S] [--file FILE]   (offline; needs NumPy)
+#        python3 bomb_bank.py pick [--file FILE] [--toggles N] [--keypad-length N] [--color R|G|B]
+#        python3 bomb_bank.py stats [--file FILE]
+#################################
+
+# import the configs and the puzzle keywords and pushbutton colors
+from bomb_configs import *
+from bomb_puzzle import KEYWORDS, BUTTON_COLORS
+# other imports
+import os
+import mmap
+import json
+import struct
+from random import randrange
+from argparse import ArgumentParser
+
+#########
+# classes
+#########
+# the puzzle bank
+# the file is laid out as: a header, the group index, then the records (sorted by group, shuffled within each group)
+#  header: magic, version, number of records, number of groups
+#  group index: toggles target, wires to cut, keypad combination length, pushbutton color, first record, number of records
+#  record: serial, cipher, toggles target, wires target, wires to cut, keypad combination length, pushbutton color,
+#          keyword, rot, keypad combination
+class PuzzleBank:
+    MAGIC = b"BOMBBANK"
+    VERSION = 1
+    HEADER = struct.Struct("<8sHII")
+    GROUP = struct.Struct("<4BII")
+    SERIAL = 24
+    RECORD = struct.Struct(f"<{SERIAL}s6s7BxI")
+    # the attributes that the puzzles are grouped by (in the order of the group key)
+    ATTRIBUTES = [ "toggles_target", "wires_to_cut", "keypad_length", "button_color" ]
+
+    def __init__(self, file=PUZZLE_BANK):
+        self._file = file
+        with open(file, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count, groups = PuzzleBank.HEADER.unpack_from(self._map, 0)
+        if (magic != PuzzleBank.MAGIC or version != PuzzleBank.VERSION):
+            raise ValueError(f"{file} is not a puzzle bank (version {PuzzleBank.VERSION})")
+        # the groups: key -> (first record, number of records)
+        self._groups = {}
+        offset = PuzzleBank.HEADER.size
+        for i in range(groups):
+            *key, first, count = PuzzleBank.GROUP.unpack_from(self._map, offset)
+            self._groups[tuple(key)] = (first, count)
+            offset += PuzzleBank.GROUP.size
+        self._records = offset
+        # the next record of each group (kept in a small state file so that puzzles aren't repeated across boots)
+        self._state = f"{file}.state"
+        self._cursors = {}
+        # the last record picked
+        self.last = None
+        if (os.path.exists(self._state)):
+            with open(self._state) as f:
+                self._cursors = { tuple(json.loads(key)): cursor for key, cursor in json.load(f).items() }
+
+    # the number of puzzles in the bank
+    def __len__(self):
+        return self._count
+
+    # returns the keys of the groups that match the specified attributes (None -> any value)
+    def groups(self, toggles_target=None, wires_to_cut=None, keypad_length=None, button_color=None):
+        wanted = (toggles_target, wires_to_cut, keypad_length, (BUTTON_COLORS.index(button_color) if button_color else None))
+        return [ key for key in self._groups if all(w is None or w == k for w, k in zip(wanted, key)) ]
+
+    # picks a puzzle with the specified attributes (see groups)
+    # each group is used in (pre-shuffled) order, so a puzzle isn't repeated until all of its group has been used
+    # returns serial, toggles_target, wires_target, keyword, cipher_keyword, rot, keypad_target, passphrase, button_color
+    def pick(self, **attributes):
+        keys = self.groups(**attributes)
+        if (not keys):
+            raise LookupError(f"No puzzles match {attributes}")
+        # pick a group (weighted by its size, so that every matching puzzle is as likely)
+        n = randrange(sum(self._groups[key][1] for key in keys))
+        for key in keys:
+            first, count = self._groups[key]
+            if (n < count):
+                break
+            n -= count
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        self._save()
+        self.last = first + cursor % count
+        return self.record(self.last)
+
+    # returns record i
+    def record(self, i):
+        serial, cipher, toggles_target, wires_target, wires_to_cut, keypad_length, button_color, keyword, rot, keypad_target =\
+            PuzzleBank.RECORD.unpack_from(self._map, self._records + i * PuzzleBank.RECORD.size)
+        keyword = list(KEYWORDS)[keyword]
+        return serial.rstrip(b"\x00").decode(), toggles_target, wires_target, keyword, cipher.decode(), rot,\
+               str(keypad_target), KEYWORDS[keyword], BUTTON_COLORS[button_color]
+
+    # saves the group cursors (only internally called)
+    def _save(self):
+        with open(self._state, "w") as f:
+            json.dump({ json.dumps(list(key)): cursor for key, cursor in self._cursors.items() }, f)
+
+    # returns the size of each group: key -> number of records
+    def stats(self):
+        return { key: count for key, (first, count) in self._groups.items() }
+
+###########
+# functions
+###########
+# builds a puzzle bank of (up to) count puzzles with the bulk generator (offline; needs NumPy)
+# returns the number of puzzles written (puzzles whose serial doesn't fit in a record are left out)
+def buildBank(file=PUZZLE_BANK, count=1000000, seed=None):
+    import numpy as np
+    from bomb_batch import genBombs
+
+    bombs = genBombs(count, seed)
+    serial_width = PuzzleBank.SERIAL
+    # leave out the (very rare) serials that don't fit
+    fits = (bombs["serial_length"] <= serial_width)
+    bombs = { name: values[fits] for name, values in bombs.items() }
+    count = int(fits.sum())
+    # the group attributes
+    keypad_length = np.floor(np.log10(bombs["keypad_target"])).astype(np.int64) + 1
+    wires_to_cut = np.full(count, 3)
+    keys = np.stack([ bombs["toggles_target"], wires_to_cut, keypad_length, bombs["button_color"] ], axis=1)
+    # sort the records by group (the bombs are already in random order, and the sort is stable, so each group stays shuffled)
+    order = np.lexsort(keys.T[::-1])
+    keys = keys[order]
+
+    # the records
+    dtype = np.dtype([ ("serial", f"S{serial_width}"), ("cipher", "S6"), ("toggles_target", "u1"), ("wires_target", "u1"),\
+                       ("wires_to_cut", "u1"), ("keypad_length", "u1"), ("button_color", "u1"), ("keyword", "u1"),\
+                       ("rot", "u1"), ("pad", "u1"), ("keypad_target", "<u4") ])
+    assert dtype.itemsize == PuzzleBank.RECORD.size
+    records = np.zeros(count, dtype=dtype)
+    serial = np.zeros((count, serial_width), dtype=np.uint8)
+    serial[:, :bombs["serial"].shape[1]] = bombs["serial"][:, :serial_width]
+    records["serial"] = serial[order].view(f"S{serial_width}").ravel()
+    records["cipher"] = bombs["cipher"][order].view("S6").ravel()
+    records["toggles_target"] = keys[:, 0]
+    records["wires_target"] = bombs["wires_target"][order]
+    records["wires_to_cut"] = keys[:, 1]
+    records["keypad_length"] = keys[:, 2]
+    records["button_color"] = keys[:, 3]
+    records["keyword"] = bombs["keyword"][order]
+    records["rot"] = bombs["rot"][order]
+    records["keypad_target"] = bombs["keypad_target"][order]
+
+    # the group index
+    starts = np.flatnonzero(np.r_[True, (keys[1:] != keys[:-1]).any(axis=1)])
+    counts = np.diff(np.r_[starts, count])
+    with open(file, "wb") as f:
+        f.write(PuzzleBank.HEADER.pack(PuzzleBank.MAGIC, PuzzleBank.VERSION, count, len(starts)))
+        for start, n in zip(starts, counts):
+            f.write(PuzzleBank.GROUP.pack(*(int(k) for k in keys[start]), int(start), int(n)))
+        records.tofile(f)
+    # a new bank starts over
+    if (os.path.exists(f"{file}.state")):
+        os.remove(f"{file}.state")
+    return count
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Builds and queries the puzzle bank.")
+    parser.add_argument("command", choices=[ "build", "pick", "stats" ])
+    parser.add_argument("--file", default=PUZZLE_BANK, help="the puzzle bank file")
+    parser.add_argument("--count", type=int, default=1000000, help="the number of puzzles to build")
+    parser.add_argument("--seed", type=int, default=None, help="the random seed to build with")
+    parser.add_argument("--toggles", type=int, default=None, help="pick a puzzle with this toggles target")
+    parser.add_argument("--keypad-length", type=int, default=None, help="pick a puzzle with this keypad combination length")
+    parser.add_argument("--color", choices=BUTTON_COLORS, default=None, help="pick a puzzle with this pushbutton color")
+    args = parser.parse_args()
+
+    if (args.command == "build"):
+        count = buildBank(args.file, args.count, args.seed)
+        print(f"Built {args.file}: {count} puzzles, {os.path.getsize(args.file) // 1024}KB")
+    elif (args.command == "pick"):
+        print(PuzzleBank(args.file).pick(toggles_target=args.toggles, keypad_length=args.keypad_length, button_color=args.color))
+    else:
+        bank = PuzzleBank(args.file)
+        print(f"{args.file}: {len(bank)} puzzles")
+        for key, count in sorted(bank.stats().items()):
+            print("  " + ", ".join(f"{name}={value}" for name, value in zip(PuzzleBank.ATTRIBUTES, key)) + f": {count}")
@@ -0,0 +1,169 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Bulk puzzle generator
+# Generates many complete bomb configurations at once with NumPy array operations
+#  (same distribution as genSerial/genKeypadCombination/the button color in genBomb, but seedable and much faster)
+# usage: python3 bomb_batch.py [--count N] [--seed S] [--save FILE.npz] [--check N]
+#################################
+
+# import the scalar puzzle generators (and their keywords and pushbutton colors)
+from bomb_puzzle import *
+# other imports
+import random
+from argparse import ArgumentParser
+from collections import Counter
+from time import perf_counter
+# NumPy is only needed for the bulk generator (not to play the game)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# the hexadecimal digits (as the keypad cipher displays them)
+HEX_DIGITS = b"0123456789ABCDEF"
+
+###########
+# functions
+###########
+# generates count complete bomb configurations
+# returns a dict of arrays (one entry per bomb):
+#  serial: the serial numbers as ASCII codes (count x width, padded with 0s), serial_length: their lengths
+#  toggles_target, wires_target: the toggles and wires phase defuse values
+#  keyword: the index of the keyword (in KEYWORDS), rot: the rotation cipher key
+#  cipher: the hexadecimal cipher as ASCII codes (count x 6), keypad_target: the keypad combination (as an integer)
+#  button_color: the index of the pushbutton color (in BUTTON_COLORS)
+def genBombs(count, seed=None):
+    if (np is None):
+        raise ImportError("The bulk puzzle generator needs NumPy (pip3 install numpy).")
+    rng = np.random.default_rng(seed)
+
+    ## genSerial
+    # the sum of the digits is the toggle value (1..15)
+    toggles_target = rng.integers(1, 16, count)
+    # draw the digits one column at a time (for the bombs that still need one)
+    #  (a bomb needs another digit while it has fewer than 3 or its digits don't sum to the toggle value yet)
+    remaining = toggles_target.copy()
+    num_digits = np.zeros(count, dtype=np.int64)
+    columns = []
+    drawing = np.arange(count)
+    while (drawing.size):
+        digits = rng.integers(0, np.minimum(9, remaining[drawing]) + 1)
+        column = np.full(count, -1, dtype=np.int64)
+        column[drawing] = digits
+        columns.append(column)
+        remaining[drawing] -= digits
+        num_digits[drawing] += 1
+        drawing = drawing[(num_digits[drawing] < 3) | (remaining[drawing] > 0)]
+    digits = np.stack(columns, axis=1)
+
+    # the jumper wires to "cut": 3 distinct wires (0..4)
+    #  setting random wires until 3 are set picks each set of 3 wires with the same probability,
+    #  which is the same as picking the first 3 wires of a random ordering
+    wires = np.sort(np.argsort(rng.random((count, 5)), axis=1)[:, :3], axis=1)
+    # the wires target is fixed (the toggles phase rewrites it)
+    wires_target = np.full(count, 100, dtype=np.int64)
+
+    # form the serial number (digits + jumper letters) and shuffle it
+    #  sorting random keys (with the padding sorted last) gives each bomb a uniformly random ordering of its characters
+    items = np.concatenate([ np.where(digits >= 0, digits + ord("0"), 0), wires + ord("A") ], axis=1)
+    valid = np.concatenate([ digits >= 0, np.ones((count, 3), dtype=bool) ], axis=1)
+    keys = rng.random(items.shape)
+    keys[~valid] = 2
+    items = np.take_along_axis(items, np.argsort(keys, axis=1), axis=1)
+    # finally, add a final letter (F..Z)
+    length = num_digits + 3
+    serial = np.zeros((count, items.shape[1] + 1), dtype=np.uint8)
+    serial[:, :-1] = np.where(np.arange(items.shape[1]) < length[:, None], items, 0)
+    serial[np.arange(count), length] = rng.integers(70, 91, count)
+
+    ## genKeypadCombination
+    # the rotation cipher key and the keyword
+    rot = rng.integers(1, 26, count)
+    keyword = rng.integers(0, len(KEYWORDS), count)
+    # the three random hexadecimal values (16..100), and their product (the keypad combination)
+    values = rng.integers(16, 101, (count, 3))
+    keypad_target = values.prod(axis=1)
+    # the cipher is the three values in (two-digit, uppercase) hexadecimal
+    table = np.frombuffer(HEX_DIGITS, dtype=np.uint8)
+    cipher = np.stack([ table[values >> 4], table[values & 15] ], axis=2).reshape(count, 6)
+
+    ## the pushbutton color
+    button_color = rng.integers(0, len(BUTTON_COLORS), count)
+
+    return { "serial": serial, "serial_length": length + 1, "toggles_target": toggles_target, "wires_target": wires_target,\
+             "keyword": keyword, "rot": rot, "cipher": cipher, "keypad_target": keypad_target, "button_color": button_color }
+
+# returns the configuration of bomb i (in the same form as genSerial/genKeypadCombination/genBomb)
+#  serial, toggles_target, wires_target, keyword, cipher_keyword, rot, keypad_target, passphrase, button_color
+def getBomb(bombs, i):
+    keyword = list(KEYWORDS)[bombs["keyword"][i]]
+    serial = bytes(bombs["serial"][i, :bombs["serial_length"][i]]).decode()
+    return serial, int(bombs["toggles_target"][i]), int(bombs["wires_target"][i]), keyword, bytes(bombs["cipher"][i]).decode(),\
+           int(bombs["rot"][i]), str(bombs["keypad_target"][i]), KEYWORDS[keyword], BUTTON_COLORS[bombs["button_color"][i]]
+
+# generates count configurations with the scalar generators (the same way genBomb does)
+def genScalarBombs(count, seed=None):
+    rng = random.Random(seed)
+    bombs = []
+    for i in range(count):
+        serial, toggles_target, wires_target = genSerial(rng)
+        keyword, cipher_keyword, rot, keypad_target, passphrase = genKeypadCombination(rng)
+        bombs.append((serial, toggles_target, wires_target, keyword, cipher_keyword, rot, keypad_target, passphrase, rng.choice(BUTTON_COLORS)))
+    return bombs
+
+# returns the features whose distributions are compared: name -> function of a configuration
+def features():
+    return { "toggles target": lambda b: b[1],\
+             "wires target": lambda b: b[2],\
+             "serial length": lambda b: len(b[0]),\
+             "serial digits": lambda b: "".join(sorted(c for c in b[0][:-1] if c.isdigit())),\
+             "jumper letters": lambda b: "".join(sorted(c for c in b[0][:-1] if c.isalpha())),\
+             "serial first character": lambda b: ("digit" if b[0][0].isdigit() else "letter"),\
+             "serial letter positions": lambda b: "".join("L" if c.isalpha() else "d" for c in b[0][:-1]),\
+             "final letter": lambda b: b[0][-1],\
+             "keyword": lambda b: b[3],\
+             "rot": lambda b: b[5],\
+             "cipher first value": lambda b: b[4][:2],\
+             "keypad target length": lambda b: len(b[6]),\
+             "keypad target last digit": lambda b: b[6][-1],\
+             "button color": lambda b: b[8] }
+
+# returns the total variation distance between the distributions of a feature in two equally sized samples
+def distance(feature, a, b):
+    a = Counter(feature(bomb) for bomb in a)
+    b = Counter(feature(bomb) for bomb in b)
+    return sum(abs(a[k] - b[k]) for k in set(a) | set(b)) / (2 * sum(a.values()))
+
+# compares the distributions of the scalar and bulk generators (count configurations each)
+# returns name -> (the distance between the scalar and bulk samples, the distance between two scalar samples)
+#  the second distance is the sampling noise: the first should be about the same
+def compareGenerators(count, seed=0):
+    scalar = genScalarBombs(count, seed)
+    noise = genScalarBombs(count, seed + 1)
+    bombs = genBombs(count, seed)
+    bulk = [ getBomb(bombs, i) for i in range(count) ]
+    return { name: (distance(feature, scalar, bulk), distance(feature, scalar, noise)) for name, feature in features().items() }
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Generates bomb configurations in bulk.")
+    parser.add_argument("--count", type=int, default=1000000, help="the number of configurations to generate")
+    parser.add_argument("--seed", type=int, default=None, help="the random seed")
+    parser.add_argument("--save", help="save the configurations to this .npz file")
+    parser.add_argument("--check", type=int, default=0, help="compare the distribution against the scalar generators (N each)")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    bombs = genBombs(args.count, args.seed)
+    elapsed = perf_counter() - start
+    print(f"Generated {args.count} configurations in {elapsed:.2f}s ({args.count / elapsed:,.0f}/s)")
+    print(f"Example: {getBomb(bombs, 0)}")
+    if (args.save):
+        np.savez_compressed(args.save, **bombs)
+        print(f"Saved to {args.save}")
+    if (args.check):
+        print(f"Total variation distance vs the scalar generators ({args.check} each; noise = scalar vs scalar):")
+        for name, (bulk, noise) in compareGenerators(args.check, args.seed or 0).items():
+            print(f"  {name:<26} {bulk:.4f} (noise {noise:.4f})")
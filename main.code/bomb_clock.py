@@ -0,0 +1,163 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Clocks
+# The phases, the timer, the input engine, and the headless GUI's event loop all tell time (and wait) through a clock:
+#  the real clock, a scaled clock (that runs N times faster than real time), or a virtual clock (that jumps straight to
+#  whatever happens next, so that a headless game runs as fast as the CPU allows)
+#################################
+
+# other imports
+from math import nextafter, inf
+from threading import Thread
+from heapq import heappush, heappop
+from time import sleep, perf_counter
+
+#########
+# classes
+#########
+# the real clock
+# its time is the perf_counter (which is monotonic), and each loop runs in its own thread
+class Clock:
+    def __init__(self):
+        # the current time (in seconds); the real clock's is the perf_counter itself (so that reading it costs nothing extra)
+        self.now = perf_counter
+
+    # waits for the specified time (in seconds)
+    def sleep(self, seconds):
+        if (seconds > 0):
+            sleep(seconds)
+
+    # waits for an event to be set (or the timeout, in seconds); returns whether it was set
+    def wait(self, event, timeout=None):
+        return event.wait(timeout)
+
+    # runs a loop (in its own thread): step is called, then again once the time that it returns (in seconds) is up
+    #  or when the (optional) wake event is set; the loop stops when step returns None
+    # returns the loop's thread
+    def loop(self, name, step, wake=None):
+        thread = Thread(name=name, target=self._loop, args=(step, wake), daemon=True)
+        thread.start()
+        return thread
+
+    # runs a loop's steps (only internally called)
+    def _loop(self, step, wake):
+        while (True):
+            delay = step()
+            if (delay is None):
+                return
+            if (wake is None):
+                self.sleep(delay)
+            else:
+                self.wait(wake, max(delay, 0))
+                wake.clear()
+
+    # returns the clock report as a string
+    def report(self):
+        return "Clock: real"
+
+# the scaled clock
+# it runs the specified number of times faster than real time (its time starts at 0)
+class ScaledClock(Clock):
+    def __init__(self, speed):
+        self._speed = speed
+        self._start = perf_counter()
+
+    def now(self):
+        return (perf_counter() - self._start) * self._speed
+
+    def sleep(self, seconds):
+        if (seconds > 0):
+            sleep(seconds / self._speed)
+
+    def wait(self, event, timeout=None):
+        return event.wait(timeout / self._speed if timeout is not None else None)
+
+    def report(self):
+        return f"Clock: {self._speed:g}x real time, {self.now():.3f}s simulated"
+
+# the virtual clock
+# its time only moves when the main (event) loop sleeps, and then jumps from one loop step to the next
+# everything runs on the main thread: the loops are stepped in time order (and right away when they are woken)
+class VirtualClock(Clock):
+    def __init__(self, start=0):
+        self._now = start
+        # the loops: [ [ the order of its scheduled step, step, wake ] ], and the scheduled steps: [ (time, order, loop) ]
+        self._loops = []
+        self._steps = []
+        self._order = 0
+        # the number of steps run (for the report)
+        self._stepped = 0
+
+    def now(self):
+        return self._now
+
+    # moves the time forward, stepping the loops that are due (or woken) on the way
+    def sleep(self, seconds):
+        self.advance(self._now + max(seconds, 0))
+
+    # nothing else can set the event while the main thread waits, so this doesn't wait
+    def wait(self, event, timeout=None):
+        return event.is_set()
+
+    # adds a loop (it is first stepped at the current time); there is no thread
+    def loop(self, name, step, wake=None):
+        loop = [ None, step, wake ]
+        self._loops.append(loop)
+        self._schedule(loop, 0)
+        return None
+
+    # schedules a loop's next step (only internally called)
+    # a delay that is too small to move the time (next to a large time) still moves it, so that a loop can't stall it
+    def _schedule(self, loop, delay):
+        when = self._now + max(delay, 0)
+        if (delay > 0 and when == self._now):
+            when = nextafter(self._now, inf)
+        self._order += 1
+        loop[0] = self._order
+        heappush(self._steps, (when, self._order, loop))
+
+    # steps a loop, and schedules its next step (or drops it) (only internally called)
+    def _step(self, loop):
+        self._stepped += 1
+        delay = loop[1]()
+        if (delay is None):
+            loop[0] = None
+            self._loops.remove(loop)
+        else:
+            self._schedule(loop, delay)
+
+    # moves the time forward to the specified time
+    def advance(self, until):
+        while (True):
+            # the woken loops are stepped right away
+            for loop in list(self._loops):
+                if (loop[2] is not None and loop[2].is_set()):
+                    loop[2].clear()
+                    self._step(loop)
+            # step the next loop that is due (its scheduled step is stale if it was woken since)
+            if (not self._steps or self._steps[0][0] > until):
+                break
+            when, order, loop = heappop(self._steps)
+            if (loop[0] == order):
+                self._now = max(self._now, when)
+                self._step(loop)
+        self._now = max(self._now, until)
+
+    # returns the clock report as a string
+    def report(self):
+        return f"Clock: virtual, {self._now:.3f}s simulated, {self._stepped} loop steps"
+
+###########
+# functions
+###########
+# the clock that is used when none is specified
+_clock = Clock()
+
+# returns the clock that is used when none is specified
+def getClock():
+    return _clock
+
+# sets the clock that is used when none is specified (from now on)
+def setClock(clock):
+    global _clock
+    _clock = clock
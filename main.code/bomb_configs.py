@@ -0,0 +1,40 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Configuration file
+#################################
+
+# constants
+DEBUG = True        # debug mode?
+RPi = True           # is this running on the RPi?
+ANIMATE = False       # animate the LCD text?
+SHOW_BUTTONS = True  # show the Pause and Quit buttons on the main LCD GUI?
+COUNTDOWN = 120      # the initial bomb countdown value (seconds)
+SCAN_RATE = 50       # the rate (Hz) at which the scanner checks the components
+EVENT_QUEUE = 256    # the most phase events (strikes, defusals, value changes) that can wait for the GUI
+KEYPAD_RATE = 200    # the rate (Hz) at which the keypad driver scans the keypad matrix while a key is down (or settling)
+KEYPAD_IDLE_RATE = 50  # the rate (Hz) at which it scans the keypad otherwise (at most SCAN_RATE, so that it doesn't wake the scanner)
+KEYPAD_DEBOUNCE = 2  # the number of scans that a key press/release must last for (debouncing)
+KEYPAD_QUEUE = 32    # the most key events that can be typed ahead of the keypad phase
+BUTTON_DEBOUNCE = 0.005  # the time (seconds) that the pushbutton takes to stop bouncing after a press/release
+LONG_PRESS = 1.0         # the time (seconds) that the pushbutton must be held for a long press
+MULTI_CLICK = 0.4        # the most time (seconds) between the clicks of a multi-click series
+NUM_STRIKES = 3      # the total strikes allowed before the bomb "explodes"
+NUM_PHASES = 4       # the total number of initial active bomb phases
+# the various image and audio files
+EXPLODE = [ "./images/explosion.png", "./audio/creeper-explosion.mp3" ]
+SUCCESS = [ "./images/defused.png", "./audio/Victory.mp3" ]
+EXPLODING = "./audio/exploding.mp3"
+STRIKE = "./audio/oof.mp3"
+DEFUSED = "./audio/defused.mp3"
+TICK = "./audio/tick.mp3"
+DING = "./audio/ding.mp3"
+AUDIO_BUFFER = 512   # the mixer buffer size (samples); smaller -> lower sound latency
+AUDIO_PUMP = 20      # how often (ms) the GUI checks for finished sounds while it waits on one
+IMAGE_CACHE = "./images/cache"   # the pre-scaled images (built by build_assets.py)
+IMAGE_SIZE = (800, 360)          # the largest size of an image (fits the LCD above the conclusion buttons)
+IMAGE_MEMORY = 4 * 1024 * 1024   # the most memory (bytes) that the decoded images may use
+PUZZLE_BANK = "./puzzles.bank"   # the precomputed puzzle bank (built by bomb_bank.py; the puzzles are generated if it's missing)
+PUZZLE_FILTER = {}               # the attributes of the puzzles to pick from the bank (e.g., { "toggles_target": 7, "button_color": "B" })
+TELEMETRY_DB = "./telemetry.db"  # the session telemetry database (with --telemetry; see bomb_telemetry.py)
+FLIGHT_RECORDS = 4096            # the records kept by the flight recorder per producer thread (16 bytes each)
+FLIGHT_DUMP = "./flight.dump"    # the file that the flight recorder is dumped to (with --flight-dump; see bomb_flight.py)
@@ -0,0 +1,386 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Vectorized game engine
+# Plays many games at once: every bomb's state (its timer, strikes, active phases, and each phase's value and target)
+#  is held in NumPy arrays (one entry per bomb), and the bombs are advanced together with array operations, following
+#  the game's rules (check_phases, strike, and defused in bomb_game.py) one GUI frame at a time
+# Each bomb only needs to be looked at on the frames that something happens at (a player's input, the wires being
+#  checked again, or the countdown expiring), so each step advances every bomb to its own next such frame
+# usage: python3 bomb_engine.py [--games N] [--countdown S ...] [--strikes N ...] [--speedups I2,I1 ...]
+#                               [--rate R] [--accuracy P] [--seed S] [--check N]
+#################################
+
+# import the configs and the puzzle generators (and their pushbutton colors)
+from bomb_configs import *
+from bomb_puzzle import BUTTON_COLORS
+# other imports
+import sys
+import random
+from itertools import product
+from time import perf_counter
+from argparse import ArgumentParser
+# NumPy is only needed for the engine (not to play the game)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# the GUI checks the phases every 100ms (check_phases)
+FRAME = 100
+# the phases start 2s after the game does (the bootup text is shown after 1s, and the phases are set up 1s later)
+BOOT = 2.0
+# the phases (a bit each in a bomb's defused phases), in the order that a player works on them
+#  (the toggles come first, since defusing them sets the wires target)
+TOGGLES, WIRES, KEYPAD, BUTTON = 1, 2, 4, 8
+ORDER = [ TOGGLES, WIRES, KEYPAD, BUTTON ]
+# the most digits of a keypad combination (100 * 100 * 100)
+DIGITS = 7
+# a frame that never comes
+NEVER = 2 ** 31 - 1
+
+###########
+# functions
+###########
+# returns a random set bit of each mask (0 if none is set); the masks have up to 5 bits
+def pickBits(masks, rng):
+    bits = np.array([ [ 1 << b for b in range(5) if (m >> b) & 1 ] + [ 0 ] * (5 - bin(m).count("1")) for m in range(32) ])
+    counts = np.array([ bin(m).count("1") for m in range(32) ])
+    return bits[masks, (rng.random(len(masks)) * counts[masks]).astype(np.int64)]
+
+# returns the sum of the digits of each value
+def digitSums(values):
+    total = np.zeros(len(values), dtype=np.int64)
+    while (values.any()):
+        total += values % 10
+        values = values // 10
+    return total
+
+# returns the number of phases in each mask of phases
+def phaseCounts(masks):
+    return (masks & 1) + ((masks >> 1) & 1) + ((masks >> 2) & 1) + ((masks >> 3) & 1)
+
+#########
+# classes
+#########
+# the engine (the state of every bomb is an array)
+# puzzles -> the bombs' puzzles: toggles_target, keypad_target (an integer), and button_color (an index in BUTTON_COLORS)
+#  (like genBombs in bomb_batch.py returns)
+# countdown, strikes -> the countdown (s) and strikes of each bomb (a value for all of them, or one per bomb)
+# speedups -> the length of a tick (s) once 2 strikes are left and once 1 is left (a pair for all bombs, or one per bomb)
+# start -> when the phases started (the frames are timed from it, each one 100ms after the last, like the GUI's)
+class Engine:
+    def __init__(self, puzzles, countdown=COUNTDOWN, strikes=NUM_STRIKES, speedups=(0.5, 0.25), start=0.0):
+        if (np is None):
+            raise ImportError("The vectorized engine needs NumPy (pip3 install numpy).")
+        self.count = count = len(puzzles["toggles_target"])
+        full = lambda value, dtype: np.array(np.broadcast_to(np.asarray(value, dtype=dtype), (count,)))
+        # the timer: the countdown (in ticks) that remained at the anchor time, the anchor time, and the length of a tick
+        #  (the countdown is deadline-based, like the Timer's)
+        self._remaining = full(countdown, np.float64)
+        self._anchor = np.full(count, float(start))
+        self._tick = np.ones(count)
+        self._speedups = np.array(np.broadcast_to(np.asarray(speedups, dtype=np.float64), (count, 2)))
+        # the strikes left, the active phases, and the defused phases (a mask of phases)
+        self.strikes_left = full(strikes, np.int64)
+        self.active_phases = np.full(count, NUM_PHASES, dtype=np.int64)
+        self._defused = np.zeros(count, dtype=np.int64)
+        # the toggle switches (down) and jumper wires (connected) as bitmasks (the first pin is the most significant bit),
+        #  and their targets (the wires target is only reachable once the toggles phase rewrites it)
+        self._toggles = np.zeros(count, dtype=np.int64)
+        self._toggles_target = np.asarray(puzzles["toggles_target"], dtype=np.int64)
+        self._wires = np.full(count, 31, dtype=np.int64)
+        self._wires_target = np.full(count, 100, dtype=np.int64)
+        # the wires are checked again on the frame after their target changes
+        self._poke = np.zeros(count, dtype=bool)
+        # the keypad combination's digits (-1 past its length), and the number of its digits typed so far
+        #  (a wrong digit starts the combination over, so what has been typed is always the start of the combination)
+        combination = np.asarray(puzzles["keypad_target"], dtype=np.int64)
+        length = sum((combination >= 10 ** j).astype(np.int64) for j in range(DIGITS))
+        places = length[:, None] - 1 - np.arange(DIGITS)
+        self._digits = np.where(places >= 0, combination[:, None] // 10 ** np.maximum(places, 0) % 10, -1)
+        self._length = length
+        self._typed = np.zeros(count, dtype=np.int64)
+        # the pushbutton's clicks required (like the Button's) and its clicks so far
+        first = combination // 10 ** (length - 1)
+        last = combination % 10
+        color = np.asarray(puzzles["button_color"])
+        self._required = np.select([ color == BUTTON_COLORS.index("G"), color == BUTTON_COLORS.index("B") ], [ first + last, first ], last)
+        self._clicks = np.zeros(count, dtype=np.int64)
+        # the frame times (added up one frame at a time, exactly like the GUI's after), and the last frame each bomb was at
+        frames = int(np.max(self._remaining * np.maximum(1, self._speedups.max(axis=1))) * 1000 / FRAME) + 4
+        self._start = float(start)
+        self._times = [ self._start ]
+        for i in range(frames):
+            self._times.append(self._times[-1] + FRAME / 1000)
+        self._times = np.array(self._times)
+        self._frame = np.zeros(count, dtype=np.int64)
+        # the frame that each bomb's countdown expires at
+        self._deadline = self._expiry(np.arange(count))
+        # how each bomb concluded (None -> it hasn't; otherwise "defused" or "exploded"), the frame it concluded at,
+        #  and the timer's value then
+        self.outcome = np.full(count, None, dtype=object)
+        self.ended = np.zeros(count, dtype=np.int64)
+        self.time_left = np.zeros(count, dtype=np.int64)
+
+    # returns the countdown (in ticks) that remains at the specified frames of the specified bombs (like the Timer's)
+    def _remaining_at(self, bombs, frames):
+        return self._remaining[bombs] - (self._times[frames] - self._anchor[bombs]) / self._tick[bombs]
+
+    # returns the timer's value at the specified frames of the specified bombs (like the Timer's)
+    # a tick is over exactly at its deadline (the anchor plus the ticks since), and the Timer is scanned right then,
+    #  before a frame at the same time
+    def _value_at(self, bombs, frames):
+        value = np.maximum(np.ceil(self._remaining_at(bombs, frames)).astype(np.int64), 0)
+        deadline = lambda value: self._anchor[bombs] + (self._remaining[bombs] - value) * self._tick[bombs]
+        times = self._times[frames]
+        # (the countdown may be rounded off right at a deadline -> the value is one off)
+        early = (times < deadline(value))
+        late = ~early & (value > 0) & (times >= deadline(value - 1))
+        return value + early - late
+
+    # returns the first frame at which each of the specified bombs' countdown has expired (from their current frame on)
+    def _expiry(self, bombs):
+        due = self._anchor[bombs] + self._remaining[bombs] * self._tick[bombs]
+        frames = np.maximum(np.searchsorted(self._times, due) - 2, self._frame[bombs])
+        for i in range(4):
+            frames += (self._value_at(bombs, frames) > 0) & (frames < len(self._times) - 1)
+        return frames
+
+    # plays every bomb until it concludes
+    # rate -> how often (per second, on average) each player makes a move (a value for all of them, or one per player)
+    # accuracy -> the chance that a player's move is the right one (otherwise it is a wrong one)
+    # seed -> the random seed of the players
+    # log -> a list that the moves are appended to, as (bomb, frame, phase, value): the new toggles or wires bitmask,
+    #  the digit typed, or the number of clicks (None -> not logged)
+    # returns the results (see results)
+    def play(self, rate=2, accuracy=1, seed=None, log=None):
+        rng = np.random.default_rng(seed)
+        chance = np.broadcast_to(np.minimum(np.asarray(rate, dtype=np.float64) * FRAME / 1000, 1), (self.count,))
+        accuracy = np.broadcast_to(np.asarray(accuracy, dtype=np.float64), (self.count,))
+        # the frame of each player's next move
+        moves = np.where(chance > 0, self._frame + rng.geometric(np.maximum(chance, 1e-12)), NEVER)
+        bombs = np.flatnonzero(self.outcome == None)
+        while (bombs.size):
+            # advance each bomb to the next frame that something happens at
+            poked = self._poke[bombs]
+            frames = np.minimum(np.minimum(moves[bombs], self._deadline[bombs]), np.where(poked, self._frame[bombs] + 1, NEVER))
+            strikes = np.zeros(bombs.size, dtype=np.int64)
+            defused = np.zeros(bombs.size, dtype=np.int64)
+            # the wires are checked again (right after the frame that changed their target)
+            self._poke[bombs] = False
+            checked = bombs[poked]
+            defused[poked] |= np.where(self._wires[checked] == self._wires_target[checked], WIRES, 0)
+            # the players make their moves (between the frames)
+            moving = (moves[bombs] == frames)
+            idle = self._move(bombs[moving], frames[moving], defused, strikes, moving, accuracy, rng, log)
+            # the frame (check_phases)
+            self._check(bombs, frames, strikes, defused)
+            # the players' next moves (a player who has nothing left to do stops)
+            moved = bombs[moving]
+            moves[moved] = np.where(idle, NEVER, frames[moving] + rng.geometric(np.maximum(chance[moved], 1e-12)))
+            self._frame[bombs] = frames
+            bombs = bombs[self.outcome[bombs] == None]
+        return self.results()
+
+    # makes the specified bombs' players' moves at the specified frames (only internally called)
+    # the phases that the moves defused and the strikes that they caused are added to the frame's (at where, the
+    #  positions of the bombs in the frame); returns which players had nothing left to do
+    def _move(self, bombs, frames, defused, strikes, where, accuracy, rng, log):
+        done = self._defused[bombs]
+        right = (rng.random(bombs.size) < accuracy[bombs])
+        # work on the first phase (in order) that can still be defused
+        #  (the wires once the toggles have set their target, and the pushbutton until it has been clicked too often)
+        phase = np.select([ (done & TOGGLES) == 0, ((done & WIRES) == 0) & ((done & TOGGLES) != 0), (done & KEYPAD) == 0,\
+                            ((done & BUTTON) == 0) & (self._clicks[bombs] < self._required[bombs]) ], ORDER, 0)
+        defusing = np.zeros(bombs.size, dtype=np.int64)
+        striking = np.zeros(bombs.size, dtype=np.int64)
+
+        # flip a switch or a wire: the right move fixes a pin that is wrong, and a wrong move breaks one that is right
+        for numeric, values, targets, pins in ((TOGGLES, self._toggles, self._toggles_target, 4),\
+                                               (WIRES, self._wires, self._wires_target, 5)):
+            which = (phase == numeric)
+            moved = bombs[which]
+            value = values[moved]
+            target = targets[moved]
+            wrong = value ^ target
+            fine = ~wrong & ((1 << pins) - 1)
+            changed = pickBits(np.where(right[which] | (fine == 0), wrong, fine), rng)
+            value ^= changed
+            values[moved] = value
+            # like the NumericPhase: the target -> defused; a pin that changed into a wrong state -> strike
+            defusing[which] = np.where(value == target, numeric, 0)
+            striking[which] = (value != target) & ((changed & (value ^ target)) != 0)
+            if (log is not None):
+                log += [ (int(b), int(f), numeric, int(v)) for b, f, v in zip(moved, frames[which], value) ]
+
+        # type a digit: the right move is the combination's next digit, and a wrong move any other digit
+        #  (like the Keypad: the combination -> defused; a digit that doesn't continue it -> strike, and it starts over)
+        which = (phase == KEYPAD)
+        moved = bombs[which]
+        typed = self._typed[moved]
+        digit = self._digits[moved, typed]
+        digit = np.where(right[which], digit, (digit + rng.integers(1, 10, moved.size)) % 10)
+        typed = np.where(digit == self._digits[moved, typed], typed + 1, 0)
+        self._typed[moved] = typed
+        defusing[which] = np.where(typed == self._length[moved], KEYPAD, 0)
+        striking[which] = (typed == 0)
+        if (log is not None):
+            log += [ (int(b), int(f), KEYPAD, int(d)) for b, f, d in zip(moved, frames[which], digit) ]
+
+        # click the pushbutton: the right move is a click, and a wrong move a double click
+        #  (like the Button: the clicks required -> defused; there are no strikes, but too many clicks can't be undone)
+        which = (phase == BUTTON)
+        moved = bombs[which]
+        clicks = self._clicks[moved]
+        double = ~right[which]
+        required = self._required[moved]
+        defusing[which] = np.where((clicks + 1 == required) | (double & (clicks + 2 == required)), BUTTON, 0)
+        self._clicks[moved] = clicks + 1 + double
+        if (log is not None):
+            log += [ (int(b), int(f), BUTTON, int(1 + d)) for b, f, d in zip(moved, frames[which], double) ]
+
+        defused[where] |= defusing
+        strikes[where] += striking
+        return phase == 0
+
+    # checks the specified bombs at the specified frames, with the strikes and defused phases that happened since their
+    #  last frame (like check_phases and update_phases) (only internally called)
+    def _check(self, bombs, frames, strikes, defused):
+        # the timer's value (like the Timer's)
+        expired = (frames >= self._deadline[bombs])
+        value = np.where(expired, 0, self._value_at(bombs, frames))
+        # handle the phases' events (strike and defused)
+        self.strikes_left[bombs] -= strikes
+        self.active_phases[bombs] -= phaseCounts(defused)
+        self._defused[bombs] |= defused
+        # the toggles are defused -> the wires target becomes the sum of the timer's digits (and the wires are checked again)
+        toggled = ((defused & TOGGLES) != 0)
+        self._wires_target[bombs[toggled]] = digitSums(value[toggled])
+        self._poke[bombs[toggled]] = True
+
+        # the exploding audio plays at t-10s (after which the timer no longer speeds up)
+        tick = self._tick[bombs]
+        exploding = (tick * value <= 11.25)
+        strikes_left = self.strikes_left[bombs]
+        # the countdown has expired, or too many strikes -> explode!
+        exploded = expired | (strikes_left <= 0)
+        # a few strikes left -> the timer goes faster (the remaining part of the current tick is rescaled)
+        speedup = np.where(strikes_left == 2, self._speedups[bombs, 0], np.where(strikes_left == 1, self._speedups[bombs, 1], tick))
+        faster = ~exploded & ~exploding & (speedup != tick)
+        sped = bombs[faster]
+        self._remaining[sped] = self._remaining_at(sped, frames[faster])
+        self._anchor[sped] = self._times[frames[faster]]
+        self._tick[sped] = speedup[faster]
+        self._frame[sped] = frames[faster]
+        self._deadline[sped] = self._expiry(sped)
+        # the bomb has been successfully defused!
+        success = ~exploded & (self.active_phases[bombs] == 0)
+
+        ended = exploded | success
+        self.outcome[bombs[exploded]] = "exploded"
+        self.outcome[bombs[success]] = "defused"
+        self.ended[bombs[ended]] = frames[ended]
+        self.time_left[bombs[ended]] = value[ended]
+
+    # returns the results: how each bomb concluded ("defused" or "exploded"), the time that it concluded at (s since the
+    #  phases started), and its strikes left, timer value, and active phases then
+    def results(self):
+        return { "outcome": self.outcome, "time": self._times[self.ended] - self._start, "strikes_left": self.strikes_left,\
+                 "time_left": self.time_left, "active_phases": self.active_phases }
+
+    # returns how a bomb concluded (like the result of bomb_game.main)
+    def result(self, bomb):
+        return { "outcome": self.outcome[bomb], "strikes_left": int(self.strikes_left[bomb]), "time_left": int(self.time_left[bomb]),\
+                 "active_phases": int(self.active_phases[bomb]) }
+
+###########
+# functions
+###########
+# returns the script steps (see SimScript) that make a logged move on the simulated components
+#  (the input is made between the frame before and the move's frame, so that the move's frame handles it)
+def moveSteps(frame, phase, value, before):
+    at = (frame * FRAME - 80) / 1000
+    if (phase in (TOGGLES, WIRES)):
+        pins = (4 if phase == TOGGLES else 5)
+        name = ("toggle" if phase == TOGGLES else "wire")
+        return [ (at, name, str(pins - 1 - b), str((value >> b) & 1)) for b in range(pins) if ((value ^ before) >> b) & 1 ]
+    elif (phase == KEYPAD):
+        return [ (at, "key", str(value), "0.05") ]
+    return [ step for i in range(value) for step in ((at + i * 0.03, "button", "1"), (at + i * 0.03 + 0.015, "button", "0")) ]
+
+# cross-checks the engine against the game (on the virtual clock): count games are played by the engine's players,
+#  and their moves are then played again on the game's Bombs (with the same puzzles)
+# returns the games that concluded differently: [ (game, the engine's result, the game's result) ]
+def crossCheck(count, seed=0, countdown=COUNTDOWN, rate=2, accuracy=0.9):
+    from bomb_game import Bomb
+    from bomb_sim import SimLcd, SimAudio, SimScript, setupComponents
+    from bomb_clock import VirtualClock
+
+    random.seed(seed)
+    bombs = []
+    for i in range(count):
+        clock = VirtualClock()
+        bombs.append(Bomb(setupComponents(), SimLcd(clock), SimAudio(clock), countdown=countdown, clock=clock, debug=False, dump=False))
+    puzzles = { "toggles_target": [ bomb.toggles_target for bomb in bombs ], "keypad_target": [ int(bomb.keypad_target) for bomb in bombs ],\
+                "button_color": [ BUTTON_COLORS.index(bomb.button_color) for bomb in bombs ] }
+    engine = Engine(puzzles, countdown, start=BOOT)
+    log = []
+    engine.play(rate, accuracy, seed, log)
+
+    # script each game's moves (from its starting toggles and wires)
+    steps = [ [] for bomb in bombs ]
+    values = { TOGGLES: [ 0 ] * count, WIRES: [ 31 ] * count }
+    for bomb, frame, phase, value in log:
+        steps[bomb] += moveSteps(frame, phase, value, values[phase][bomb] if phase in values else None)
+        if (phase in values):
+            values[phase][bomb] = value
+    differences = []
+    for i, bomb in enumerate(bombs):
+        bomb.script = SimScript(steps[i])
+        bomb.start()
+        bomb.gui.mainloop()
+        if (bomb.result() != engine.result(i)):
+            differences.append((i, engine.result(i), bomb.result()))
+    return differences
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    from bomb_batch import genBombs
+
+    parser = ArgumentParser(description="Plays many games at once to sweep the game's parameters.")
+    parser.add_argument("--games", type=int, default=1000000, help="the number of games to play per combination of parameters")
+    parser.add_argument("--countdown", type=int, nargs="+", default=[ COUNTDOWN ], help="the countdowns (s) to sweep")
+    parser.add_argument("--strikes", type=int, nargs="+", default=[ NUM_STRIKES ], help="the strikes to sweep")
+    parser.add_argument("--speedups", nargs="+", default=[ "0.5,0.25" ], help="the tick lengths (s) once 2,1 strikes are left to sweep")
+    parser.add_argument("--rate", type=float, default=1, help="how often (per second) a player makes a move")
+    parser.add_argument("--accuracy", type=float, default=0.9, help="the chance that a player's move is the right one")
+    parser.add_argument("--seed", type=int, default=None, help="the random seed")
+    parser.add_argument("--check", type=int, default=0, help="first cross-check the engine against the game (N games)")
+    args = parser.parse_args()
+
+    if (args.check):
+        start = perf_counter()
+        differences = crossCheck(args.check, args.seed or 0, min(args.countdown), args.rate, args.accuracy)
+        print(f"Cross-check: {args.check - len(differences)}/{args.check} games concluded the same as the game's "\
+              f"({perf_counter() - start:.1f}s)")
+        for game, expected, result in differences:
+            print(f"  game {game}: engine {expected}, game {result}")
+        # the engine doesn't follow the game's rules -> its sweep can't be trusted
+        if (differences):
+            sys.exit(1)
+
+    print(f"{'countdown':>9} {'strikes':>7} {'speedups':>10} {'games':>9} {'defused':>8} {'avg time':>9} {'p50 time':>9} "\
+          f"{'avg strikes':>11} {'elapsed':>8}")
+    puzzles = genBombs(args.games, args.seed)
+    for countdown, strikes, speedups in product(args.countdown, args.strikes, args.speedups):
+        start = perf_counter()
+        engine = Engine(puzzles, countdown, strikes, [ float(speedup) for speedup in speedups.split(",") ])
+        results = engine.play(args.rate, args.accuracy, args.seed)
+        elapsed = perf_counter() - start
+        success = (results["outcome"] == "defused")
+        times = np.sort(results["time"][success])
+        print(f"{countdown:>8}s {strikes:>7} {speedups:>10} {args.games:>9} {success.mean() * 100:>7.1f}% "\
+              f"{(times.mean() if times.size else 0):>8.1f}s {(times[times.size // 2] if times.size else 0):>8.1f}s "\
+              f"{(strikes - results['strikes_left']).mean():>11.2f} {elapsed:>7.2f}s")
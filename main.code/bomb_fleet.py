@@ -0,0 +1,100 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Fleet runner
+# Load-tests the game logic like a room of bomb stations: many independent bombs (each with its own phases, simulated
+#  components, and headless GUI event loop) run in each process of a process pool, driven by a script, and the fleet's
+#  CPU time, memory per bomb, and timer tick jitter are reported for each fleet size
+# usage: python3 bomb_fleet.py [--bombs N ...] [--processes P] [--script FILE] [--countdown S] [--seed S]
+#################################
+
+# import the configs, the game logic, and the simulated hardware
+from bomb_configs import *
+from bomb_game import Bomb
+from bomb_sim import SimLcd, SimAudio, SimScript, setupComponents
+# other imports
+import os
+import random
+from threading import Thread
+from collections import Counter
+from multiprocessing import Pool, cpu_count
+from time import perf_counter, process_time
+from argparse import ArgumentParser
+
+###########
+# functions
+###########
+# returns the process's resident memory (in bytes)
+def rss():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # (not Linux) the peak resident memory is the best there is
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# runs a station: count bombs in this process (each on its own thread), driven by the script (None -> no inputs),
+#  until they have all concluded
+# returns what the station measured: the bombs, their outcomes, how late each of their timer's ticks were displayed (s),
+#  the CPU time (s), the time it took (s), and how much the resident memory grew (at its peak, in bytes)
+def runStation(count, script=None, countdown=COUNTDOWN, seed=None):
+    random.seed(seed)
+    # (a script only schedules its steps, so the bombs share it)
+    inputs = (SimScript.load(script) if script else None)
+    memory = rss()
+    peak = memory
+    cpu = process_time()
+    start = perf_counter()
+    bombs = []
+    for i in range(count):
+        gui = SimLcd()
+        bomb = Bomb(setupComponents(), gui, SimAudio(), inputs=inputs, countdown=countdown, debug=False, dump=False)
+        bomb.start()
+        bombs.append((bomb, Thread(name=f"Bomb{i}", target=gui.mainloop, daemon=True)))
+    for bomb, thread in bombs:
+        thread.start()
+    # sample the resident memory while the bombs run
+    for bomb, thread in bombs:
+        while (thread.is_alive()):
+            thread.join(0.5)
+            peak = max(peak, rss())
+    return { "bombs": count, "outcomes": Counter(bomb.result()["outcome"] for bomb, thread in bombs),\
+             "lateness": [ lateness for bomb, thread in bombs for lateness in bomb.timer._lateness ],\
+             "cpu": process_time() - cpu, "wall": perf_counter() - start, "memory": peak - memory }
+
+# runs a fleet of bombs split across the specified number of processes (stations)
+# returns the fleet's measurements: the bombs, the processes, their outcomes, the tick jitter percentiles (s),
+#  the CPU time (s), the time it took (s), and the memory per bomb (bytes)
+def runFleet(bombs, processes=None, script=None, countdown=COUNTDOWN, seed=None):
+    processes = min(processes or cpu_count(), bombs)
+    counts = [ bombs // processes + (i < bombs % processes) for i in range(processes) ]
+    with Pool(processes) as pool:
+        stations = pool.starmap(runStation, [ (count, script, countdown, (None if seed is None else seed + i))\
+                                              for i, count in enumerate(counts) ])
+    lateness = sorted(lateness for station in stations for lateness in station["lateness"])
+    percentile = lambda p: (lateness[min(int(len(lateness) * p / 100), len(lateness) - 1)] if lateness else 0)
+    return { "bombs": bombs, "processes": processes, "outcomes": sum((station["outcomes"] for station in stations), Counter()),\
+             "p50": percentile(50), "p90": percentile(90), "p99": percentile(99), "max": percentile(100),\
+             "cpu": sum(station["cpu"] for station in stations), "wall": max(station["wall"] for station in stations),\
+             "memory": sum(station["memory"] for station in stations) / bombs }
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Runs a fleet of simulated bombs and reports how the game logic holds up as it grows.")
+    parser.add_argument("--bombs", type=int, nargs="+", default=[ 1, 10, 50, 100 ], help="the fleet sizes to run")
+    parser.add_argument("--processes", type=int, default=None, help="the number of processes to spread each fleet across (default: the cores)")
+    parser.add_argument("--script", help="a script of inputs that drives every bomb (see bomb_sim.py)")
+    parser.add_argument("--countdown", type=int, default=30, help="each bomb's countdown (s)")
+    parser.add_argument("--seed", type=int, default=None, help="the random seed of the puzzles")
+    args = parser.parse_args()
+
+    print(f"{'bombs':>6} {'procs':>6} {'wall':>7} {'cpu':>8} {'cores':>6} {'mem/bomb':>9} "\
+          f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  outcomes")
+    for bombs in args.bombs:
+        fleet = runFleet(bombs, args.processes, args.script, args.countdown, args.seed)
+        outcomes = ", ".join(f"{outcome} {count}" for outcome, count in sorted(fleet["outcomes"].items(), key=str))
+        print(f"{fleet['bombs']:>6} {fleet['processes']:>6} {fleet['wall']:>6.1f}s {fleet['cpu']:>7.2f}s "\
+              f"{fleet['cpu'] / fleet['wall']:>6.2f} {fleet['memory'] / 1024:>7.0f}KB "\
+              f"{fleet['p50'] * 1000:>6.1f}ms {fleet['p90'] * 1000:>6.1f}ms {fleet['p99'] * 1000:>6.1f}ms {fleet['max'] * 1000:>6.1f}ms  {outcomes}")
@@ -0,0 +1,183 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Flight recorder
+# Every thread that produces events (the scanner, the keypad driver, the GPIO callbacks, and the GUI's check_phases)
+#  writes compact binary records into its own fixed-size, preallocated ring buffer (so appending takes no lock
+#  and does no I/O), and the rings are dumped to disk on an unhandled exception, when the bomb is turned off, or on SIGUSR2
+# usage: python3 bomb_flight.py [FILE]   (prints a dump as one timeline)
+#################################
+
+# import the configs and the clocks
+from bomb_configs import *
+from bomb_clock import getClock
+# other imports
+import sys
+import json
+import struct
+import signal
+import threading
+from argparse import ArgumentParser
+
+# a record: when it happened (clock time), what happened (its code), the source (a phase), and two values
+#  edge: the pin index, its value; press/release: the key (its code); value/strike/defused: the phase's version, its value
+#  (-1 if it isn't a number); frame: the labels redrawn, the strikes left; off: the active phases, the strikes left
+RECORD = struct.Struct("<dBBHi")
+CODES = [ "edge", "press", "release", "value", "strike", "defused", "frame", "off" ]
+EDGE, PRESS, RELEASE, VALUE, STRIKE, DEFUSED, FRAME, OFF = range(len(CODES))
+# a dump is laid out as: a header, its description (JSON), then each ring's records
+HEADER = struct.Struct("<8sHI")
+MAGIC = b"BOMBFLIT"
+VERSION = 1
+
+#########
+# classes
+#########
+# a producer's ring buffer (only its thread writes to it)
+class Ring:
+    def __init__(self, size, thread):
+        self._buffer = bytearray(size * RECORD.size)
+        self._size = size
+        # the next record to write, and the number of records written
+        self._head = 0
+        self._count = 0
+        self.take(thread)
+
+    # gives the ring to a (new) producer thread
+    def take(self, thread):
+        self.thread = thread
+
+    # appends a record (overwriting the oldest one once the ring is full)
+    # (the clock is looked up for each record, so that a ring made before the game's clock was set uses it too)
+    def append(self, code, source, arg, value):
+        RECORD.pack_into(self._buffer, self._head * RECORD.size, getClock().now(), code, source, arg, value)
+        self._head = (self._head + 1) % self._size
+        self._count += 1
+
+    # returns a copy of the ring's records (oldest first) as bytes
+    # (the ring isn't locked, so a record that is being written while it is copied may be torn)
+    def snapshot(self):
+        head, count = self._head, self._count
+        start = (head if count >= self._size else 0) * RECORD.size
+        buffer = bytes(self._buffer)
+        return buffer[start:] + buffer[:start] if count >= self._size else buffer[:head * RECORD.size]
+
+# the flight recorder
+# each producer thread gets its own ring the first time that it writes (a finished thread's ring is reused)
+class FlightRecorder:
+    def __init__(self, size=FLIGHT_RECORDS, file=None):
+        self._size = size
+        self._file = file
+        self._rings = []
+        # the sources (phase names), numbered in the order they are registered
+        self._sources = [ "" ]
+        # the lock is only taken to give a thread its ring, to register a source, and to dump
+        # (it is reentrant, since SIGUSR2 dumps from the main thread, which may be holding it when the signal arrives)
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._dumps = 0
+
+    # returns the number of a source (registering it the first time)
+    def source(self, name):
+        with self._lock:
+            if (name not in self._sources):
+                self._sources.append(name)
+            return self._sources.index(name)
+
+    # returns the calling thread's ring (only internally called)
+    def _ring(self):
+        thread = threading.current_thread()
+        with self._lock:
+            for ring in self._rings:
+                if (not ring.thread.is_alive()):
+                    ring.take(thread)
+                    break
+            else:
+                ring = Ring(self._size, thread)
+                self._rings.append(ring)
+        self._local.ring = ring
+        return ring
+
+    # appends a record to the calling thread's ring
+    def note(self, code, source=0, arg=0, value=0):
+        try:
+            ring = self._local.ring
+        except AttributeError:
+            ring = self._ring()
+        ring.append(code, source, arg, value)
+
+    # dumps the rings to the dump file (why -> what triggered the dump); returns the file (None -> not dumped, there is no dump file)
+    def dump(self, why="request"):
+        if (not self._file):
+            return None
+        with self._lock:
+            rings = [ (ring.thread.name, ring.snapshot()) for ring in self._rings ]
+            description = json.dumps({ "why": why, "time": getClock().now(), "codes": CODES, "sources": self._sources,\
+                                       "rings": [ [ name, len(records) // RECORD.size ] for name, records in rings ] }).encode()
+            with open(self._file, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, len(description)))
+                f.write(description)
+                for name, records in rings:
+                    f.write(records)
+            self._dumps += 1
+        return self._file
+
+    # dumps the rings to the specified file on unhandled exceptions (in any thread) and on SIGUSR2 (kill -USR2 <pid>)
+    def install(self, file=FLIGHT_DUMP):
+        self._file = file
+        excepthook = sys.excepthook
+        thread_excepthook = threading.excepthook
+        def crashed(*args):
+            self.dump("exception")
+            excepthook(*args)
+        def thread_crashed(args):
+            self.dump(f"exception in {args.thread.name if args.thread else 'a thread'}")
+            thread_excepthook(args)
+        sys.excepthook = crashed
+        threading.excepthook = thread_crashed
+        if (hasattr(signal, "SIGUSR2")):
+            signal.signal(signal.SIGUSR2, lambda *args: self.dump("signal"))
+
+    # returns the flight recorder report as a string
+    def report(self):
+        records = sum(ring._count for ring in self._rings)
+        return f"Flight recorder: {len(self._rings)} rings of {self._size} records, {records} records written, {self._dumps} dumps ({self._file or 'no dump file'})"
+
+###########
+# functions
+###########
+# reads a dump; returns its description and the records of every ring as one timeline:
+#  [ (time, ring, code, source, arg, value) ] (oldest first)
+def load(file=FLIGHT_DUMP):
+    with open(file, "rb") as f:
+        data = f.read()
+    magic, version, length = HEADER.unpack_from(data, 0)
+    if (magic != MAGIC or version != VERSION):
+        raise ValueError(f"{file} is not a flight recorder dump (version {VERSION})")
+    description = json.loads(data[HEADER.size:HEADER.size + length])
+    records = []
+    offset = HEADER.size + length
+    for name, count in description["rings"]:
+        for time, code, source, arg, value in RECORD.iter_unpack(data[offset:offset + count * RECORD.size]):
+            records.append((time, name, description["codes"][code], description["sources"][source], arg, value))
+        offset += count * RECORD.size
+    records.sort(key=lambda record: record[0])
+    return description, records
+
+# the process's flight recorder (it records from the start, but is only dumped once it is installed with a dump file)
+recorder = FlightRecorder()
+
+# appends a record to the calling thread's ring of the process's flight recorder (the bound method, to save a call)
+note = recorder.note
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Prints a flight recorder dump.")
+    parser.add_argument("file", nargs="?", default=FLIGHT_DUMP, help="the dump file")
+    args = parser.parse_args()
+
+    description, records = load(args.file)
+    print(f"{args.file}: dumped on {description['why']} at {description['time']:.3f}s, {len(records)} records")
+    for time, ring, code, source, arg, value in records:
+        print(f"  {time:>12.6f}s {ring:<12} {code:<8} {source:<8} {arg:>6} {value:>8}")
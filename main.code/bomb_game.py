@@ -0,0 +1,553 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Game logic (bootup, phase setup/checks, strikes, and resets)
+# The GUI, audio, and hardware are only loaded when the game starts (see main)
+# Each bomb keeps its own state (see Bomb), so that a process can run many of them (see bomb_fleet.py)
+#################################
+
+# import the configs
+from bomb_configs import *
+# import the puzzle generators, the phases, the clocks, the flight recorder, the startup and frame profilers,
+#  and the latency tracker
+from bomb_puzzle import *
+from bomb_phases import *
+from bomb_clock import VirtualClock, getClock, setClock
+import bomb_flight as flight
+from bomb_profile import StartupProfiler, FrameProfiler
+from bomb_latency import LatencyTracker
+# other imports
+import os
+import signal
+import random
+from time import perf_counter
+
+# the puzzle bank (None -> not opened yet; False -> there isn't one)
+bank = None
+
+# opens the puzzle bank (once); returns it (or False if there isn't one)
+def getBank():
+    global bank
+
+    if (bank is None):
+        bank = False
+        if (PUZZLE_BANK and os.path.exists(PUZZLE_BANK)):
+            from bomb_bank import PuzzleBank
+            bank = PuzzleBank(PUZZLE_BANK)
+    return bank
+
+#########
+# classes
+#########
+# a bomb: its puzzle, phases, strikes, and GUI, played on the specified components, GUI (an Lcd or SimLcd), and audio
+# images -> the conclusion images (None -> none)
+# inputs -> the scripted inputs (a SimScript, or a TracePlayer to replay a game) that drive the simulated components
+# recorder -> the input trace recorder that each game is traced with (None -> none)
+# telemetry -> the session telemetry that each game is written to (None -> none)
+# profile -> the startup profiler (None -> not profiled)
+# countdown -> the countdown (s) (a replayed game gets the recorded game's)
+# clock -> the clock that the phases tell time with (None -> the default clock)
+# debug -> print the puzzle and the end of game reports?
+# dump -> dump the flight recorder when the bomb is turned off (if it has a dump file, see main)?
+class Bomb:
+    def __init__(self, components, gui, audio, images=None, inputs=None, recorder=None, telemetry=None, profile=None,\
+                 countdown=COUNTDOWN, clock=None, debug=DEBUG, dump=False):
+        self.components = components
+        self.component_7seg, self.component_keypad, self.component_wires, self.component_button_state,\
+            self.component_button_RGB, self.component_toggles = components
+        self.gui = gui
+        self.audio = audio
+        self.images = images
+        self.script = inputs
+        self.recorder = recorder
+        self.telemetry = telemetry
+        self.profile = (profile or StartupProfiler())
+        self.countdown = getattr(inputs, "countdown", countdown)
+        self._clock = (clock or getClock())
+        self._debug = debug
+        self._dump = dump
+        # the phases (None -> not setup yet)
+        self.scanner = None
+        self.timer = None
+        # the input latencies (each game starts over)
+        self.latency = LatencyTracker()
+        # generate the bomb's specifics (a replayed game gets the recorded game's puzzle)
+        self.genBomb(getattr(inputs, "seed", None), getattr(inputs, "record", None))
+        self.profile.mark("generate puzzle")
+        # initialize the bomb strikes, active phases (i.e., not yet defused), and if the bomb is exploding
+        self.strikes_left = NUM_STRIKES
+        self.active_phases = NUM_PHASES
+        self.exploding = False
+        # when the bomb was last reset (None -> it hasn't been)
+        self.reset_time = None
+
+    # generates the bomb's specifics (at startup, and again when the bomb is reset)
+    # seed, record -> the random seed and puzzle bank record (None -> generated) of a game being replayed
+    def genBomb(self, seed=None, record=None):
+        # the puzzle has its own random number generator, seeded with a new seed (which is traced, so that the game's puzzle
+        #  can be generated again), so that the rest of the process's random numbers don't depend on the puzzle's seed
+        self.puzzle_seed = (seed if seed is not None else random.randrange(1 << 63))
+        rng = random.Random(self.puzzle_seed)
+        self.puzzle_record = record
+        # the replayed game's puzzle is from the puzzle bank
+        if (record is not None):
+            if (not getBank()):
+                raise LookupError(f"The game's puzzle is record {record} of a puzzle bank, but there isn't one ({PUZZLE_BANK})")
+            self.serial, self.toggles_target, self.wires_target, self.keyword, self.cipher_keyword, self.rot, self.keypad_target,\
+                self.passphrase, self.button_color = bank.record(record)
+        # pick a puzzle from the puzzle bank (if there is one)
+        elif (getBank()):
+            self.serial, self.toggles_target, self.wires_target, self.keyword, self.cipher_keyword, self.rot, self.keypad_target,\
+                self.passphrase, self.button_color = bank.pick(**PUZZLE_FILTER)
+            self.puzzle_record = bank.last
+        else:
+            # generate the bomb's serial number (which also gets us the toggle and jumper target values)
+            #  serial: the bomb's serial number
+            #  toggles_target: the toggles phase defuse value
+            #  wires_target: the wires phase defuse value
+            self.serial, self.toggles_target, self.wires_target = genSerial(rng)
+
+            # generate the combination for the keypad phase
+            #  keyword: the plaintext keyword for the lookup table
+            #  cipher_keyword: the encrypted keyword for the lookup table
+            #  rot: the key to decrypt the keyword
+            #  keypad_target: the keypad phase defuse value (combination)
+            #  passphrase: the target plaintext passphrase
+            self.keyword, self.cipher_keyword, self.rot, self.keypad_target, self.passphrase = genKeypadCombination(rng)
+
+            # generate the color of the pushbutton (which determines how to defuse the phase)
+            self.button_color = rng.choice(BUTTON_COLORS)
+        # appropriately set the target (R is None)
+        self.button_target = None
+
+        if (self._debug):
+            print(f"Serial number: {self.serial}")
+            print(f"Toggles target: {bin(self.toggles_target)[2:].zfill(4)}/{self.toggles_target}")
+            print(f"Wires target: {bin(self.wires_target)[2:].zfill(5)}/{self.wires_target}")
+            print(f"Keypad target: {self.keypad_target}/{self.passphrase}/{self.keyword}/{self.cipher_keyword}(rot={self.rot})")
+            print(f"Button target: {self.button_target}")
+
+        # set the bomb's LCD bootup text
+        self.boot_text = f"Booting Mad Scientist Doctor Kancharla's Evil Pipe Bomb of Death\n\x00\x00"\
+                         f"*Kernel v3.1.4-159 loaded.\n"\
+                         f"Initializing subsystems...\n\x00"\
+                         f"*System model: 102BOMBv4.2\n"\
+                         f"Encrypting combination...\n\x00"\
+                         f"*Hexadecimal: {self.cipher_keyword}\n"\
+                         f"Rendering phases...\x00"
+
+    # "boots" the bomb (after a second) on its GUI's event loop
+    def start(self):
+        self.gui.after(1000, self.bootup)
+
+    # generates the bootup sequence on the LCD
+    def bootup(self, n=0):
+        gui = self.gui
+        # if we're not animating (or we're at the end of the bootup text)
+        if (not ANIMATE or n == len(self.boot_text)):
+            # if we're not animating, render the entire text at once (and don't process \x00)
+            if (not ANIMATE):
+                gui._lscroll["text"] = self.boot_text.replace("\x00", "")
+            # the bootup text is (fully) displayed -> the startup is over
+            gui.update_idletasks()
+            self.profile.mark("boot text")
+            self.profile.report()
+            # configure the remaining GUI widgets
+            gui.setup()
+            # decode the conclusion images as they are read in the background
+            if (self.images):
+                gui.after_idle(self.loadImages)
+            # setup the phase threads, execute them, and check their statuses
+            gui.after(1000, self.setup_phases)
+        # if we're animating
+        else:
+            # add the next character (but don't render \x00 since it specifies a longer pause)
+            if (self.boot_text[n] != "\x00"):
+                gui._lscroll["text"] += self.boot_text[n]
+
+            # scroll the next character after a slight delay (\x00 is a longer delay)
+            gui.after(25 if self.boot_text[n] != "\x00" else 750, self.bootup, n + 1)
+
+    # decodes the images that have been read in the background (until all of them have been)
+    def loadImages(self):
+        if (self.images.decode()):
+            self.gui.after(100, self.loadImages)
+
+    # sets up the phase threads
+    def setup_phases(self):
+        gui = self.gui
+        clock = self._clock
+
+        # trace the game's inputs (if they are being recorded)
+        if (self.recorder):
+            self.recorder.start(self.components, self.puzzle_seed, self.puzzle_record, self.countdown)
+        # drive the (simulated) components with the scripted inputs (only for the first game)
+        if (self.script):
+            self.script.start(gui, self.components)
+            self.script = None
+
+        # setup the timer thread
+        self.timer = timer = Timer(self.component_7seg, self.countdown, clock=clock)
+        # bind the 7-segment display to the LCD GUI so that it can be paused/unpaused from the GUI
+        gui.setTimer(timer)
+        # setup the keypad thread
+        self.keypad = keypad = Keypad(self.component_keypad, self.keypad_target, self.toggles_target, self.audio, clock=clock)
+        # setup the jumper wires thread
+        self.wires = wires = Wires(self.component_wires, self.wires_target, display_length=5, clock=clock)
+        # setup the pushbutton thread
+        self.button = button = Button(self.component_button_state, self.component_button_RGB, self.button_target, self.button_color,\
+                                      self.keypad_target, clock=clock)
+        # bind the pushbutton to the LCD GUI so that its LED can be turned off when we quit
+        gui.setButton(button)
+        # setup the toggle switches thread
+        self.toggles = toggles = Toggles(self.component_toggles, self.toggles_target, display_length=4, timer=timer, clock=clock)
+
+        # scan all of the phases from a single thread
+        self.scanner = scanner = Scanner(SCAN_RATE, clock=clock)
+        scanner.add(timer)
+        scanner.add(keypad)
+        scanner.add(wires)
+        scanner.add(button)
+        scanner.add(toggles)
+        scanner.start()
+
+        # start the game's telemetry session (its times are since now)
+        self.started = clock.now()
+        if (self.telemetry):
+            self.telemetry.begin(seed=self.puzzle_seed, serial=self.serial, toggles_target=self.toggles_target,\
+                                 wires_target=self.wires_target, keyword=self.keyword, rot=self.rot, keypad_target=self.keypad_target,\
+                                 passphrase=self.passphrase, button_color=self.button_color, countdown=self.countdown)
+
+        # the bomb has been reset -> note how long it took to be playable again
+        if (self.reset_time is not None):
+            if (self._debug):
+                print(f"Retry: playable after {(perf_counter() - self.reset_time) * 1000:.1f}ms")
+            self.reset_time = None
+
+        # play the tick audio (it loops on its own channel until the bomb is turned off)
+        self.audio.play("tick", loops=-1)
+
+        # each phase's label and caption (phase -> (label, caption)), the phase versions that the labels show
+        #  (label -> version), and the frame profiler
+        self.labels = { timer: ("timer", "Time left: "), keypad: ("keypad", "Combination: "), wires: ("wires", "Wires: "),\
+                        button: ("button", "Button: "), toggles: ("toggles", "Toggles: ") }
+        self.rendered = {}
+        self.frames = FrameProfiler()
+        # the labels queued in this frame (label -> (phase, when its input was detected)), and the input latencies
+        self.drawn = {}
+        self.latency = LatencyTracker(clock)
+        # check the phases
+        gui.after(100, self.check_phases)
+
+    # checks the phase threads and redraws the labels that changed (one GUI frame)
+    def check_phases(self):
+        start = perf_counter()
+        checking = self.update_phases()
+        # draw all of the label changes in one pass
+        redraws = self.gui.draw()
+        self.frames.frame(perf_counter() - start, redraws)
+        flight.note(flight.FRAME, 0, redraws, self.strikes_left)
+        # note how long after their inputs the labels were updated
+        now = self._clock.now()
+        for phase, detected in self.drawn.values():
+            self.latency.record(phase.name, "label", detected, now)
+        self.drawn.clear()
+        # check the phases again after a slight delay
+        if (checking):
+            self.gui.after(100, self.check_phases)
+
+    # queues a phase's label for redrawing, but only if the phase's state changed since it was last drawn
+    #  (detected is when the input that changed it was detected)
+    def render(self, phase, detected=None):
+        label, caption = self.labels[phase]
+        if (self.rendered.get(label) != phase._version):
+            self.rendered[label] = phase._version
+            self.gui.queue(label, text=f"{caption}{phase}")
+            self.drawn[label] = (phase, detected)
+
+    # handles the phases' events and queues their label changes
+    # returns whether the phases should be checked again (i.e., the bomb hasn't concluded)
+    def update_phases(self):
+        gui = self.gui
+        timer = self.timer
+        latency = self.latency
+
+        # handle the phases' events (in the order they were posted)
+        for event in self.scanner.events.drain():
+            # note how long after its input the event was posted and observed
+            latency.record(event.phase.name, "posted", event.detected, event.time)
+            latency.record(event.phase.name, "observed", event.detected)
+            # a phase has failed -> strike
+            if (event.kind == EVENT_STRIKE):
+                self.strike(event)
+            # a phase is defused (it has already stopped itself)
+            elif (event.kind == EVENT_DEFUSED):
+                gui.queue(self.labels[event.phase][0], fg="#00ff00")
+                # the toggles are defused -> the wires target becomes the sum of the timer's digits
+                if (event.phase is self.toggles):
+                    timevalue = timer._value
+                    digits = list(str(timevalue))
+                    sumdigits = sum(int(digit) for digit in digits)  # Store the sum of digit
+                    self.wires.update_wires_target(sumdigits)
+                self.defused(event)
+            # a phase's value has changed -> update the GUI
+            else:
+                self.render(event.phase, event.detected)
+        # some value changes didn't fit in the channel -> update the GUI for every phase that changed
+        if (self.scanner.events.overflowed()):
+            for phase in self.labels:
+                self.render(phase)
+
+        # check the timer
+        if (timer._running):
+            # play the exploding audio at t-10s
+            if (not self.exploding and timer._interval * timer._value <= 11.25):
+                self.exploding = True
+                self.component_7seg.blink_rate = 1
+                self.audio.stop("tick")
+                self.audio.play("exploding", loops=1)
+            if (timer._value == 60):
+                gui.queue("timer", fg="#ff0000")
+        else:
+            # the countdown has expired -> explode!
+            # turn off the bomb and render the conclusion GUI
+            self.turn_off()
+            gui.after(100, gui.conclusion, self.exploding, False)
+            # don't check any more phases
+            return False
+
+        # note the strikes on the GUI
+        gui.queue("strikes", text=f"Strikes left: {self.strikes_left}")
+        # too many strikes -> explode!
+        if (self.strikes_left <= 0):
+            # turn off the bomb and render the conclusion GUI
+            self.turn_off()
+            gui.after(1000, gui.conclusion, self.exploding, False)
+            # stop checking phases
+            return False
+        # a few strikes left -> timer goes twice as fast!
+        elif (self.strikes_left == 2 and not self.exploding):
+            timer._interval = 0.5
+            gui.queue("strikes", fg="#ff0000")
+        # one strike left -> timer goes even faster!
+        elif (self.strikes_left == 1 and not self.exploding):
+            timer._interval = 0.25
+
+        # the bomb has been successfully defused!
+        if (self.active_phases == 0):
+            # turn off the bomb and render the conclusion GUI
+            self.turn_off()
+            gui.after(100, gui.conclusion, self.exploding, True)
+            # stop checking phases
+            return False
+
+        return True
+
+    # handles a strike (from the specified phase event)
+    def strike(self, event=None):
+        # note the strike
+        self.strikes_left -= 1
+        if (self.telemetry and event):
+            self.telemetry.event(event.kind, event.phase.name, event.time - self.started)
+        # play the strike audio
+        if (not self.exploding and self.audio.play("strike", loops=1, since=(event.time if event else None)) and event):
+            self.latency.record(event.phase.name, "audio", event.detected)
+
+    # handles when a phase is defused (from the specified phase event)
+    def defused(self, event=None):
+        # note that the phase is defused
+        self.active_phases -= 1
+        if (self.telemetry and event):
+            self.telemetry.event(event.kind, event.phase.name, event.time - self.started)
+        # play the defused audio
+        if (not self.exploding and self.audio.play("defused", loops=1, since=(event.time if event else None)) and event):
+            self.latency.record(event.phase.name, "audio", event.detected)
+
+    # prints the input latency histograms (at the end of each game, or on demand with SIGUSR1)
+    def dumpLatency(self, *args):
+        print(self.latency.dump())
+
+    # turns off the bomb
+    def turn_off(self):
+        scanner, timer, keypad, wires, button, toggles = self.scanner, self.timer, self.keypad, self.wires, self.button, self.toggles
+
+        # stop all threads
+        scanner._running = False
+        timer._running = False
+        keypad._running = False
+        wires._running = False
+        button._running = False
+        toggles._running = False
+
+        # turn off the 7-segment display
+        self.component_7seg.blink_rate = 0
+        self.component_7seg.fill(0)
+        # turn off the pushbutton's LED
+        for pin in button._rgb:
+            pin.value = True
+        # stop the tick audio
+        self.audio.stop("tick")
+        # stop watching the pins and scanning the keypad (the next phases will if the bomb is reset)
+        keypad._keys.close()
+        wires._edges.close()
+        button._edges.close()
+        toggles._edges.close()
+        # stop tracing the inputs
+        if (self.recorder):
+            self.recorder.stop()
+        # end the game's telemetry session
+        if (self.telemetry):
+            self.telemetry.end(("defused" if self.active_phases == 0 else "exploded"), self.strikes_left, timer._value,\
+                               self.active_phases, self._clock.now() - self.started)
+
+        # dump the flight recorder (the end of the game is on its way to disk, whatever happens next)
+        flight.note(flight.OFF, 0, self.active_phases, self.strikes_left)
+        if (self._dump):
+            flight.recorder.dump("turn_off")
+
+        # report the input latencies
+        if (self._debug):
+            print(self._clock.report())
+            print(scanner.report())
+            print(timer.report())
+            print(self.audio.report())
+            print(self.frames.report())
+            print(scanner.events.report())
+            print(keypad._keys.report())
+            print(button._gestures.report())
+            for phase in (wires, button, toggles):
+                print(phase._edges.report())
+            if (self.recorder):
+                print(self.recorder.report())
+            if (self.telemetry):
+                print(self.telemetry.report())
+            print(flight.recorder.report())
+            self.dumpLatency()
+
+    # resets the bomb in-process after it has concluded
+    # the bomb gets a new puzzle and new phases, but keeps its hardware, the GUI, and the loaded assets
+    def reset(self):
+        gui = self.gui
+
+        self.reset_time = perf_counter()
+        # stop the conclusion audio
+        self.audio.stop("alarm")
+        self.audio.stop("effects")
+        self.audio.stop("ding")
+        # generate a new puzzle
+        self.genBomb()
+        # reset the bomb strikes, active phases, and if the bomb is exploding
+        self.strikes_left = NUM_STRIKES
+        self.active_phases = NUM_PHASES
+        self.exploding = False
+        # render the LCD GUI again (without the bootup delays), and setup the phase threads right away
+        gui.reset()
+        gui._lscroll["text"] = self.boot_text.replace("\x00", "")
+        gui.setup()
+        self.setup_phases()
+
+    # returns how the bomb concluded (for headless games)
+    def result(self):
+        return { "outcome": getattr(self.gui, "outcome", None), "strikes_left": self.strikes_left,\
+                 "time_left": (self.timer._value if self.timer else None), "active_phases": self.active_phases }
+
+###########
+# functions
+###########
+# starts the game (on a single bomb)
+# the heavy libraries (pygame, tkinter, and the hardware libraries) are imported here, in the order they are needed,
+#  and each part of the startup is noted by the (optional) startup profiler
+# sim -> use the simulated components (always the case when not running on the RPi)
+# headless -> also run without Tk or audio (the game runs on the headless GUI's event loop)
+# inputs -> the scripted inputs (a SimScript, or a TracePlayer to replay a game) that drive the simulated components
+# trace -> the file to record the inputs of each game to
+# clock -> the clock that the game tells time (and waits) with (None -> the real clock; a virtual clock needs headless)
+# db -> the session telemetry database that each game is written to (None -> none)
+# dump -> the file that the flight recorder is dumped to (None -> no dumps)
+# returns how the bomb concluded (for headless games)
+def main(profiler=None, sim=False, headless=False, inputs=None, trace=None, clock=None, db=None, dump=None):
+    # everything that the game creates from now on tells time with the clock
+    if (clock):
+        if (isinstance(clock, VirtualClock) and not headless):
+            raise ValueError("The virtual clock can only drive a headless game")
+        setClock(clock)
+    # dump the flight recorder on a crash (or on demand with SIGUSR2)
+    if (dump):
+        flight.recorder.install(dump)
+
+    profile = (profiler or StartupProfiler())
+    profile.mark("import game logic")
+    # write each game to the session telemetry (in the background)
+    telemetry = None
+    if (db):
+        from bomb_telemetry import Telemetry
+        telemetry = Telemetry(db)
+
+    # setup the electronic components (real or simulated)
+    if (RPi and not sim and not headless):
+        import bomb_hardware
+        profile.mark("import hardware libraries")
+        components = bomb_hardware.setupComponents()
+    else:
+        import bomb_sim
+        components = bomb_sim.setupComponents()
+    # trace the reads of the inputs
+    recorder = None
+    if (trace):
+        from bomb_trace import TraceRecorder
+        recorder = TraceRecorder(trace)
+        components = recorder.wrap(components)
+    profile.mark("component setup")
+
+    if (headless):
+        # no audio, images, or Tk
+        audio = bomb_sim.SimAudio()
+        images = None
+        gui = bomb_sim.SimLcd()
+    else:
+        # initialize pygame (with a small mixer buffer to keep the sound latency low)
+        import pygame
+        from bomb_audio import Audio
+        profile.mark("import pygame")
+        pygame.mixer.pre_init(buffer=AUDIO_BUFFER)
+        pygame.init()
+        profile.mark("pygame.init")
+        # load the game audio
+        audio = Audio()
+        profile.mark("load audio")
+
+        # initialize the LCD GUI
+        from tkinter import Tk
+        from bomb_gui import Lcd, Images
+        profile.mark("import tkinter")
+        # start reading the conclusion images
+        images = Images()
+        images.preload([ SUCCESS[0], EXPLODE[0] ])
+        window = Tk()
+        # (Tk reports the exceptions in its callbacks itself, so the flight recorder is dumped from there too)
+        report_exception = window.report_callback_exception
+        window.report_callback_exception = lambda *args: (flight.recorder.dump("exception"), report_exception(*args))
+        # (the retry button resets the bomb, which is created next)
+        gui = Lcd(window, audio, images, retry=lambda: bomb.reset())
+        profile.mark("create GUI")
+    # note when the first frame has been drawn
+    gui.after_idle(profile.mark, "first frame")
+
+    # generate the bomb's specifics (a replayed game gets the recorded game's puzzle and countdown)
+    bomb = Bomb(components, gui, audio, images, inputs, recorder, telemetry, profile, dump=bool(dump))
+    # dump the input latencies on demand (kill -USR1 <pid>)
+    if (hasattr(signal, "SIGUSR1")):
+        signal.signal(signal.SIGUSR1, bomb.dumpLatency)
+
+    # "boot" the bomb
+    bomb.start()
+
+    # display the LCD GUI (quitting exits from inside the event loop, so the telemetry is written out on the way out)
+    try:
+        gui.mainloop()
+    finally:
+        # write out the rest of the telemetry
+        if (telemetry):
+            telemetry.close()
+
+    # how the bomb concluded
+    return bomb.result()
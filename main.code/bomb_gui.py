@@ -0,0 +1,264 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# GUI (LCD display) and image assets
+#################################
+
+# import the configs, and the cached images' naming (shared with build_assets.py)
+from bomb_configs import *
+from bomb_images import cachedImage
+# other imports
+from tkinter import *
+import tkinter
+from threading import Thread, Lock
+from collections import OrderedDict
+from time import perf_counter
+from math import ceil
+import os
+
+#########
+# classes
+#########
+# the LCD display GUI
+class Lcd(Frame):
+    def __init__(self, window, audio, images, retry=None):
+        super().__init__(window, bg="black")
+        # make the GUI fullscreen
+        window.attributes("-fullscreen", True)
+        # the conclusion needs the game audio and the (preloaded) images
+        self._audio = audio
+        self._images = images
+        # what to do when the bomb is re-attempted
+        self._retry = retry
+        # we need to know about the timer (7-segment display) to be able to pause/unpause it
+        self._timer = None
+        # we need to know about the pushbutton to turn off its LED when the program exits
+        self._button = None
+        # setup the initial "boot" GUI
+        self.setupBoot()
+
+    # sets up the LCD "boot" GUI
+    def setupBoot(self):
+        # set column weights
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=2)
+        self.columnconfigure(2, weight=1)
+        # the scrolling informative "boot" text
+        self._lscroll = Label(self, bg="black", fg="white", font=("Courier New", 14), text="", justify=LEFT)
+        self._lscroll.grid(row=0, column=0, columnspan=3, sticky=W)
+        self.pack(fill=BOTH, expand=True)
+
+    # sets up the LCD GUI
+    def setup(self):
+        # the timer
+        self._ltimer = Label(self, bg="black", fg="#00ff00", font=("Courier New", 18), text="Time left: ")
+        self._ltimer.grid(row=1, column=0, columnspan=3, sticky=W)
+        # the keypad passphrase
+        self._lkeypad = Label(self, bg="black", fg="#ff0000", font=("Courier New", 18), text="Keypad phase: ")
+        self._lkeypad.grid(row=2, column=0, columnspan=3, sticky=W)
+        # the jumper wires status
+        self._lwires = Label(self, bg="black", fg="#ff0000", font=("Courier New", 18), text="Wires phase: ")
+        self._lwires.grid(row=3, column=0, columnspan=3, sticky=W)
+        # the pushbutton status
+        self._lbutton = Label(self, bg="black", fg="#ff0000", font=("Courier New", 18), text="Button phase: ")
+        self._lbutton.grid(row=4, column=0, columnspan=3, sticky=W)
+        # the toggle switches status
+        self._ltoggles = Label(self, bg="black", fg="#ff0000", font=("Courier New", 18), text="Toggles phase: ")
+        self._ltoggles.grid(row=5, column=0, columnspan=2, sticky=W)
+        # the strikes left
+        self._lstrikes = Label(self, bg="black", fg="#00ff00", font=("Courier New", 18), text="Strikes left: ")
+        self._lstrikes.grid(row=5, column=2, sticky=W)
+        # the label changes waiting to be drawn (label -> options), and what each label currently shows
+        self._changes = {}
+        self._shown = {}
+        if (SHOW_BUTTONS):
+            # the pause button (pauses the timer)
+            self._bpause = tkinter.Button(self, bg="red", fg="white", font=("Courier New", 18), text="Pause", anchor=CENTER, command=self.pause)
+            self._bpause.grid(row=6, column=0, pady=40)
+            # the quit button
+            self._bquit = tkinter.Button(self, bg="red", fg="white", font=("Courier New", 18), text="Quit", anchor=CENTER, command=self.quit)
+            self._bquit.grid(row=6, column=2, pady=40)
+
+    # lets us pause/unpause the timer (7-segment display)
+    def setTimer(self, timer):
+        self._timer = timer
+
+    # lets us turn off the pushbutton's RGB LED
+    def setButton(self, button):
+        self._button = button
+
+    # queues a change to a label (e.g., "timer" -> self._ltimer) for the next draw
+    def queue(self, label, **options):
+        self._changes.setdefault(label, {}).update(options)
+
+    # draws the queued label changes in one pass (skipping the ones that wouldn't change anything)
+    # returns the number of labels that were changed
+    def draw(self):
+        changed = 0
+        for label, options in self._changes.items():
+            shown = self._shown.setdefault(label, {})
+            options = { option: value for option, value in options.items() if shown.get(option) != value }
+            if (options):
+                getattr(self, f"_l{label}").configure(**options)
+                shown.update(options)
+                changed += 1
+        self._changes = {}
+        return changed
+
+    # pauses the timer
+    def pause(self):
+        if (self._timer):
+            self._timer.pause()
+
+    # setup the conclusion GUI (explosion/defusion)
+    # the conclusion is rendered once the strike/defused sound finishes (without blocking the GUI while it plays)
+    def conclusion(self, exploding=False, success=False):
+        # note when the conclusion was requested (for the time-to-first-frame report)
+        self._conclusion_time = perf_counter()
+        if (not exploding):
+            self._audio.when_done("effects", self._conclude, success)
+            self._pump_audio()
+        else:
+            self._conclude(success)
+
+    # checks for finished sounds until nothing is waiting on one (only internally called)
+    def _pump_audio(self):
+        if (self._audio.pump()):
+            self.after(AUDIO_PUMP, self._pump_audio)
+
+    # renders the conclusion GUI (only internally called)
+    def _conclude(self, success):
+        waited = perf_counter() - self._conclusion_time
+        # destroy/clear widgets that are no longer needed
+        self._lscroll["text"] = ""
+        self._ltimer.destroy()
+        self._lkeypad.destroy()
+        self._lwires.destroy()
+        self._lbutton.destroy()
+        self._ltoggles.destroy()
+        self._lstrikes.destroy()
+        if (SHOW_BUTTONS):
+            self._bpause.destroy()
+            self._bquit.destroy()
+
+        # reconfigure the GUI
+        # the appropriate (success/explode) image (already decoded during bootup)
+        if (success):
+            image = self._images.get(SUCCESS[0])
+        else:
+            image = self._images.get(EXPLODE[0])
+        self._lscroll["image"] = image
+        self._lscroll.image = image
+        self._lscroll.grid(row=0, column=0, columnspan=3, sticky=EW)
+        # the retry button
+        self._bretry = tkinter.Button(self, bg="red", fg="white", font=("Courier New", 18), text="Retry", anchor=CENTER, command=self.retry)
+        self._bretry.grid(row=1, column=0, pady=40)
+        # the quit button
+        self._bquit = tkinter.Button(self, bg="red", fg="white", font=("Courier New", 18), text="Quit", anchor=CENTER, command=self.quit)
+        self._bquit.grid(row=1, column=2, pady=40)
+        # play the appropriate (success/explode) audio
+        if (success):
+            self._audio.play("success", loops=1)
+        else:
+            self._audio.play("explode", loops=1)
+        # draw the first frame now, and report how long it took to get there
+        self.update_idletasks()
+        if (DEBUG):
+            first_frame = perf_counter() - self._conclusion_time
+            print(f"Conclusion: first frame after {first_frame * 1000:.1f}ms ({waited * 1000:.1f}ms waiting for audio)")
+
+    # re-attempts the bomb (after an explosion or a successful defusion)
+    def retry(self):
+        # reset the bomb (without re-launching the program)
+        self._retry()
+
+    # clears the conclusion GUI (so that the LCD GUI can be set up again)
+    def reset(self):
+        self._bretry.destroy()
+        self._bquit.destroy()
+        self._lscroll["image"] = ""
+        self._lscroll.image = None
+        self._lscroll.grid(row=0, column=0, columnspan=3, sticky=W)
+
+    # quits the GUI, resetting some components
+    def quit(self):
+        if (self._timer):
+            # turn off the 7-segment display
+            self._timer._running = False
+            self._timer._component.blink_rate = 0
+            self._timer._component.fill(0)
+            # turn off the pushbutton's LED
+            for pin in self._button._rgb:
+                pin.value = True
+        # exit the application
+        exit(0)
+
+# the image assets
+# the images are pre-scaled to the LCD resolution (and cached as PPMs) by build_assets.py
+# the cached files are read in the background and decoded on the GUI thread during bootup,
+#  so that the conclusion can show them right away
+class Images:
+    def __init__(self, limit=IMAGE_MEMORY):
+        # the most memory (bytes) that the decoded images may use
+        self._limit = limit
+        # the files read by the background thread (but not decoded yet): file -> contents
+        self._data = {}
+        self._lock = Lock()
+        # is the background thread still reading?
+        self._reading = False
+        # the decoded images (least recently used first): file -> PhotoImage
+        self._images = OrderedDict()
+        self._memory = 0
+
+    # starts reading the (cached) images in the background
+    def preload(self, files):
+        self._reading = True
+        Thread(name="Images", target=self._read, args=(files,), daemon=True).start()
+
+    # reads the cached images (only internally called)
+    def _read(self, files):
+        for file in files:
+            cached = cachedImage(file)
+            if (os.path.exists(cached)):
+                with open(cached, "rb") as f:
+                    data = f.read()
+                with self._lock:
+                    self._data[file] = data
+        self._reading = False
+
+    # decodes the images that have been read so far (on the GUI thread); returns True if some are still being read
+    def decode(self):
+        reading = self._reading
+        with self._lock:
+            data = self._data
+            self._data = {}
+        for file, contents in data.items():
+            self._store(file, PhotoImage(data=contents))
+        return reading
+
+    # returns an image (decoding it now if it wasn't preloaded)
+    def get(self, file):
+        self.decode()
+        if (file not in self._images):
+            # the image isn't cached: decode the original and shrink it to fit
+            image = PhotoImage(file=file)
+            factor = max(ceil(image.width() / IMAGE_SIZE[0]), ceil(image.height() / IMAGE_SIZE[1]), 1)
+            if (factor > 1):
+                image = image.subsample(factor)
+            self._store(file, image)
+        self._images.move_to_end(file)
+        return self._images[file]
+
+    # keeps a decoded image, forgetting the least recently used ones to stay within the memory limit (only internally called)
+    def _store(self, file, image):
+        if (file in self._images):
+            self._memory -= Images.memory(self._images.pop(file))
+        self._images[file] = image
+        self._memory += Images.memory(image)
+        while (self._memory > self._limit and len(self._images) > 1):
+            file, image = self._images.popitem(last=False)
+            self._memory -= Images.memory(image)
+
+    # returns the memory (bytes) used by a decoded image (Tk keeps 4 bytes per pixel)
+    @staticmethod
+    def memory(image):
+        return image.width() * image.height() * 4
@@ -0,0 +1,77 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Hardware (electronic components)
+#################################
+
+# import the configs
+from bomb_configs import *
+# the hardware libraries (only imported when this module is)
+if (RPi):
+    import board
+    from adafruit_ht16k33.segments import Seg7x4
+    from digitalio import DigitalInOut, Direction, Pull
+    from adafruit_matrixkeypad import Matrix_Keypad
+
+###########
+# functions
+###########
+# sets up the electronic components
+# returns the 7-segment display, keypad, jumper wires, pushbutton state, pushbutton RGB, and toggle switches components
+def setupComponents():
+    # the components only exist on the RPi
+    if (not RPi):
+        return None
+
+    # 7-segment display
+    # 4 pins: 5V(+), GND(-), SDA, SCL
+    #         ----------7SEG---------
+    i2c = board.I2C()
+    component_7seg = Seg7x4(i2c)
+    # set the 7-segment display brightness (0 -> dimmest; 1 -> brightest)
+    component_7seg.brightness = 0.5
+
+    # keypad
+    # 8 pins: 10, 9, 11, 5, 6, 13, 19, NA
+    #         -----------KEYPAD----------
+    # the pins
+    keypad_cols = [DigitalInOut(i) for i in (board.D10, board.D9, board.D11)]
+    keypad_rows = [DigitalInOut(i) for i in (board.D5, board.D6, board.D13, board.D19)]
+    # the keys
+    keypad_keys = ((1, 2, 3), (4, 5, 6), (7, 8, 9), ("*", 0, "#"))
+    component_keypad = Matrix_Keypad(keypad_rows, keypad_cols, keypad_keys)
+
+    # jumper wires
+    # 10 pins: 14, 15, 18, 23, 24, 3V3, 3V3, 3V3, 3V3, 3V3
+    #          -------JUMP1------  ---------JUMP2---------
+    # the jumper wire pins
+    component_wires = [DigitalInOut(i) for i in (board.D14, board.D15, board.D18, board.D23, board.D24)]
+    for pin in component_wires:
+        # pins are input and pulled down
+        pin.direction = Direction.INPUT
+        pin.pull = Pull.DOWN
+
+    # pushbutton
+    # 6 pins: 4, 17, 27, 22, 3V3, 3V3
+    #         -BUT1- -BUT2-  --BUT3--
+    # the state pin (state pin is input and pulled down)
+    component_button_state = DigitalInOut(board.D4)
+    component_button_state.direction = Direction.INPUT
+    component_button_state.pull = Pull.DOWN
+    # the RGB pins
+    component_button_RGB = [DigitalInOut(i) for i in (board.D17, board.D27, board.D22)]
+    for pin in component_button_RGB:
+        # RGB pins are output
+        pin.direction = Direction.OUTPUT
+        pin.value = True
+
+    # toggle switches
+    # 3x3 pins: 12, 16, 20, 21, 3V3, 3V3, 3V3, 3V3, GND, GND, GND, GND
+    #           -TOG1-  -TOG2-  --TOG3--  --TOG4--  --TOG5--  --TOG6--
+    # the pins
+    component_toggles = [DigitalInOut(i) for i in (board.D12, board.D16, board.D20, board.D21)]
+    for pin in component_toggles:
+        # pins are input and pulled down
+        pin.direction = Direction.INPUT
+        pin.pull = Pull.DOWN
+
+    return component_7seg, component_keypad, component_wires, component_button_state, component_button_RGB, component_toggles
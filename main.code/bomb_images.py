@@ -0,0 +1,19 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Image asset naming
+# Where an image's pre-scaled (cached) copy is kept: build_assets.py writes it there, and the GUI reads it from there
+#  (this module doesn't import Tk or Pillow, so that both can use it)
+#################################
+
+# import the configs (IMAGE_CACHE)
+from bomb_configs import *
+# other imports
+import os
+
+###########
+# functions
+###########
+# returns the pre-scaled (cached) file of an image
+def cachedImage(file):
+    name = os.path.splitext(os.path.basename(file))[0]
+    return os.path.join(IMAGE_CACHE, f"{name}.ppm")
@@ -0,0 +1,533 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Input engine (edge-triggered pins, the pushbutton gestures, the keypad driver, and simulated pins)
+#################################
+
+# import the configs, the clocks, and the flight recorder
+from bomb_configs import *
+from bomb_clock import getClock
+import bomb_flight as flight
+# other imports
+from threading import Event, Lock
+from collections import deque, namedtuple, Counter
+from time import perf_counter
+
+# the keypad events: PRESS or RELEASE, the key, and when it was first seen to change (clock time)
+KeyEvent = namedtuple("KeyEvent", [ "kind", "key", "time" ])
+PRESS = "press"
+RELEASE = "release"
+# the pushbutton gestures: a CLICK (each one), a LONG press, or a MULTI click (a series of quick clicks)
+Gesture = namedtuple("Gesture", [ "kind", "clicks", "time" ])
+CLICK = "click"
+LONG = "long"
+MULTI = "multi"
+
+# the RPi's GPIO library (for the interrupts); it is only loaded when the first GPIO pin is watched
+_gpio = None
+# the shared pollers of the pins that can't raise edges by themselves (clock -> Poller), and their lock
+_pollers = {}
+_pollers_lock = Lock()
+
+###########
+# functions
+###########
+# returns the RPi's GPIO library (None if it isn't available)
+def gpio():
+    global _gpio
+    if (_gpio is None):
+        _gpio = False
+        if (RPi):
+            try:
+                import RPi.GPIO as library
+                # the pins are numbered like the board's (BCM), which Blinka normally sets up (unless nothing has yet)
+                if (library.getmode() is None):
+                    library.setmode(library.BCM)
+                _gpio = library
+            except ImportError:
+                pass
+    return (_gpio or None)
+
+# polls the pins of an edge input (that can't raise edges by themselves) with the shared poller of its clock
+def pollPins(edges):
+    with _pollers_lock:
+        poller = _pollers.get(edges._clock)
+        start = (poller is None)
+        if (start):
+            poller = _pollers[edges._clock] = Poller(edges._clock)
+        poller._inputs.append(edges)
+    if (start):
+        edges._clock.loop("EdgePoll", poller.poll)
+
+# stops polling the pins of an edge input
+def unpollPins(edges):
+    with _pollers_lock:
+        poller = _pollers.get(edges._clock)
+        if (poller and edges in poller._inputs):
+            poller._inputs.remove(edges)
+
+#########
+# classes
+#########
+# a simulated input pin (used when not running on the RPi)
+# it has the same interface as a DigitalInOut pin, and it raises an edge whenever its value changes
+class SimPin:
+    def __init__(self, value=False):
+        self._value = value
+        # the edge listeners (called whenever the value changes)
+        self._listeners = []
+        # unused, but lets the pin be configured like a DigitalInOut pin
+        self.direction = None
+        self.pull = None
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        changed = (bool(value) != bool(self._value))
+        self._value = value
+        # notify the listeners of the edge
+        if (changed):
+            for listener in self._listeners:
+                listener()
+
+# the shared poller
+# a single loop (a thread on the real clock) polls the pins that can't raise edges by themselves, for every edge input
+#  on the same clock (instead of a polling thread per edge input); it stops once there is nothing left to poll
+class Poller:
+    def __init__(self, clock, rate=None):
+        self._clock = clock
+        self._period = 1 / (rate or EdgeInput.POLL_RATE)
+        # the edge inputs whose pins are polled
+        self._inputs = []
+
+    # polls the pins once; returns the time until the next poll (None -> stopped)
+    def poll(self):
+        with _pollers_lock:
+            if (not self._inputs):
+                del _pollers[self._clock]
+                return None
+            inputs = list(self._inputs)
+        for edges in inputs:
+            edges._poll()
+        return self._period
+
+# the edge-triggered input engine
+# phases block on it until one of their pins actually changes (instead of polling the pins every 100ms)
+# on the RPi, the edges come from GPIO interrupts; simulated pins raise the edges themselves
+class EdgeInput:
+    # the maximum number of latencies kept for the report
+    HISTORY = 1000
+    # the polling rate (Hz) for pins that don't support interrupts
+    POLL_RATE = 100
+
+    def __init__(self, pins, name="Edges", log=False, clock=None):
+        self._name = name
+        self._clock = (clock or getClock())
+        # the flight recorder source of the edges
+        self._source = flight.recorder.source(name)
+        # the pins to watch
+        self._pins = list(pins)
+        # the log of pin changes: (time, pin index, value) (None -> not logged)
+        self._log = (deque(maxlen=EdgeInput.HISTORY) if log else None)
+        # the listeners attached to the simulated pins (pin index -> listener)
+        self._listeners = {}
+        # set whenever a watched pin changes
+        self._event = Event()
+        # other events to set on an edge (e.g., the scanner's wakeup)
+        self._wakes = []
+        self._lock = Lock()
+        # is there an edge that hasn't been handled yet?
+        self._pending = False
+        # the time of the oldest edge that hasn't been handled yet
+        self._edge_time = None
+        # the time of the edge currently being handled
+        self._handling = None
+        # the number of edges and the wake-to-handled latencies (seconds) of the recent ones
+        self._edges = 0
+        self._latencies = deque(maxlen=EdgeInput.HISTORY)
+        self._max_latency = 0
+        # pins that can't raise edges by themselves are polled by the shared poller (one for all of the edge inputs)
+        self._polled = []
+        self._closed = False
+        for i, pin in enumerate(self._pins):
+            if (not self._attach(i, pin)):
+                self._polled.append(i)
+        if (self._polled):
+            self._states = { i: self._pins[i].value for i in self._polled }
+            pollPins(self)
+
+    # attaches the edge callback to pin i (only internally called)
+    def _attach(self, i, pin):
+        # simulated pins (or pins that wrap them)
+        if (hasattr(pin, "_listeners")):
+            self._listeners[i] = lambda: self._edge(i, pin.value)
+            pin._listeners.append(self._listeners[i])
+            return True
+        # GPIO pins (interrupts on both rising and falling edges)
+        GPIO = gpio()
+        if (GPIO is not None):
+            try:
+                GPIO.add_event_detect(pin._pin.id, GPIO.BOTH, callback=lambda channel: self._edge(i, pin.value))
+                return True
+            except (AttributeError, RuntimeError, ValueError):
+                pass
+        return False
+
+    # polls the pins that don't support interrupts once (called by the shared poller)
+    def _poll(self):
+        if (self._closed):
+            return
+        for i in self._polled:
+            value = self._pins[i].value
+            if (value != self._states[i]):
+                self._states[i] = value
+                self._edge(i, value)
+
+    # stops watching the pins (so that another phase can watch them)
+    def close(self):
+        self._closed = True
+        if (self._polled):
+            unpollPins(self)
+        for i, pin in enumerate(self._pins):
+            if (hasattr(pin, "_listeners")):
+                if (self._listeners.get(i) in pin._listeners):
+                    pin._listeners.remove(self._listeners[i])
+            elif (gpio() is not None and i not in self._polled):
+                try:
+                    gpio().remove_event_detect(pin._pin.id)
+                except (AttributeError, RuntimeError, ValueError):
+                    pass
+
+    # notes an edge of pin i (which now has the specified value) and wakes the waiting phase
+    #  (called from the interrupt/simulation callbacks)
+    def _edge(self, i=None, value=None):
+        now = self._clock.now()
+        with self._lock:
+            self._edges += 1
+            self._pending = True
+            if (self._edge_time is None):
+                self._edge_time = now
+            if (self._log is not None):
+                self._log.append((now, i, value))
+        flight.note(flight.EDGE, self._source, (i if i is not None else 0xffff), int(bool(value)))
+        self._wake()
+
+    # wakes whoever is waiting on the edges (only internally called)
+    def _wake(self):
+        self._event.set()
+        for wake in self._wakes:
+            wake.set()
+
+    # also sets the specified event on each edge (e.g., so that one scanner can wait on the edges of several phases)
+    def add_wake(self, wake):
+        self._wakes.append(wake)
+
+    # wakes the phase without an edge (e.g., when its target changes)
+    def poke(self):
+        with self._lock:
+            self._pending = True
+        self._wake()
+
+    # consumes the pending edge(s); returns True if the phase needs to handle them
+    def take(self):
+        # edges that occur from now on wake the phase again
+        self._event.clear()
+        with self._lock:
+            if (not self._pending):
+                return False
+            self._pending = False
+            self._handling = self._edge_time
+            self._edge_time = None
+        return True
+
+    # returns when the edge currently being handled happened (None -> the phase was poked)
+    def edge_time(self):
+        return self._handling
+
+    # returns the logged pin changes since this was last called: [ (time, pin index, value) ] (oldest first)
+    def changes(self):
+        changes = []
+        with self._lock:
+            while (self._log):
+                changes.append(self._log.popleft())
+        return changes
+
+    # waits for an edge (or the timeout); returns True if there is one to handle
+    def wait(self, timeout=None):
+        return self._clock.wait(self._event, timeout)
+
+    # notes that the phase has handled the edge that woke it
+    def handled(self):
+        if (self._handling is not None):
+            latency = self._clock.now() - self._handling
+            self._latencies.append(latency)
+            self._max_latency = max(self._max_latency, latency)
+            self._handling = None
+
+    # returns the edge latency report as a string
+    def report(self):
+        if (not self._latencies):
+            return f"{self._name}: {self._edges} edges"
+        latencies = sorted(self._latencies)
+        average = sum(latencies) / len(latencies)
+        median = latencies[len(latencies) // 2]
+        return f"{self._name}: {self._edges} edges, wake-to-handled latency avg={average * 1000:.3f}ms "\
+               f"p50={median * 1000:.3f}ms max={self._max_latency * 1000:.3f}ms"
+
+# the pushbutton gesture recognizer
+# it is fed the timestamped pushbutton changes (from the edge log), so every press and release is seen, however fast
+# a change within the debounce time of the previous one is contact bounce: the level it settles on counts once the time is up
+# a release ends a CLICK (or a LONG press if it was held long enough); clicks that follow each other quickly form a MULTI click
+class Gestures:
+    def __init__(self, debounce=BUTTON_DEBOUNCE, long_press=LONG_PRESS, multi_click=MULTI_CLICK, clock=None):
+        self._clock = (clock or getClock())
+        self._debounce = debounce
+        self._long_press = long_press
+        self._multi_click = multi_click
+        # the debounced state (pressed?) and when it last changed; the raw state and when it last changed
+        self._down = False
+        self._changed_at = float("-inf")
+        self._raw = False
+        self._raw_at = None
+        # when the pushbutton was pressed, and the clicks in the current series (and when the last one ended)
+        self._pressed_at = None
+        self._series = 0
+        self._series_at = None
+        # the number of raw changes, bounces, and gestures (by kind),
+        #  and the release-to-counted latencies (seconds) of the recent clicks
+        self._changes = 0
+        self._bounces = 0
+        self._gestures = Counter()
+        self._latencies = deque(maxlen=EdgeInput.HISTORY)
+
+    # feeds the pushbutton changes ([ (time, pressed) ], oldest first) and returns the gestures they complete
+    #  (now is the current time: it ends a debounce or a series of clicks that is over)
+    def update(self, changes, now):
+        gestures = []
+        for time, pressed in changes:
+            self._changes += 1
+            self._settle(time, gestures)
+            if (bool(pressed) == self._raw):
+                continue
+            # the raw state changed again before the debounced one could -> bounce
+            if (self._raw != self._down):
+                self._bounces += 1
+            self._raw = bool(pressed)
+            self._raw_at = time
+            self._settle(time, gestures)
+        self._settle(now, gestures)
+        self._end_series(now, gestures)
+        return gestures
+
+    # returns the time (in seconds) until a pending change settles or a series of clicks is over (None -> nothing pending)
+    # (the deadlines are compared exactly as update compares them, so that 0 always means that update will act)
+    def due(self, now):
+        if (self._raw != self._down):
+            return max(self._changed_at + self._debounce - now, 0)
+        if (self._series and not self._down):
+            return max(self._series_at + self._multi_click - now, 0)
+        return None
+
+    # notes a gesture (only internally called)
+    def _emit(self, gesture, gestures):
+        self._gestures[gesture.kind] += 1
+        gestures.append(gesture)
+
+    # accepts the raw state once the debounce time since the last accepted change is up (only internally called)
+    def _settle(self, now, gestures):
+        if (self._raw == self._down or now < self._changed_at + self._debounce):
+            return
+        time = max(self._raw_at, self._changed_at + self._debounce)
+        # (a press that comes too late for the series of clicks starts a new one)
+        self._end_series(time, gestures)
+        self._down = self._raw
+        self._changed_at = time
+        # pressed
+        if (self._down):
+            self._pressed_at = time
+            return
+        # released -> a click (or a long press)
+        if (time - self._pressed_at >= self._long_press):
+            self._emit(Gesture(LONG, 1, time), gestures)
+        else:
+            self._emit(Gesture(CLICK, 1, time), gestures)
+            self._series += 1
+            self._series_at = time
+        self._latencies.append(self._clock.now() - time)
+
+    # ends the series of clicks if it is over by the specified time (only internally called)
+    def _end_series(self, now, gestures):
+        if (self._series and not self._down and now >= self._series_at + self._multi_click):
+            if (self._series > 1):
+                self._emit(Gesture(MULTI, self._series, self._series_at), gestures)
+            self._series = 0
+
+    # returns the gesture report as a string
+    def report(self, name="Button"):
+        clicks = self._gestures[CLICK] + self._gestures[LONG]
+        report = f"{name}: {clicks} clicks ({self._gestures[LONG]} long, {self._gestures[MULTI]} multi-click series) "\
+                 f"from {self._changes} changes ({self._bounces} bounces)"
+        if (self._latencies):
+            latencies = sorted(self._latencies)
+            report += f", release-to-counted latency avg={sum(latencies) / len(latencies) * 1000:.3f}ms "\
+                      f"p50={latencies[len(latencies) // 2] * 1000:.3f}ms max={latencies[-1] * 1000:.3f}ms"
+        return report
+
+# the keypad driver
+# it scans the keypad matrix (its rows and columns, through pressed_keys) at a fixed rate (whenever it is polled and a scan
+#  is due, i.e., from the scanner's tick), debounces each key with its own state machine, and queues the press/release
+#  events (with timestamps) for the keypad phase
+# keys are never missed while the phase is busy (they wait in the type-ahead queue), and held keys block nothing
+class KeypadDriver:
+    # the key states (a key is PRESSING/RELEASING until its change has lasted for the debounce samples)
+    UP, PRESSING, DOWN, RELEASING = range(4)
+
+    def __init__(self, keypad, name="Keypad", rate=KEYPAD_RATE, idle_rate=KEYPAD_IDLE_RATE, debounce=KEYPAD_DEBOUNCE, size=KEYPAD_QUEUE,\
+                 clock=None):
+        self._name = name
+        self._keypad = keypad
+        self._clock = (clock or getClock())
+        self._source = flight.recorder.source(name)
+        # the scan periods (seconds) while a key is down or settling, and while the keypad is idle
+        self._period = 1 / rate
+        self._idle_period = 1 / idle_rate
+        # the current scan period, when scanning at it started and the number of scan periods since (the scans are kept on
+        #  that grid, so that their times don't drift), when the next scan is due, and the number of scans that a change
+        #  must last for
+        self._grid = self._idle_period
+        self._started = None
+        self._periods = 0
+        self._next_scan = None
+        self._debounce = max(debounce, 1)
+        # the state of each key that isn't UP: key -> [ state, scans in that state, when the change was first seen ]
+        self._keys = {}
+        # the type-ahead queue of key events (and the number of events dropped because it was full)
+        self._events = deque()
+        self._size = size
+        self._dropped = 0
+        # set whenever an event is queued
+        self._event = Event()
+        # other events to set on a key event (e.g., the scanner's wakeup)
+        self._wakes = []
+        # the number of scans and the total time spent scanning, the number of presses,
+        #  and the press-to-handled latencies (seconds) of the recent keys
+        self._scans = 0
+        self._busy = 0
+        self._presses = 0
+        self._latencies = deque(maxlen=EdgeInput.HISTORY)
+        self._running = False
+
+    # starts scanning the keypad (the first scan is due right away)
+    def start(self):
+        self._running = True
+        self._grid = self._idle_period
+        self._started = self._next_scan = self._clock.now()
+        self._periods = 0
+
+    # stops scanning the keypad
+    def close(self):
+        self._running = False
+
+    # scans the keypad if a scan is due
+    def poll(self):
+        if (not self._running or self._clock.now() < self._next_scan):
+            return
+        self.sample()
+        # scan at the keypad rate while a key is down or settling, and at the idle rate otherwise
+        #  (a new rate starts a new grid from this scan)
+        period = (self._period if self._keys else self._idle_period)
+        if (period != self._grid):
+            self._grid, self._started, self._periods = period, self._next_scan, 0
+        # keep to the scan rate (skipping scans if we fell behind)
+        self._periods += 1
+        now = self._clock.now()
+        if (self._started + self._periods * period <= now):
+            self._periods = int((now - self._started) / period) + 1
+        self._next_scan = self._started + self._periods * period
+
+    # returns the time (in seconds) until the next scan is due (None -> not scanning)
+    def due(self):
+        if (not self._running):
+            return None
+        return max(self._next_scan - self._clock.now(), 0)
+
+    # scans the keypad once, and steps each key's state machine
+    def sample(self):
+        start = perf_counter()
+        pressed = set(self._keypad.pressed_keys)
+        self._scans += 1
+        self._busy += perf_counter() - start
+        now = self._clock.now()
+        # newly pressed keys start debouncing
+        for key in pressed:
+            if (key not in self._keys):
+                self._keys[key] = [ KeypadDriver.PRESSING, 0, now ]
+        for key, machine in list(self._keys.items()):
+            state = machine[0]
+            down = key in pressed
+            # the key is settling into a new state
+            if ((state == KeypadDriver.PRESSING and down) or (state == KeypadDriver.RELEASING and not down)):
+                machine[1] += 1
+                if (machine[1] >= self._debounce):
+                    if (state == KeypadDriver.PRESSING):
+                        machine[0] = KeypadDriver.DOWN
+                        self._presses += 1
+                        self._queue(KeyEvent(PRESS, key, machine[2]))
+                    else:
+                        del self._keys[key]
+                        self._queue(KeyEvent(RELEASE, key, machine[2]))
+            # the key bounced back before it settled
+            elif (state == KeypadDriver.PRESSING):
+                del self._keys[key]
+            elif (state == KeypadDriver.RELEASING):
+                machine[0] = KeypadDriver.DOWN
+            # the key has started to be released
+            elif (state == KeypadDriver.DOWN and not down):
+                self._keys[key] = [ KeypadDriver.RELEASING, 1, now ]
+                if (self._debounce == 1):
+                    del self._keys[key]
+                    self._queue(KeyEvent(RELEASE, key, now))
+
+    # queues a key event and wakes whoever is waiting on the keypad (only internally called)
+    def _queue(self, event):
+        flight.note((flight.PRESS if event.kind == PRESS else flight.RELEASE), self._source,\
+                    (event.key if isinstance(event.key, int) else ord(event.key)))
+        if (len(self._events) >= self._size):
+            self._dropped += 1
+            return
+        self._events.append(event)
+        self._event.set()
+        for wake in self._wakes:
+            wake.set()
+
+    # also sets the specified event on each key event (e.g., so that the scanner wakes up right away)
+    def add_wake(self, wake):
+        self._wakes.append(wake)
+
+    # returns the queued key events (oldest first), and removes them from the queue
+    def take(self):
+        self._event.clear()
+        events = []
+        while (self._events):
+            events.append(self._events.popleft())
+        return events
+
+    # waits for a key event (or the timeout); returns True if there is one
+    def wait(self, timeout=None):
+        return self._clock.wait(self._event, timeout)
+
+    # notes that the phase has handled a key event
+    def handled(self, event):
+        self._latencies.append(self._clock.now() - event.time)
+
+    # returns the keypad report as a string
+    def report(self):
+        average = (self._busy / self._scans * 1000000 if self._scans else 0)
+        report = f"{self._name}: {self._presses} presses, {self._scans} scans, avg scan={average:.1f}us, {self._dropped} dropped"
+        if (self._latencies):
+            latencies = sorted(self._latencies)
+            report += f", change-to-handled latency avg={sum(latencies) / len(latencies) * 1000:.3f}ms "\
+                      f"p50={latencies[len(latencies) // 2] * 1000:.3f}ms max={latencies[-1] * 1000:.3f}ms"
+        return report
@@ -0,0 +1,118 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Input-to-output latency instrumentation
+# Each input (a pin change, key, or click) is timestamped when the phase detects it, and every later stage
+#  (the event posted, observed by the GUI, the label updated, the sound started) notes how long after that it happened
+#  in an HDR-style histogram per phase and stage
+#################################
+
+# import the clocks
+from bomb_clock import getClock
+
+#########
+# classes
+#########
+# an HDR-style latency histogram
+# the buckets are log-linear: exact (to the microsecond) below 128us, then 64 buckets per power of two,
+#  so every latency from 1us to 100s is kept to within ~1.6% in a fixed (~1400 bucket) array
+class Histogram:
+    # the number of bits of precision (the sub-buckets per power of two are half of 2^BITS)
+    BITS = 7
+    # the largest latency (in microseconds) that is kept (larger ones are counted in the top bucket)
+    LIMIT = 100000000
+
+    def __init__(self):
+        self._counts = [ 0 ] * (Histogram._index(Histogram.LIMIT) + 1)
+        # the number of latencies, their total, and the largest one (in microseconds)
+        self._count = 0
+        self._total = 0
+        self._max = 0
+
+    # returns the bucket of a latency (in microseconds) (only internally called)
+    @staticmethod
+    def _index(value):
+        if (value < (1 << Histogram.BITS)):
+            return value
+        shift = value.bit_length() - Histogram.BITS
+        return (shift << (Histogram.BITS - 1)) + (value >> shift)
+
+    # returns the smallest latency (in microseconds) of a bucket (only internally called)
+    @staticmethod
+    def _value(index):
+        if (index < (1 << Histogram.BITS)):
+            return index
+        shift = (index >> (Histogram.BITS - 1)) - 1
+        return (index - (shift << (Histogram.BITS - 1))) << shift
+
+    # records a latency (in seconds)
+    def record(self, seconds):
+        value = min(max(int(seconds * 1000000), 0), Histogram.LIMIT)
+        self._counts[Histogram._index(value)] += 1
+        self._count += 1
+        self._total += value
+        self._max = max(self._max, value)
+
+    # the number of latencies
+    def __len__(self):
+        return self._count
+
+    # returns the latency (in seconds) below which the specified percentage of the latencies are
+    def percentile(self, percent):
+        if (not self._count):
+            return 0
+        wanted = max(int(self._count * percent / 100 + 0.5), 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if (seen >= wanted):
+                return min(Histogram._value(index), self._max) / 1000000
+        return self._max / 1000000
+
+    # returns the average latency (in seconds)
+    def mean(self):
+        return (self._total / self._count / 1000000 if self._count else 0)
+
+    # returns the largest latency (in seconds)
+    def max(self):
+        return self._max / 1000000
+
+# the latency tracker
+# it keeps a histogram per phase and stage, for the latencies since the phase detected its input
+class LatencyTracker:
+    # the stages (in the order that they happen)
+    STAGES = [ "posted", "observed", "label", "audio" ]
+
+    def __init__(self, clock=None):
+        self._clock = (clock or getClock())
+        # (phase, stage) -> histogram
+        self._histograms = {}
+        # when the tracker started
+        self._start = self._clock.now()
+
+    # notes that a stage of handling the phase's input happened now (the input was detected at the specified time)
+    def record(self, phase, stage, detected, now=None):
+        if (detected is None):
+            return
+        key = (phase, stage)
+        if (key not in self._histograms):
+            self._histograms[key] = Histogram()
+        self._histograms[key].record((now if now is not None else self._clock.now()) - detected)
+
+    # returns the histogram of a phase's stage (None -> nothing recorded)
+    def histogram(self, phase, stage):
+        return self._histograms.get((phase, stage))
+
+    # returns the latency dump (a table of the percentiles per phase and stage) as a string
+    def dump(self):
+        lines = [ f"Latency since the input was detected ({self._clock.now() - self._start:.1f}s):",\
+                  f"  {'phase':<8} {'stage':<9} {'count':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'p99.9':>9} {'max':>9}" ]
+        phases = sorted(set(phase for phase, stage in self._histograms))
+        for phase in phases:
+            for stage in LatencyTracker.STAGES:
+                histogram = self._histograms.get((phase, stage))
+                if (histogram):
+                    percentiles = [ histogram.percentile(p) for p in (50, 90, 99, 99.9) ] + [ histogram.max() ]
+                    lines.append(f"  {phase:<8} {stage:<9} {len(histogram):>6} " + " ".join(f"{p * 1000:>7.2f}ms" for p in percentiles))
+        if (not phases):
+            lines.append("  (nothing recorded)")
+        return "\n".join(lines)
@@ -0,0 +1,160 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Monte Carlo player simulator
+# Estimates the chance of defusing the bomb and how long it takes under the current rules, for a few player models,
+#  by playing games against puzzles from the game's own generators (genSerial and genKeypadCombination) on the
+#  vectorized engine (see bomb_engine.py), in chunks spread across a process pool
+# The chunks are folded into streaming statistics as they finish, so the memory used doesn't grow with the games
+# usage: python3 bomb_montecarlo.py [--games N] [--players NAME ...] [--processes P] [--countdown S] [--chunk N] [--seed S]
+#################################
+
+# import the configs, the puzzle generators, and the engine
+from bomb_configs import *
+from bomb_puzzle import genSerial, genKeypadCombination, BUTTON_COLORS
+from bomb_engine import Engine, FRAME, np
+# other imports
+import random
+from math import sqrt
+from time import perf_counter
+from multiprocessing import Pool, cpu_count
+from argparse import ArgumentParser
+
+# the player models: name -> (how often (per second, on average) the player makes a move,
+#  the chance that a move is the right one)
+PLAYERS = { "perfect": (2, 1),\
+            "error-prone": (2, 0.85),\
+            "slow": (0.5, 1) }
+
+#########
+# classes
+#########
+# streaming statistics of the games' results
+# the counts, the running mean and variance (Welford's) of the time to defuse, and a histogram of it (one bin per frame)
+#  take the same memory however many games are added, and the statistics of two sets of games can be merged
+class Stats:
+    def __init__(self, countdown=COUNTDOWN):
+        if (np is None):
+            raise ImportError("The Monte Carlo simulator needs NumPy (pip3 install numpy).")
+        self.games = 0
+        self.defused = 0
+        # the games that exploded because the countdown expired, and because of too many strikes
+        self.expired = 0
+        self.struck = 0
+        self.strikes = 0
+        # the time (s) to defuse: the number of defused games, its mean, and its sum of squared differences from the mean
+        self._mean = 0
+        self._m2 = 0
+        self._histogram = np.zeros(int(countdown * 1000 / FRAME) + 2, dtype=np.int64)
+
+    # adds the results of a set of games (like Engine.play returns them), with the strikes that they started with
+    def add(self, results, strikes=NUM_STRIKES):
+        defused = (results["outcome"] == "defused")
+        exploded = ~defused
+        self.games += len(defused)
+        self.struck += int((exploded & (results["strikes_left"] <= 0)).sum())
+        self.expired += int((exploded & (results["strikes_left"] > 0)).sum())
+        self.strikes += int((strikes - results["strikes_left"]).sum())
+        times = results["time"][defused]
+        if (times.size):
+            # (the defused games are counted when their times are merged in)
+            other = Stats.__new__(Stats)
+            other.defused, other._mean, other._m2 = times.size, times.mean(), ((times - times.mean()) ** 2).sum()
+            self._merge_times(other)
+            self.defused += other.defused
+            frames = np.minimum(np.rint(times * 1000 / FRAME).astype(np.int64), len(self._histogram) - 1)
+            self._histogram += np.bincount(frames, minlength=len(self._histogram))
+
+    # merges the statistics of another set of games into these
+    def merge(self, other):
+        self._merge_times(other)
+        self.games += other.games
+        self.defused += other.defused
+        self.expired += other.expired
+        self.struck += other.struck
+        self.strikes += other.strikes
+        self._histogram += other._histogram
+
+    # merges the running mean and variance of the time to defuse (Chan's parallel update) (only internally called)
+    def _merge_times(self, other):
+        total = self.defused + other.defused
+        if (total):
+            delta = other._mean - self._mean
+            self._m2 += other._m2 + delta * delta * self.defused * other.defused / total
+            self._mean += delta * other.defused / total
+
+    # the chance of defusing the bomb, and its 95% confidence interval (+/-)
+    def probability(self):
+        p = (self.defused / self.games if self.games else 0)
+        return p, (1.96 * sqrt(p * (1 - p) / self.games) if self.games else 0)
+
+    # the mean and standard deviation of the time (s) to defuse
+    def time(self):
+        return self._mean, (sqrt(self._m2 / (self.defused - 1)) if self.defused > 1 else 0)
+
+    # returns the time (s) that the specified fraction of the defused games were defused by (to the frame)
+    def quantile(self, q):
+        if (not self.defused):
+            return 0
+        frame = int(np.searchsorted(np.cumsum(self._histogram), q * self.defused))
+        return frame * FRAME / 1000
+
+###########
+# functions
+###########
+# plays a chunk of games with a player model (in a worker process), against puzzles from the game's generators
+# returns the chunk's statistics
+def playChunk(player, games, countdown=COUNTDOWN, seed=None):
+    rng = random.Random(seed)
+    toggles_target, keypad_target, button_color = [], [], []
+    for i in range(games):
+        serial, toggles, wires = genSerial(rng)
+        keyword, cipher_keyword, rot, combination, passphrase = genKeypadCombination(rng)
+        toggles_target.append(toggles)
+        keypad_target.append(int(combination))
+        button_color.append(BUTTON_COLORS.index(rng.choice(BUTTON_COLORS)))
+    engine = Engine({ "toggles_target": toggles_target, "keypad_target": keypad_target, "button_color": button_color }, countdown)
+    rate, accuracy = PLAYERS[player]
+    stats = Stats(countdown)
+    stats.add(engine.play(rate, accuracy, seed))
+    return player, stats
+
+# plays the specified number of games per player model across a process pool (the chunks are merged as they finish)
+# returns the statistics of each player model: name -> Stats
+def simulate(games, players=tuple(PLAYERS), processes=None, countdown=COUNTDOWN, chunk=10000, seed=None):
+    seed = (seed if seed is not None else random.randrange(1 << 32))
+    chunks = [ (player, min(chunk, games - start), countdown, seed + i * len(PLAYERS) + list(PLAYERS).index(player))\
+               for player in players for i, start in enumerate(range(0, games, chunk)) ]
+    stats = { player: Stats(countdown) for player in players }
+    with Pool(processes or cpu_count()) as pool:
+        for player, chunk_stats in pool.imap_unordered(_playChunk, chunks):
+            stats[player].merge(chunk_stats)
+    return stats
+
+# plays a chunk of games from its arguments (for the pool) (only internally called)
+def _playChunk(args):
+    return playChunk(*args)
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Estimates the chance and time of defusing the bomb for a few player models.")
+    parser.add_argument("--games", type=int, default=1000000, help="the number of games per player model")
+    parser.add_argument("--players", nargs="+", choices=list(PLAYERS), default=list(PLAYERS), help="the player models")
+    parser.add_argument("--processes", type=int, default=None, help="the number of worker processes (default: the cores)")
+    parser.add_argument("--countdown", type=int, default=COUNTDOWN, help="the countdown (s)")
+    parser.add_argument("--chunk", type=int, default=10000, help="the games played per chunk")
+    parser.add_argument("--seed", type=int, default=None, help="the random seed")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    stats = simulate(args.games, args.players, args.processes, args.countdown, args.chunk, args.seed)
+    print(f"{'player':<12} {'games':>9} {'defused':>15} {'mean time':>15} {'p10':>7} {'p50':>7} {'p90':>7} "\
+          f"{'expired':>8} {'struck':>8} {'strikes':>8}")
+    for player, stat in stats.items():
+        p, error = stat.probability()
+        mean, deviation = stat.time()
+        print(f"{player:<12} {stat.games:>9} {p * 100:>7.2f}%+/-{error * 100:<4.2f} {f'{mean:.1f}s+/-{deviation:.1f}s':>15} "\
+              f"{stat.quantile(0.1):>6.1f}s {stat.quantile(0.5):>6.1f}s {stat.quantile(0.9):>6.1f}s "\
+              f"{stat.expired / stat.games * 100:>7.1f}% {stat.struck / stat.games * 100:>7.1f}% {stat.strikes / stat.games:>8.2f}")
+    print(f"{args.games * len(stats)} games in {perf_counter() - start:.1f}s")
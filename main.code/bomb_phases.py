@@ -0,0 +1,670 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Phase class definitions
+#################################
+
+# import the configs
+from bomb_configs import *
+# import the input engine, the clocks, and the flight recorder
+from bomb_inputs import *
+from bomb_clock import getClock
+import bomb_flight as flight
+# other imports
+from threading import Thread, Event, Lock
+from queue import Queue, Full, Empty
+from collections import deque, namedtuple, Counter
+from time import perf_counter
+from math import ceil
+
+# the phase events: what happened (EVENT_STRIKE, EVENT_DEFUSED, or EVENT_VALUE changed), to which phase, when (clock time),
+#  and when the input that caused it was detected (clock time)
+# (the kinds are prefixed, so that they don't shadow the STRIKE and DEFUSED sounds from the configs)
+PhaseEvent = namedtuple("PhaseEvent", [ "kind", "phase", "time", "detected" ])
+EVENT_STRIKE = "strike"
+EVENT_DEFUSED = "defused"
+EVENT_VALUE = "value"
+# the flight recorder code of each kind of event
+FLIGHT_CODES = { EVENT_STRIKE: flight.STRIKE, EVENT_DEFUSED: flight.DEFUSED, EVENT_VALUE: flight.VALUE }
+
+#########
+# classes
+#########
+# the phase event channel
+# the phases post their events (from the scanner thread), and the GUI drains and handles them (in the order they were posted)
+# posting never blocks (the scanner and the GUI may be on the same thread, e.g., on the virtual clock)
+# strikes and defusals are never dropped (if the channel is full, they overflow into an unbounded backlog that is drained
+#  after the channel); value changes are dropped if the channel is full
+class EventChannel:
+    def __init__(self, size=EVENT_QUEUE, clock=None):
+        self._clock = (clock or getClock())
+        self._queue = Queue(size)
+        # the strikes and defusals that didn't fit in the channel (in the order they were posted)
+        self._overflow = deque()
+        # the number of value changes that were dropped (and whether any were since the last drain)
+        self._dropped = 0
+        self._overflowed = False
+        # the number of events handled (by kind), and the post-to-handled latencies (in seconds)
+        self._handled = Counter()
+        self._latencies = deque(maxlen=EdgeInput.HISTORY)
+
+    # posts an event
+    def post(self, event):
+        try:
+            # (once a strike or defusal has overflowed, the events after it wait behind it, to keep them in order)
+            if (self._overflow):
+                raise Full
+            self._queue.put_nowait(event)
+        except Full:
+            if (event.kind != EVENT_VALUE):
+                self._overflow.append(event)
+            else:
+                self._dropped += 1
+                self._overflowed = True
+
+    # yields the posted events (until there are none left); an event is handled once the next one is asked for
+    def drain(self):
+        while (True):
+            try:
+                event = self._queue.get_nowait()
+            except Empty:
+                # then the strikes and defusals that overflowed
+                if (not self._overflow):
+                    return
+                event = self._overflow.popleft()
+            yield event
+            self._handled[event.kind] += 1
+            self._latencies.append(self._clock.now() - event.time)
+
+    # returns whether any value changes were dropped since this was last called
+    def overflowed(self):
+        overflowed = self._overflowed
+        self._overflowed = False
+        return overflowed
+
+    # returns the event report as a string
+    def report(self):
+        if (not self._latencies):
+            return "Events: none handled"
+        latencies = sorted(self._latencies)
+        average = sum(latencies) / len(latencies)
+        handled = ", ".join(f"{count} {kind}" for kind, count in self._handled.items())
+        return f"Events: {sum(self._handled.values())} handled ({handled}), {self._dropped} dropped, "\
+               f"post-to-handled latency avg={average * 1000:.1f}ms p50={latencies[len(latencies) // 2] * 1000:.1f}ms "\
+               f"max={latencies[-1] * 1000:.1f}ms"
+
+# template (superclass) for various bomb components/phases
+class PhaseThread(Thread):
+    def __init__(self, name, component=None, target=None, clock=None):
+        super().__init__(name=name, daemon=True)
+        # the clock that the phase tells time (and waits) with, and the phase's flight recorder source
+        self._clock = (clock or getClock())
+        self._source = flight.recorder.source(name)
+        # phases have an electronic component (which usually represents the GPIO pins)
+        self._component = component
+        # phases have a target value (e.g., a specific combination on the keypad, the proper jumper wires to "cut", etc)
+        self._target = target
+        # phases can be successfully defused
+        self._defused = False
+        # phases have a value (e.g., a pushbutton can be True/Pressed or False/Released, several jumper wires can be "cut"/False, etc)
+        self._value = None
+        # phase threads are either running or not
+        self._running = False
+        # the events to set when the phase needs to be scanned right away
+        self._wakes = []
+        # the version of the phase's state (it goes up whenever the state changes, so the GUI only redraws changed phases)
+        self._version = 0
+        # the channel that the phase posts its events (strikes, defusals, and value changes) to (set by the scanner)
+        self._events = None
+        # when the input that the phase is handling was detected (None -> when its event is posted)
+        self._detected = None
+
+    # runs the thread
+    # phases normally don't run in their own thread: the scanner steps all of them instead (see Scanner)
+    # running a phase as a thread is still supported by repeatedly stepping it
+    def run(self):
+        self._running = True
+        self._begin()
+        while (self._running):
+            self.scan()
+            self._wait()
+
+    # also sets the specified event whenever the phase needs to be scanned (e.g., the scanner's wakeup)
+    def add_wake(self, wake):
+        self._wakes.append(wake)
+
+    # wakes whoever is waiting to scan the phase (only internally called)
+    def _wake_up(self):
+        for wake in self._wakes:
+            wake.set()
+
+    # posts an event to the phase's channel (and notes it in the flight recorder) (only internally called)
+    def _post(self, kind):
+        value = (self._value if isinstance(self._value, int) and abs(self._value) < (1 << 31) else -1)
+        flight.note(FLIGHT_CODES[kind], self._source, self._version & 0xffff, value)
+        if (self._events):
+            now = self._clock.now()
+            self._events.post(PhaseEvent(kind, self, now, (self._detected if self._detected is not None else now)))
+
+    # notes that the phase's state has changed (after changing it)
+    def _publish(self):
+        self._version += 1
+        self._post(EVENT_VALUE)
+
+    # the phase has failed (a strike)
+    def _strike(self):
+        self._post(EVENT_STRIKE)
+
+    # the phase is defused (it stops right away, and is only defused once)
+    def _defuse(self):
+        if (not self._defused):
+            self._defused = True
+            self._running = False
+            self._post(EVENT_DEFUSED)
+
+    # prepares the phase to run (called once, either by run or when the phase is added to a scanner)
+    def _begin(self):
+        pass
+
+    # checks the component once and updates the phase state (must not block)
+    def scan(self):
+        pass
+
+    # returns the time (in seconds) until the phase needs to be scanned again (None -> only on an edge)
+    def _due(self):
+        return None
+
+    # waits before the next scan (only used when the phase runs in its own thread)
+    def _wait(self):
+        self._clock.sleep(0.1)
+
+# the multiplexed scanner
+# a single loop (a thread on the real clock) scans every phase in one tick (instead of one thread per phase)
+# it wakes up at the scan rate, when a phase is due (e.g., the timer), or on a pin edge
+class Scanner:
+    def __init__(self, rate=None, name="Scanner", clock=None):
+        self.name = name
+        self._clock = (clock or getClock())
+        # the scanner's thread (None -> not started, or the clock has no threads)
+        self._thread = None
+        # the scan rate (Hz)
+        self._period = 1 / (rate or SCAN_RATE)
+        # the phases that are scanned
+        self._phases = []
+        # set when a pin edge occurs (so that the scanner wakes up right away)
+        self._wake = Event()
+        # the channel that the phases post their events to (the GUI drains it)
+        self.events = EventChannel(clock=self._clock)
+        # the scanner is either running or not
+        self._running = False
+        # the number of ticks and the total time spent scanning (for the report)
+        self._ticks = 0
+        self._busy = 0
+
+    # adds a phase to the scanner (this replaces starting the phase's thread)
+    def add(self, phase):
+        phase._running = True
+        phase._events = self.events
+        phase._begin()
+        # the phase wakes the scanner (e.g., on a pin edge)
+        phase.add_wake(self._wake)
+        self._phases.append(phase)
+
+    # starts scanning the phases
+    def start(self):
+        self._running = True
+        self._thread = self._clock.loop(self.name, self.tick, self._wake)
+
+    # waits for the scanner's thread to stop (after it has been stopped)
+    def join(self, timeout=None):
+        if (self._thread):
+            self._thread.join(timeout)
+
+    # scans every (running) phase once
+    # returns the time until the next tick (it is sooner on an edge) (None -> the scanner has stopped)
+    def tick(self):
+        if (not self._running):
+            return None
+        start = perf_counter()
+        timeout = self._period
+        for phase in self._phases:
+            if (phase._running):
+                phase.scan()
+                due = phase._due()
+                if (due is not None):
+                    timeout = min(timeout, due)
+        self._ticks += 1
+        self._busy += perf_counter() - start
+        return max(timeout, 0)
+
+    # returns the scanner report as a string
+    def report(self):
+        average = (self._busy / self._ticks * 1000000 if self._ticks else 0)
+        return f"{self.name}: {len(self._phases)} phases, {self._ticks} ticks, avg scan={average:.1f}us"
+
+# template (superclass) for various numeric bomb components/phases
+# these types of phases can be represented as the binary representation of an integer
+# e.g., jumper wires phase, toggle switches phase
+class NumericPhase(PhaseThread):
+    def __init__(self, name, component=None, target=None, display_length=0, clock=None):
+        super().__init__(name, component, target, clock)
+        # the default value is the current state of the component
+        self._value = self._get_int_state()
+        # we need to know the previous state to detect state change
+        self._prev_value = self._value
+        # we need to know the display length (character width) of the pin states (for the GUI), and the number of pins
+        self._display_length = display_length
+        self._pins = len(self._component)
+        # the states are lined up with the pins the way they are compared (see _pin_bits): the previous state always
+        #  fits the pins, so it is shifted by the same amount; the target is lined up again only when it changes
+        self._prev_shift = max(display_length - self._pins, 0)
+        self._pin_target = None
+        self._pin_target_for = None
+        # the phase only wakes up when one of its pins changes (the initial state is always checked)
+        self._edges = EdgeInput(component, name, clock=self._clock)
+        self._edges.poke()
+
+    # checks the component (only when one of its pins has changed)
+    def scan(self):
+        if (not self._edges.take()):
+            return
+        self._detected = self._edges.edge_time()
+        # get the component value
+        self._value = self._get_int_state()
+        # the component value is correct -> phase defused
+        if (self._value == self._target):
+            self._defuse()
+        # the component state has changed
+        elif (self._value != self._prev_value):
+            # one or more component states are incorrect -> phase failed (strike)
+            if (not self._check_state()):
+                self._strike()
+            # note the updated state
+            self._prev_value = self._value
+        self._publish()
+        self._edges.handled()
+
+    # waits for a pin to change (the timeout lets the thread notice when it is stopped)
+    def _wait(self):
+        self._edges.wait(1)
+
+    # the phase's pin edges set the specified event
+    def add_wake(self, wake):
+        self._edges.add_wake(wake)
+
+    # checks the component for an incorrect state (only internally called)
+    # the states are bitmasks (the first pin is the most significant bit), so this costs the same for any number of pins
+    def _check_state(self):
+        if (self._target != self._pin_target_for):
+            self._pin_target = self._pin_bits(self._target)
+            self._pin_target_for = self._target
+        # the pins that have changed, and the pins that are in an invalid (not target) state
+        value = self._value
+        changed = value ^ (self._prev_value >> self._prev_shift)
+        invalid = value ^ self._pin_target
+        # a component state has changed *and* it is in an invalid state -> phase failed (strike)
+        return not (changed & invalid)
+
+    # returns a state lined up with the pins, the way that the states are compared (only internally called)
+    # (a state's binary digits, padded to the display length, are compared with the pins from the first digit on,
+    #  so a state that is wider than the pins, e.g., the wires' initial target of 100, is compared by its leading digits)
+    def _pin_bits(self, state):
+        return state >> max(max(self._display_length, state.bit_length()) - self._pins, 0)
+
+    # returns the state of the component as a list (True/False)
+    def _get_bool_state(self):
+        return [ pin.value for pin in self._component ]
+
+    # returns the state of the component as an integer (a bitmask; the first pin is the most significant bit)
+    def _get_int_state(self):
+        value = 0
+        for pin in self._component:
+            value = (value << 1) | bool(pin.value)
+        return value
+
+    # returns the state of the component as a string
+    def __str__(self):
+        if (self._defused):
+            return "DEFUSED"
+        else:
+            return f"{bin(self._value)[2:].zfill(self._display_length)}/{self._value}"
+
+# the timer phase
+# the countdown is deadline-based: it tracks the remaining time against the (monotonic) clock (so it doesn't drift),
+#  and pausing/unpausing or changing the interval takes effect right away (keeping any partial tick)
+class Timer(PhaseThread):
+    def __init__(self, component, initial_value, name="Timer", clock=None):
+        super().__init__(name, component, clock=clock)
+        # the default value is the specified initial value
+        self._value = initial_value
+        # is the timer paused?
+        self._paused = False
+        # initialize the timer's minutes/seconds representation
+        self._min = ""
+        self._sec = ""
+        # the scanner thread and the GUI thread both use the timer
+        self._lock = Lock()
+        # by default, each tick is 1 second
+        self._tick = 1
+        # the countdown (in ticks) that remained at the anchor time (None -> the timer hasn't started yet)
+        self._remaining = initial_value
+        self._anchor = None
+        # when the timer started and was last paused, and how long it has been paused (for the drift report)
+        self._began = None
+        self._paused_at = None
+        self._paused_for = 0
+        # how late each tick was displayed, and how late the expiry was noticed (in seconds)
+        self._lateness = deque(maxlen=EdgeInput.HISTORY)
+        self._drift = None
+        # set whenever the countdown changes (so that a waiting thread re-checks it right away)
+        self._changed = Event()
+        self.add_wake(self._changed)
+
+    # the length of a tick (in seconds)
+    @property
+    def _interval(self):
+        return self._tick
+
+    # changing the length of a tick applies immediately (the remaining part of the current tick is rescaled)
+    @_interval.setter
+    def _interval(self, interval):
+        with self._lock:
+            if (interval == self._tick):
+                return
+            if (self._anchor is not None and not self._paused):
+                now = self._clock.now()
+                self._remaining = self._remaining_at(now)
+                self._anchor = now
+            self._tick = interval
+        self._wake_up()
+
+    # returns the countdown (in ticks) remaining at the specified time (only internally called)
+    def _remaining_at(self, now):
+        if (self._paused):
+            return self._remaining
+        return self._remaining - (now - self._anchor) / self._tick
+
+    # returns the timer's value at the specified time (only internally called)
+    # a tick is over exactly at its deadline (the anchor plus the ticks since), even where the remaining countdown
+    #  rounds to the next value a little before or after it, so that when the value changes doesn't depend on
+    #  when it is scanned
+    def _value_at(self, now):
+        if (self._paused):
+            return max(ceil(self._remaining), 0)
+        remaining, anchor, tick = self._remaining, self._anchor, self._tick
+        value = max(ceil(remaining - (now - anchor) / tick), 0)
+        if (now < anchor + (remaining - value) * tick):
+            value += 1
+        elif (value > 0 and now >= anchor + (remaining - (value - 1)) * tick):
+            value -= 1
+        return value
+
+    # updates the countdown (and the 7-segment display when a tick is over)
+    def scan(self):
+        with self._lock:
+            if (self._paused):
+                return
+            now = self._clock.now()
+            # start the countdown
+            if (self._anchor is None):
+                self._anchor = now
+                self._began = now
+                self._display()
+                return
+            value = self._value_at(now)
+            if (value != self._value):
+                # note how long ago the tick was actually over
+                self._lateness.append((value - self._remaining_at(now)) * self._tick)
+                self._detected = now - self._lateness[-1]
+                self._value = value
+                self._display()
+            # the timer has expired -> phase failed (explode)
+            if (value == 0):
+                self._drift = now - (self._anchor + self._remaining * self._tick)
+                self._running = False
+
+    # updates the timer and displays its value on the 7-segment display (only internally called)
+    def _display(self):
+        self._update()
+        self._component.print(str(self))
+        self._publish()
+
+    # the timer needs to be scanned again when the current tick is over
+    def _due(self):
+        with self._lock:
+            if (self._paused or self._anchor is None):
+                return None if self._paused else 0
+            now = self._clock.now()
+            value = self._value_at(now)
+            if (value == 0):
+                return 0
+            return max(self._anchor + (self._remaining - (value - 1)) * self._tick - now, 0)
+
+    # waits until the current tick is over (or the countdown changes)
+    def _wait(self):
+        due = self._due()
+        self._clock.wait(self._changed, due)
+        self._changed.clear()
+
+    # updates the timer (only internally called)
+    def _update(self):
+        self._min = f"{self._value // 60}".zfill(2)
+        self._sec = f"{self._value % 60}".zfill(2)
+
+    # pauses and unpauses the timer
+    def pause(self):
+        with self._lock:
+            now = self._clock.now()
+            if (self._anchor is not None):
+                # freeze the remaining countdown
+                if (not self._paused):
+                    self._remaining = self._remaining_at(now)
+                    self._paused_at = now
+                # restart the countdown from where it was frozen
+                else:
+                    self._anchor = now
+                    self._paused_for += now - self._paused_at
+            # toggle the paused state
+            self._paused = not self._paused
+        self._wake_up()
+        # blink the 7-segment display when paused
+        self._component.blink_rate = (2 if self._paused else 0)
+
+    # returns the drift report as a string
+    def report(self):
+        if (not self._lateness):
+            return f"{self.name}: not started"
+        lateness = sorted(self._lateness)
+        average = sum(lateness) / len(lateness)
+        report = f"{self.name}: tick lateness avg={average * 1000:.3f}ms max={lateness[-1] * 1000:.3f}ms"
+        if (self._drift is not None):
+            # the time the countdown actually ran for (excluding pauses) vs the time it should have run for
+            elapsed = self._anchor + self._remaining * self._tick + self._drift - self._began - self._paused_for
+            report += f", ran {elapsed:.3f}s (expected {elapsed - self._drift:.3f}s, drift={self._drift * 1000:+.3f}ms)"
+        return report
+
+    # returns the timer as a string (mm:ss)
+    def __str__(self):
+        return f"{self._min}:{self._sec}"
+# the keypad phase
+class Keypad(PhaseThread):
+    def __init__(self, component, target, dings=0, audio=None, name="Keypad", clock=None):
+        super().__init__(name, component, target, clock)
+        # the default value is an empty string
+        self._value = ""
+        # the number of times to ding (the hint) when # is pressed, and the audio to ding with
+        self._dings = dings
+        self._audio = audio
+        # the keypad driver scans and debounces the keys (whenever the phase is scanned and a keypad scan is due)
+        #  and queues them for the phase
+        self._keys = KeypadDriver(component, name, clock=self._clock)
+
+    # starts the keypad driver
+    def _begin(self):
+        self._keys.start()
+
+    # scans the keypad (if it is due), and handles the queued keys (a key is processed when it is released;
+    #  keys typed ahead are processed in order)
+    def scan(self):
+        self._keys.poll()
+        for event in self._keys.take():
+            # the rest of the keys don't matter once the phase is defused
+            if (self._defused):
+                break
+            if (event.kind == RELEASE):
+                self._detected = event.time
+                self._press(event.key)
+                self._keys.handled(event)
+
+    # processes a key (only internally called)
+    def _press(self, key):
+        if key == "#":
+            if (self._audio):
+                self._audio.play("ding", loops=(self._dings-1), since=self._detected)
+        else:
+            # log the key
+            self._value += str(key)
+            # the combination is correct -> phase defused
+            if (self._value == self._target):
+                self._defuse()
+            # the combination is incorrect -> phase failed (strike), and the combination starts over
+            elif (self._value != self._target[0:len(self._value)]):
+                self._strike()
+                self._value = ""
+            self._publish()
+
+    # the keypad needs to be scanned again when its next scan is due
+    def _due(self):
+        return self._keys.due()
+
+    # waits until the next keypad scan is due
+    def _wait(self):
+        due = self._due()
+        self._keys.wait(1 if due is None else min(due, 1))
+
+    # the keypad driver's key events set the specified event
+    def add_wake(self, wake):
+        self._keys.add_wake(wake)
+
+    # returns the keypad combination as a string
+    def __str__(self):
+        if (self._defused):
+            return "DEFUSED"
+        else:
+            return self._value
+
+    
+# the jumper wires phase
+class Wires(NumericPhase):
+    def __init__(self, component, target, display_length, name="Wires", clock=None):
+        super().__init__(name, component, target, display_length, clock)
+        self._defused = False
+        
+    # sets a new target (and wakes the phase so that the new target is checked right away)
+    def update_wires_target(self, value):
+        self._target = value
+        self._edges.poke()
+
+    def __str__(self):
+        if (self._defused):
+            return "DEFUSED"
+        else:
+            return "".join([ chr(int(i)+65) if pin.value else "." for i, pin in enumerate(self._component) ])
+        #jumper_indexes = [0] * 5
+       # while sum(jumper_indexes) < 3:
+           # jumper_indexes[randint(0, len(jumper_indexes) - 1)] = 1
+      #  jumper_letters = [ chr(i + 65) for i, n in enumerate(jumper_indexes) if n == 1 ]
+        
+        #jumper_letters = self._value
+# the pushbutton phase
+# the pushbutton phase
+class Button(PhaseThread):
+    def __init__(self, component_state, component_rgb, target, color, combination, name="Button", clock=None):
+        super().__init__(name, component_state, target, clock)
+        # the default value is False/Released
+        self._value = False
+        # we need the pushbutton's RGB pins to set its color
+        self._rgb = component_rgb
+        # the pushbutton's randomly selected LED color
+        self._color = color
+        # define the number of clicks required to defuse based on color (and the keypad combination)
+        self._clicks_required = int(str(combination)[-1])
+        if color == "G":
+            self._clicks_required = int(str(combination)[0]) + int(str(combination)[-1])
+        elif color == "B":
+            self._clicks_required = int(str(combination)[0])
+        # count the number of clicks
+        self._click_count = 0
+        # the phase only wakes up when the pushbutton changes (the initial state is always checked)
+        # every change is logged with its time, so clicks that are quicker than a scan aren't missed
+        self._edges = EdgeInput([ component_state ], name, log=True, clock=self._clock)
+        self._edges.poke()
+        # the clicks (and long presses and multi-click series) are recognized from the logged changes
+        self._gestures = Gestures(clock=self._clock)
+        # the recognized gestures
+        self._gesture_log = deque(maxlen=EdgeInput.HISTORY)
+
+    # sets the RGB LED color
+    def _begin(self):
+        self._rgb[0].value = False if self._color == "R" else True
+        self._rgb[1].value = False if self._color == "G" else True
+        self._rgb[2].value = False if self._color == "B" else True
+
+    # checks the pushbutton (only when it has changed, or a change or series of clicks is pending)
+    def scan(self):
+        edge = self._edges.take()
+        now = self._clock.now()
+        if (not edge and self._gestures.due(now) != 0):
+            return
+        # get the pushbutton's state
+        self._value = self._component.value
+        # count the clicks (every release after a press, whether it was a click or a long press)
+        for gesture in self._gestures.update([ (time, value) for time, i, value in self._edges.changes() ], now):
+            self._gesture_log.append(gesture)
+            if (gesture.kind != MULTI and not self._defused):
+                self._detected = gesture.time
+                self._click_count += 1
+                # check if the required number of clicks is reached
+                if self._click_count == self._clicks_required:
+                    self._defuse()
+                self._publish()
+        if (edge):
+            self._edges.handled()
+
+    # the pushbutton needs to be scanned again when a change settles or a series of clicks is over
+    def _due(self):
+        return self._gestures.due(self._clock.now())
+
+    # waits for the pushbutton to change (the timeout lets the thread notice when it is stopped)
+    def _wait(self):
+        due = self._due()
+        self._edges.wait(1 if due is None else min(due, 1))
+
+    # the pushbutton's edges set the specified event
+    def add_wake(self, wake):
+        self._edges.add_wake(wake)
+
+    # returns the pushbutton's state as a string
+    def __str__(self):
+        if (self._defused):
+            return "DEFUSED"
+        else:
+            return f"{self._click_count} clicks"
+
+
+# the toggle switches phase
+class Toggles(NumericPhase):
+    sumdigits = None  # Class variable to store the sum of digits
+
+    def __init__(self, component, target, display_length, timer, name="Toggles", clock=None):
+        super().__init__(name, component, target, display_length, clock)
+        self._timer = timer
+        
+    def __str__(self):
+        if self._defused:
+            timevalue = self._timer._value
+            digits = list(str(timevalue))
+            #sumdigits = sum(int(digit) for digit in digits)  # Store the sum of digits
+            formattedtime = ", ".join(digits)
+            return "DEFUSED\n{}: ({})".format(str(timevalue), formattedtime)
+        else:
+            return f"{bin(self._value)[2:].zfill(self._display_length)}/{self._value}"
@@ -0,0 +1,75 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Startup and frame profilers
+#################################
+
+# imports
+from time import perf_counter, process_time
+
+#########
+# classes
+#########
+# the startup profiler
+# it notes how long each part of the startup takes (imports, pygame.init, component setup, the first Tk frame, ...)
+class StartupProfiler:
+    def __init__(self, enabled=False, start=None):
+        # is the profiler enabled? (if not, marks are ignored)
+        self._enabled = enabled
+        # when the program started
+        self._start = (start if start is not None else perf_counter())
+        self._last = self._start
+        # the parts of the startup: [ (name, seconds) ]
+        self._parts = []
+        # has the breakdown been printed?
+        self._reported = False
+
+    # notes that a part of the startup has just finished (it took the time since the previous mark)
+    def mark(self, name):
+        if (not self._enabled):
+            return
+        now = perf_counter()
+        self._parts.append((name, now - self._last))
+        self._last = now
+
+    # prints the per-part breakdown (once)
+    def report(self):
+        if (not self._enabled or self._reported):
+            return
+        self._reported = True
+        total = self._last - self._start
+        print("Startup profile:")
+        for name, seconds in self._parts:
+            share = (seconds / total * 100 if total else 0)
+            print(f"  {name:<28} {seconds * 1000:9.1f}ms {share:5.1f}%")
+        print(f"  {'total':<28} {total * 1000:9.1f}ms")
+
+# the frame profiler
+# it notes how long each GUI frame (a check of the phases and the label redraws) takes, how many labels were redrawn,
+#  and how much CPU the whole program used while the bomb was running
+class FrameProfiler:
+    def __init__(self):
+        # the number of frames, the total and longest frame times (in seconds), and the number of label redraws
+        self._frames = 0
+        self._busy = 0
+        self._longest = 0
+        self._redraws = 0
+        # when the profiler started (wall clock and process CPU time)
+        self._start = perf_counter()
+        self._cpu = process_time()
+
+    # notes a frame that took the specified time (in seconds) and redrew the specified number of labels
+    def frame(self, seconds, redraws):
+        self._frames += 1
+        self._busy += seconds
+        self._longest = max(self._longest, seconds)
+        self._redraws += redraws
+
+    # returns the frame report as a string
+    def report(self):
+        elapsed = perf_counter() - self._start
+        cpu = (process_time() - self._cpu) / elapsed * 100 if elapsed else 0
+        if (not self._frames):
+            return f"GUI: no frames, CPU={cpu:.1f}%"
+        average = self._busy / self._frames
+        return f"GUI: {self._frames} frames, avg frame={average * 1000000:.1f}us max={self._longest * 1000000:.1f}us, "\
+               f"{self._redraws} label redraws ({self._redraws / self._frames:.2f}/frame), CPU={cpu:.1f}%"
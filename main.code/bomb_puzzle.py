@@ -0,0 +1,119 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Puzzle generators
+# (these only need the standard library, so they can be imported without the hardware or GUI)
+#################################
+
+# imports
+import random
+
+# the list of keywords and matching passphrases (for the keypad phase)
+KEYWORDS = { "BADGER": "RIVER",\
+             "BANDIT": "FADED",\
+             "CABLES": "SPINY",\
+             "CANOPY": "THROW",\
+             "FIELDS": "CYCLE",\
+             "FIERCE": "ALOOF",\
+             "IMMUNE": "STOLE",\
+             "IMPACT": "TOADY",\
+             "MIDWAY": "FEIGN",\
+             "MIGHTY": "CARVE",\
+             "REBORN": "TRICK",\
+             "RECALL": "CLIMB",\
+             "SYMBOL": "LEAVE",\
+             "SYSTEM": "FOXES",\
+             "WIDELY": "BOUND",\
+             "WINGED": "YACHT" }
+# the pushbutton colors
+BUTTON_COLORS = [ "R", "G", "B" ]
+
+###########
+# functions
+###########
+# generates the bomb's serial number
+#  it should be made up of alphaneumeric characters, and include at least 3 digits and 3 letters
+#  the sum of the digits should be in the range 1..15 to set the toggles target
+#  the first three letters should be distinct and in the range 0..4 such that A=0, B=1, etc, to match the jumper wires
+#  the last letter should be outside of the range
+# rng -> the random number generator to use (e.g., a seeded random.Random; the random module's by default)
+def genSerial(rng=random):
+    # set the digits (used in the toggle switches phase)
+    serial_digits = []
+    toggle_value = rng.randint(1, 15)
+    # the sum of the digits is the toggle value
+    while (len(serial_digits) < 3 or toggle_value - sum(serial_digits) > 0):
+        d = rng.randint(0, min(9, toggle_value - sum(serial_digits)))
+        serial_digits.append(d)
+
+    # set the letters (used in the jumper wires phase)
+    jumper_indexes = [ 0 ] * 5
+    while (sum(jumper_indexes) < 3):
+        jumper_indexes[rng.randint(0, len(jumper_indexes) - 1)] = 1
+
+    wires_target = 100
+        #int("".join([ str(n) for n in jumper_indexes ]), 2)  # Existing logic for wires_target
+
+    # the letters indicate which jumper wires must be "cut"
+    jumper_letters = [ chr(i + 65) for i, n in enumerate(jumper_indexes) if n == 1 ]
+
+    # form the serial number
+    serial = [ str(d) for d in serial_digits ] + jumper_letters
+    # and shuffle it
+    rng.shuffle(serial)
+    # finally, add a final letter (F..Z)
+    serial += [ rng.choice([ chr(n) for n in range(70, 91) ]) ]
+    # and make the serial number a string
+    serial = "".join(serial)
+
+    return serial, toggle_value, wires_target
+
+    
+# generates the keypad combination from a keyword and rotation key
+# rng -> the random number generator to use (like genSerial's)
+def genKeypadCombination(rng=random):
+    # encrypts a keyword using a rotation cipher
+    def encrypt(keyword, rot):
+        cipher = ""
+
+        # encrypt each letter of the keyword using rot
+        for c in keyword:
+            cipher += chr((ord(c) - 65 + rot) % 26 + 65)
+
+        return cipher
+
+    # returns the keypad digits that correspond to the passphrase
+    def digits(passphrase):
+        combination = ""
+        keys = [ None, None, "ABC", "DEF", "GHI", "JKL", "MNO", "PRS", "TUV", "WXY" ]
+
+        # process each character of the keyword
+        for c in passphrase:
+            for i, k in enumerate(keys):
+                if (k and c in k):
+                    # map each character to its digit equivalent
+                    combination += str(i)
+
+        return combination
+
+    # the rotation cipher key
+    rot = rng.randint(1, 25)
+
+    # pick a keyword and matching passphrase
+    keyword, passphrase = rng.choice(list(KEYWORDS.items()))
+    # encrypt the passphrase and get its combination
+    cipher_keyword = encrypt(keyword, rot)
+    combination = digits(passphrase)
+    # the two random hexadecimal values
+    hex_value_1 = hex(rng.randint(16, 100))[2:].upper().zfill(0)
+    hex_value_2 = hex(rng.randint(16, 100))[2:].upper().zfill(0)
+    hex_value_3 = hex(rng.randint(16, 100))[2:].upper().zfill(0)
+    
+    # calculate the decimal equivalents
+    decimal_value_1 = int(hex_value_1, 16)
+    decimal_value_2 = int(hex_value_2, 16)
+    decimal_value_3 = int(hex_value_3, 16)
+    
+    # multiply the decimal values to form the keypad combination
+    combination = str(decimal_value_1 * decimal_value_2 * decimal_value_3)
+    cipher_keyword = str(hex_value_1) + str(hex_value_2) + str(hex_value_3)
+    return keyword, cipher_keyword, rot, combination, passphrase
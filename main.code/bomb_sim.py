@@ -0,0 +1,255 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Simulated hardware backend
+# Virtual components with the same interfaces as the real ones, a headless (Tk-free) GUI, silent audio,
+#  and scripted inputs, so that the whole game can run (and be measured) off the RPi
+#################################
+
+# import the simulated pins and the clocks
+from bomb_inputs import SimPin
+from bomb_clock import getClock
+# other imports
+from heapq import heappush, heappop
+
+#########
+# classes
+#########
+# the simulated 7-segment display (same interface as the Seg7x4)
+class SimSeg7x4:
+    def __init__(self):
+        # the displayed text, blink rate, and brightness
+        self.text = ""
+        self.blink_rate = 0
+        self.brightness = 1
+
+    # displays a value
+    def print(self, value):
+        self.text = str(value)
+
+    # fills the display (0 -> blank)
+    def fill(self, color):
+        self.text = ("" if color == 0 else "88:88")
+
+# the simulated keypad (same interface as the Matrix_Keypad)
+class SimKeypad:
+    def __init__(self):
+        # the keys that are currently pressed
+        self._pressed = []
+
+    # the keys that are currently pressed
+    @property
+    def pressed_keys(self):
+        return list(self._pressed)
+
+    # presses a key (and keeps it pressed until it is released)
+    def press(self, key):
+        if (key not in self._pressed):
+            self._pressed.append(key)
+
+    # releases a key (or all of them)
+    def release(self, key=None):
+        if (key is None):
+            self._pressed = []
+        elif (key in self._pressed):
+            self._pressed.remove(key)
+
+    # holds exactly the specified keys (pressing and releasing them all at once)
+    def hold(self, keys):
+        self._pressed = list(keys)
+
+# a headless label (same item interface as a Tk Label)
+class SimLabel(dict):
+    def __init__(self, text="", fg=""):
+        super().__init__(text=text, fg=fg, image="")
+
+    def grid(self, **options):
+        pass
+
+    def destroy(self):
+        pass
+
+# the headless LCD GUI
+# it has the same interface as the Lcd (that the game uses), and runs the after() callbacks on its own event loop
+#  (against its clock: on the virtual clock, the loop jumps straight to the next callback)
+class SimLcd:
+    def __init__(self, clock=None):
+        self._clock = (clock or getClock())
+        # the scheduled callbacks: [ (time, order, callback, args) ]
+        self._events = []
+        self._order = 0
+        # is the event loop running?
+        self._running = False
+        # the timer and pushbutton (like the Lcd)
+        self._timer = None
+        self._button = None
+        # how the bomb concluded (None -> it hasn't yet; otherwise "defused" or "exploded")
+        self.outcome = None
+        self.setupBoot()
+
+    # sets up the "boot" GUI
+    def setupBoot(self):
+        self._lscroll = SimLabel()
+
+    # sets up the GUI
+    def setup(self):
+        self._ltimer = SimLabel("Time left: ", "#00ff00")
+        self._lkeypad = SimLabel("Keypad phase: ", "#ff0000")
+        self._lwires = SimLabel("Wires phase: ", "#ff0000")
+        self._lbutton = SimLabel("Button phase: ", "#ff0000")
+        self._ltoggles = SimLabel("Toggles phase: ", "#ff0000")
+        self._lstrikes = SimLabel("Strikes left: ", "#00ff00")
+        # the label changes waiting to be drawn (label -> options)
+        self._changes = {}
+
+    def setTimer(self, timer):
+        self._timer = timer
+
+    def setButton(self, button):
+        self._button = button
+
+    # queues a change to a label (like the Lcd)
+    def queue(self, label, **options):
+        self._changes.setdefault(label, {}).update(options)
+
+    # applies the queued label changes (like the Lcd); returns the number of labels that were changed
+    def draw(self):
+        changed = 0
+        for label, options in self._changes.items():
+            widget = getattr(self, f"_l{label}")
+            options = { option: value for option, value in options.items() if widget[option] != value }
+            if (options):
+                widget.update(options)
+                changed += 1
+        self._changes = {}
+        return changed
+
+    # schedules a callback after the specified delay (ms; it may be fractional, since the callbacks run on the game's clock)
+    def after(self, ms, callback, *args):
+        self._order += 1
+        heappush(self._events, (self._clock.now() + ms / 1000, self._order, callback, args))
+
+    # schedules a callback as soon as possible
+    def after_idle(self, callback, *args):
+        self.after(0, callback, *args)
+
+    # there is nothing to draw
+    def update_idletasks(self):
+        pass
+
+    # notes how the bomb concluded and stops the event loop
+    def conclusion(self, exploding=False, success=False):
+        self.outcome = ("defused" if success else "exploded")
+        self._running = False
+
+    def reset(self):
+        self.outcome = None
+
+    # runs the scheduled callbacks until the bomb concludes (or there is nothing left to do)
+    def mainloop(self):
+        self._running = True
+        while (self._running and self._events):
+            when, order, callback, args = heappop(self._events)
+            delay = when - self._clock.now()
+            if (delay > 0):
+                self._clock.sleep(delay)
+            callback(*args)
+
+    def quit(self):
+        self._running = False
+
+# the silent audio (same interface as the Audio)
+# it plays nothing, but records what would have been played
+class SimAudio:
+    def __init__(self, clock=None):
+        self._clock = (clock or getClock())
+        # the sounds that were played: [ (time, name, loops) ]
+        self.played = []
+
+    def play(self, name, loops=0, since=None):
+        self.played.append((self._clock.now(), name, loops))
+        return True
+
+    def stop(self, channel):
+        pass
+
+    def busy(self, channel):
+        return False
+
+    # nothing is ever playing, so the callback is called right away
+    def when_done(self, channel, callback, *args):
+        callback(*args)
+
+    def pump(self):
+        return False
+
+    def report(self):
+        return f"Audio: {len(self.played)} sounds (simulated)"
+
+# the scripted inputs
+# a script is a list of (seconds, action, args...) steps; the seconds are relative to when the phases start
+#  key K [HOLD]  -> presses (and releases after HOLD seconds) keypad key K
+#  wire N 0|1    -> disconnects (0) or reconnects (1) jumper wire N (0..4 -> A..E)
+#  toggle N 0|1  -> flips toggle switch N (0..3) down (0) or up (1)
+#  button 0|1    -> releases (0) or presses (1) the pushbutton
+#  click [HOLD]  -> clicks (presses, and releases after HOLD seconds) the pushbutton
+class SimScript:
+    # how long (seconds) a key or the pushbutton is held down when it is pressed by a key/click step
+    HOLD = 0.1
+
+    def __init__(self, steps=None):
+        self._steps = sorted(steps or [], key=lambda step: step[0])
+
+    # loads a script from a file (one step per line; # starts a comment)
+    @staticmethod
+    def load(file):
+        steps = []
+        with open(file) as f:
+            for line in f:
+                fields = line.split("#")[0].split()
+                if (fields):
+                    steps.append((float(fields[0]), fields[1]) + tuple(fields[2:]))
+        return SimScript(steps)
+
+    # schedules the steps on the (headless or Tk) GUI's event loop against the specified components
+    def start(self, gui, components):
+        for step in self._steps:
+            gui.after(guiDelay(gui, step[0]), self._apply, gui, components, step[1], step[2:])
+
+    # applies a step to the components (only internally called)
+    def _apply(self, gui, components, action, args):
+        seg7, keypad, wires, button_state, button_rgb, toggles = components
+        hold = guiDelay(gui, SimScript.HOLD)
+        if (action == "key"):
+            key = (int(args[0]) if args[0].isdigit() else args[0])
+            keypad.press(key)
+            gui.after((guiDelay(gui, float(args[1])) if len(args) > 1 else hold), keypad.release, key)
+        elif (action == "wire"):
+            wires[int(args[0])].value = bool(int(args[1]))
+        elif (action == "toggle"):
+            toggles[int(args[0])].value = bool(int(args[1]))
+        elif (action == "button"):
+            button_state.value = bool(int(args[0]))
+        elif (action == "click"):
+            button_state.value = True
+            gui.after((guiDelay(gui, float(args[0])) if args else hold), setattr, button_state, "value", False)
+        else:
+            raise ValueError(f"Unknown script action: {action}")
+
+###########
+# functions
+###########
+# returns a delay (seconds) as the GUI's after takes it (ms): the headless GUI's may be fractional (so that, e.g., contact
+#  bounces and fast clicks keep their timing), but Tk's must be whole ms
+def guiDelay(gui, seconds):
+    return (seconds * 1000 if isinstance(gui, SimLcd) else round(seconds * 1000))
+
+# sets up the simulated components (in the same order as bomb_hardware.setupComponents)
+# the jumper wires start connected, the toggle switches down, and the pushbutton released (with its LED off)
+def setupComponents():
+    component_7seg = SimSeg7x4()
+    component_keypad = SimKeypad()
+    component_wires = [ SimPin(True) for i in range(5) ]
+    component_button_state = SimPin(False)
+    component_button_RGB = [ SimPin(True) for i in range(3) ]
+    component_toggles = [ SimPin(False) for i in range(4) ]
+    return component_7seg, component_keypad, component_wires, component_button_state, component_button_RGB, component_toggles
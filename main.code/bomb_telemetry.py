@@ -0,0 +1,197 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Session telemetry
+# Every game (its puzzle, each strike and defusal, and how it concluded) is written to a local SQLite database
+#  by a background writer thread, in batches, so that the game (and the Tk thread) never waits on the disk
+# usage: python3 bomb_telemetry.py [--db FILE]   (prints the defuse rate per pushbutton color and the average time per phase)
+#################################
+
+# import the configs
+from bomb_configs import *
+# other imports
+import sys
+import sqlite3
+from time import time
+from threading import Thread
+from queue import SimpleQueue, Empty
+from argparse import ArgumentParser
+
+# the tables (and their indexes)
+#  sessions: one row per game (its puzzle, when it started, and how it concluded)
+#  events: one row per strike or defusal (the time is in seconds since the game's phases started)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    seed INTEGER,
+    serial TEXT,
+    toggles_target INTEGER,
+    wires_target INTEGER,
+    keyword TEXT,
+    rot INTEGER,
+    keypad_target TEXT,
+    passphrase TEXT,
+    button_color TEXT,
+    countdown INTEGER,
+    outcome TEXT,
+    strikes_left INTEGER,
+    time_left INTEGER,
+    active_phases INTEGER,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    session INTEGER NOT NULL REFERENCES sessions(id),
+    time REAL NOT NULL,
+    kind TEXT NOT NULL,
+    phase TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_color ON sessions(button_color, outcome);
+CREATE INDEX IF NOT EXISTS sessions_outcome ON sessions(outcome);
+CREATE INDEX IF NOT EXISTS events_session ON events(session);
+CREATE INDEX IF NOT EXISTS events_phase ON events(kind, phase, time);
+"""
+
+#########
+# classes
+#########
+# the telemetry writer
+# the game queues its records (which never blocks), and the writer thread writes whatever has queued up in one transaction
+# the sessions are numbered by the game (so that it doesn't wait for their row ids); the writer maps them to their rows
+# a batch that fails to be written is logged and skipped; if the database can't be opened at all, nothing more is queued
+class Telemetry:
+    # the most records written in one transaction
+    BATCH = 1000
+
+    def __init__(self, file=TELEMETRY_DB):
+        self._file = file
+        # the queued records: (kind, session, values...) (None -> stop)
+        self._queue = SimpleQueue()
+        # the next session number, and the session being played (None -> none)
+        self._sessions = 0
+        self.session = None
+        # the number of records and transactions written, and the batches that failed (for the report)
+        self._written = 0
+        self._batches = 0
+        self._failed = 0
+        # is the telemetry off (because the database couldn't be opened)?
+        self._off = False
+        self._thread = Thread(name="Telemetry", target=self._run, daemon=True)
+        self._thread.start()
+
+    # starts a session with the game's puzzle (a dict of the sessions columns); returns its number
+    def begin(self, **puzzle):
+        if (self._off):
+            return None
+        self._sessions += 1
+        self.session = self._sessions
+        self._queue.put(("begin", self.session, time(), puzzle))
+        return self.session
+
+    # notes a strike or defusal of a phase (at the specified time, in seconds since the phases started)
+    def event(self, kind, phase, at):
+        if (self.session is not None and not self._off):
+            self._queue.put(("event", self.session, at, kind, phase))
+
+    # ends the session with how it concluded
+    def end(self, outcome, strikes_left, time_left, active_phases, duration):
+        if (self.session is not None and not self._off):
+            self._queue.put(("end", self.session, outcome, strikes_left, time_left, active_phases, duration))
+            self.session = None
+
+    # writes out the queued records and stops the writer (waiting up to the timeout, in seconds)
+    def close(self, timeout=5):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    # writes the queued records (in the writer thread) (only internally called)
+    def _run(self):
+        try:
+            db = sqlite3.connect(self._file)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+        # the database can't be opened -> stop queueing records (the game goes on without telemetry)
+        except sqlite3.Error as e:
+            self._off = True
+            print(f"Telemetry: can't open {self._file} ({e}); not recording", file=sys.stderr)
+            return
+        # session number -> row id
+        rows = {}
+        running = True
+        while (running):
+            # wait for a record, then take whatever else has queued up (up to a batch)
+            records = [ self._queue.get() ]
+            while (len(records) < Telemetry.BATCH):
+                try:
+                    records.append(self._queue.get_nowait())
+                except Empty:
+                    break
+            # stop once the records queued before close are written
+            if (None in records):
+                running = False
+                records = records[:records.index(None)]
+            written = 0
+            try:
+                with db:
+                    for record in records:
+                        kind, session = record[:2]
+                        if (kind == "begin"):
+                            started, puzzle = record[2:]
+                            columns = [ "started" ] + list(puzzle)
+                            rows[session] = db.execute(f"INSERT INTO sessions ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",\
+                                                       [ started ] + list(puzzle.values())).lastrowid
+                        # (the records of a session whose row wasn't written are skipped)
+                        elif (session not in rows):
+                            continue
+                        elif (kind == "event"):
+                            db.execute("INSERT INTO events VALUES (?, ?, ?, ?)", (rows[session],) + record[2:])
+                        else:
+                            db.execute("UPDATE sessions SET outcome=?, strikes_left=?, time_left=?, active_phases=?, duration=? WHERE id=?",\
+                                       record[2:] + (rows.pop(session),))
+                        written += 1
+                self._written += written
+                self._batches += 1
+            # the batch wasn't written (it was rolled back) -> log it and keep draining
+            except sqlite3.Error as e:
+                self._failed += 1
+                print(f"Telemetry: a batch of {len(records)} records wasn't written to {self._file} ({e})", file=sys.stderr)
+                # the sessions that were started in the batch have no rows
+                for record in records:
+                    if (record[0] == "begin"):
+                        rows.pop(record[1], None)
+        db.close()
+
+    # returns the telemetry report as a string
+    def report(self):
+        return f"Telemetry: {self._sessions} sessions, {self._written} records in {self._batches} batches, "\
+               f"{self._failed} batches failed ({self._file}{', off' if self._off else ''})"
+
+###########
+# functions
+###########
+# returns the defuse rate per pushbutton color: [ (color, sessions, defused, rate) ]
+def defuseRates(file=TELEMETRY_DB):
+    with sqlite3.connect(file) as db:
+        return [ (color, sessions, defused, defused / sessions) for color, sessions, defused in\
+                 db.execute("SELECT button_color, COUNT(*), SUM(outcome = 'defused') FROM sessions "\
+                            "WHERE outcome IS NOT NULL GROUP BY button_color ORDER BY button_color") ]
+
+# returns the average time (in seconds since the phases started) that each phase was defused at: [ (phase, defusals, average) ]
+def phaseTimes(file=TELEMETRY_DB):
+    with sqlite3.connect(file) as db:
+        return db.execute("SELECT phase, COUNT(*), AVG(time) FROM events WHERE kind = 'defused' GROUP BY phase ORDER BY phase").fetchall()
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Summarizes the session telemetry.")
+    parser.add_argument("--db", default=TELEMETRY_DB, help="the telemetry database")
+    args = parser.parse_args()
+
+    print(f"{'color':<6} {'sessions':>9} {'defused':>8} {'rate':>7}")
+    for color, sessions, defused, rate in defuseRates(args.db):
+        print(f"{color:<6} {sessions:>9} {defused:>8} {rate * 100:>6.1f}%")
+    print(f"{'phase':<8} {'defusals':>9} {'avg time':>9}")
+    for phase, defusals, average in phaseTimes(args.db):
+        print(f"{phase:<8} {defusals:>9} {average:>8.1f}s")
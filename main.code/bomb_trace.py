@@ -0,0 +1,218 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Input traces
+# Records every change that the game reads from its inputs (the jumper wires, toggle switches, pushbutton, and keypad)
+#  to a compact binary trace (with the puzzle's random seed), so that a game can be played back on the simulated components
+# usage: python3 "FINAL VERSION" --record FILE   (records each game: FILE, then FILE.2, FILE.3, ...)
+#        python3 "FINAL VERSION" --headless --replay FILE
+#        python3 bomb_trace.py FILE   (prints the trace)
+#################################
+
+# import the configs, the clocks, and the GUI delays of the simulated components
+from bomb_configs import *
+from bomb_clock import getClock
+from bomb_sim import guiDelay
+# other imports
+import struct
+from threading import Lock
+from argparse import ArgumentParser
+
+# the trace file is laid out as: a header, then a record per change (in the order they were read)
+#  header: magic, version, the puzzle's random seed, the puzzle bank record (-1 -> the puzzle was generated), the countdown (s)
+#  record: when the change was read (us since the phases started), the input, and its new value
+MAGIC = b"BOMBTRCE"
+VERSION = 1
+HEADER = struct.Struct("<8sHQiH")
+RECORD = struct.Struct("<IBH")
+# the inputs: the jumper wires (WIRES + 0..4), the toggle switches (TOGGLES + 0..3), the pushbutton, and the keypad
+WIRES = 0
+TOGGLES = 5
+BUTTON = 9
+KEYPAD = 10
+# the keypad keys (a keypad value has a bit per pressed key, in this order)
+KEYS = [ 1, 2, 3, 4, 5, 6, 7, 8, 9, "*", 0, "#" ]
+
+###########
+# functions
+###########
+# returns the keypad value of the pressed keys
+def keysValue(keys):
+    value = 0
+    for key in keys:
+        value |= 1 << KEYS.index(key)
+    return value
+
+# returns the pressed keys of a keypad value
+def valueKeys(value):
+    return [ key for i, key in enumerate(KEYS) if (value >> i) & 1 ]
+
+# returns the name of an input
+def inputName(input):
+    if (input < TOGGLES):
+        return f"wire {'ABCDE'[input - WIRES]}"
+    elif (input < BUTTON):
+        return f"toggle {input - TOGGLES}"
+    return ("button" if input == BUTTON else "keypad")
+
+#########
+# classes
+#########
+# an input pin whose reads are traced (same interface as the pin that it wraps)
+class TracedPin:
+    def __init__(self, pin, recorder, input):
+        self._traced = pin
+        self._recorder = recorder
+        self._input = input
+
+    @property
+    def value(self):
+        value = self._traced.value
+        self._recorder.note(self._input, int(bool(value)))
+        return value
+
+    @value.setter
+    def value(self, value):
+        self._traced.value = value
+
+    # everything else (the direction, pull, edge listeners, and GPIO pin) is the wrapped pin's
+    def __getattr__(self, name):
+        return getattr(self._traced, name)
+
+# a keypad whose reads are traced (same interface as the keypad that it wraps)
+class TracedKeypad:
+    def __init__(self, keypad, recorder):
+        self._traced = keypad
+        self._recorder = recorder
+
+    @property
+    def pressed_keys(self):
+        keys = self._traced.pressed_keys
+        self._recorder.note(KEYPAD, keysValue(keys))
+        return keys
+
+    def __getattr__(self, name):
+        return getattr(self._traced, name)
+
+# the trace recorder
+# the components are wrapped (once, see wrap) so that each read is compared against the input's last value,
+#  and only the reads that changed it are written
+class TraceRecorder:
+    def __init__(self, file, clock=None):
+        self._file = file
+        self._clock = (clock or getClock())
+        # the trace being written (None -> not recording), and when its game's phases started
+        self._out = None
+        self._start = None
+        # the last value read of each input
+        self._values = [ None ] * (KEYPAD + 1)
+        self._lock = Lock()
+        # the number of games traced and changes written
+        self._games = 0
+        self._changes = 0
+
+    # returns the components with the inputs wrapped so that their reads are traced
+    #  (in the same order as setupComponents)
+    def wrap(self, components):
+        seg7, keypad, wires, button_state, button_rgb, toggles = components
+        return seg7, TracedKeypad(keypad, self), [ TracedPin(pin, self, WIRES + i) for i, pin in enumerate(wires) ],\
+               TracedPin(button_state, self, BUTTON), button_rgb, [ TracedPin(pin, self, TOGGLES + i) for i, pin in enumerate(toggles) ]
+
+    # starts tracing a game (before its phases start) with the (wrapped) components,
+    #  the puzzle's random seed and puzzle bank record (None -> generated), and the countdown
+    def start(self, components, seed, record=None, countdown=COUNTDOWN):
+        self.stop()
+        self._games += 1
+        file = (self._file if self._games == 1 else f"{self._file}.{self._games}")
+        seg7, keypad, wires, button_state, button_rgb, toggles = components
+        with self._lock:
+            self._out = open(file, "wb")
+            self._out.write(HEADER.pack(MAGIC, VERSION, seed, (-1 if record is None else record), countdown))
+            # no keys are pressed yet (the keypad isn't read here, since the last game's keypad driver may still be scanning it)
+            self._values = [ None ] * KEYPAD + [ 0 ]
+            # the pins' starting values (at time 0)
+            for pin in wires + toggles + [ button_state ]:
+                self._values[pin._input] = int(bool(pin._traced.value))
+                self._out.write(RECORD.pack(0, pin._input, self._values[pin._input]))
+            self._start = self._clock.now()
+
+    # notes a read of an input (the change is written if its value changed)
+    def note(self, input, value):
+        if (self._out is None or self._values[input] == value):
+            return
+        with self._lock:
+            if (self._out is not None and self._values[input] != value):
+                self._values[input] = value
+                self._out.write(RECORD.pack(min(round((self._clock.now() - self._start) * 1000000), 0xffffffff), input, value))
+                self._changes += 1
+
+    # stops tracing the game (and writes out the rest of its trace)
+    def stop(self):
+        with self._lock:
+            if (self._out is not None):
+                self._out.close()
+                self._out = None
+
+    # returns the recorder report as a string
+    def report(self):
+        return f"Trace: {self._changes} changes in {self._games} games ({self._file})"
+
+# the trace player
+# it plays a trace back on the simulated components, like a SimScript (the changes are relative to when the phases start)
+class TracePlayer:
+    # how much earlier (seconds) a keypad change is applied than it was read: the keypad is sampled, so the change
+    #  happened after the scan before it (at least a keypad scan period earlier), and the same scan must read it again
+    KEYPAD_LEAD = 0.0001
+
+    def __init__(self, file):
+        with open(file, "rb") as f:
+            data = f.read()
+        magic, version, self.seed, record, self.countdown = HEADER.unpack_from(data, 0)
+        if (magic != MAGIC or version != VERSION):
+            raise ValueError(f"{file} is not an input trace (version {VERSION})")
+        # the puzzle bank record of the game's puzzle (None -> the puzzle was generated from the seed)
+        self.record = (None if record < 0 else record)
+        # the changes: [ (seconds, input, value) ]
+        self._changes = [ (time / 1000000, input, value) for time, input, value in RECORD.iter_unpack(data[HEADER.size:]) ]
+
+    # the number of changes
+    def __len__(self):
+        return len(self._changes)
+
+    # returns the changes: [ (seconds, input, value) ]
+    def changes(self):
+        return list(self._changes)
+
+    # applies the starting values to the specified (simulated) components right away, and schedules the other
+    #  changes on the (headless or Tk) GUI's event loop
+    def start(self, gui, components):
+        for time, input, value in self._changes:
+            if (time == 0):
+                self._apply(components, input, value)
+            else:
+                lead = (TracePlayer.KEYPAD_LEAD if input == KEYPAD else 0)
+                gui.after(guiDelay(gui, time - lead), self._apply, components, input, value)
+
+    # applies a change to the components (only internally called)
+    def _apply(self, components, input, value):
+        seg7, keypad, wires, button_state, button_rgb, toggles = components
+        if (input < TOGGLES):
+            wires[input - WIRES].value = bool(value)
+        elif (input < BUTTON):
+            toggles[input - TOGGLES].value = bool(value)
+        elif (input == BUTTON):
+            button_state.value = bool(value)
+        else:
+            keypad.hold(valueKeys(value))
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Prints an input trace.")
+    parser.add_argument("file", help="the trace file")
+    args = parser.parse_args()
+
+    player = TracePlayer(args.file)
+    print(f"{args.file}: seed={player.seed}, record={player.record}, countdown={player.countdown}s, {len(player)} changes")
+    for time, input, value in player.changes():
+        print(f"  {time:>10.6f}s {inputName(input):<10} {valueKeys(value) if input == KEYPAD else value}")
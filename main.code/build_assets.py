@@ -0,0 +1,63 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Asset build step
+# Pre-scales every image in ./images to the LCD resolution and caches it as a PPM (which Tk loads without
+#  decoding a PNG); run it from the project folder whenever the images change:
+#  python3 main.code/build_assets.py [--size 800x360] [--force]
+#################################
+
+# import the configs (IMAGE_SIZE and IMAGE_CACHE), and the cached images' naming (shared with the GUI)
+from bomb_configs import *
+from bomb_images import cachedImage
+# constants
+IMAGES = "./images"         # the source images
+
+# other imports
+import os
+import sys
+from argparse import ArgumentParser
+# Pillow is only needed to build the assets (not to play the game)
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+###########
+# functions
+###########
+# pre-scales an image so that it fits the specified size, and saves it as a PPM
+def buildImage(source, target, size):
+    image = Image.open(source).convert("RGBA")
+    image.thumbnail(size, Image.LANCZOS)
+    # PPMs have no transparency, so flatten the image onto the GUI's black background
+    flat = Image.new("RGB", image.size, "black")
+    flat.paste(image, mask=image.getchannel("A"))
+    flat.save(target, format="PPM")
+    return flat.size
+
+# builds every image that isn't cached yet (or that changed since it was cached)
+def buildAssets(size=IMAGE_SIZE, force=False):
+    os.makedirs(IMAGE_CACHE, exist_ok=True)
+    for file in sorted(os.listdir(IMAGES)):
+        source = os.path.join(IMAGES, file)
+        if (not file.lower().endswith((".png", ".gif", ".jpg", ".jpeg"))):
+            continue
+        target = cachedImage(source)
+        if (not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source)):
+            print(f"{source}: up to date")
+            continue
+        width, height = buildImage(source, target, size)
+        print(f"{source} -> {target} ({width}x{height}, {os.path.getsize(target) // 1024}KB)")
+
+######
+# MAIN
+######
+if (__name__ == "__main__"):
+    parser = ArgumentParser(description="Pre-scales the bomb's images to the LCD resolution.")
+    parser.add_argument("--size", default=f"{IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}", help="the largest image size (WIDTHxHEIGHT)")
+    parser.add_argument("--force", action="store_true", help="rebuild every image")
+    args = parser.parse_args()
+    if (Image is None):
+        sys.exit("The asset build step needs Pillow (pip3 install pillow).")
+    size = tuple(int(n) for n in args.size.lower().split("x"))
+    buildAssets(size, args.force)
@@ -0,0 +1,12 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Test setup
+# The game's modules import each other by name (they are run from main.code), so the tests import them the same way
+# usage: python3 -m pytest main.code/tests
+#################################
+
+# other imports
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,58 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Virtual clock tests
+# The loops are stepped in time order as the time is moved forward (and right away when they are woken)
+#################################
+
+# import the virtual clock
+from bomb_clock import VirtualClock
+# other imports
+from threading import Event
+
+# returns a loop step that notes when (and as what) it was stepped, and is due again after the period (None -> done)
+def stepper(clock, name, period, steps):
+    return lambda: (steps.append((clock.now(), name)), period)[1]
+
+# the loops are stepped in time order (the first step is right away; at the same time, in the order they were scheduled),
+#  and the time only moves as far as it is advanced
+def test_time_order():
+    clock = VirtualClock()
+    steps = []
+    clock.loop("A", stepper(clock, "A", 0.25, steps))
+    clock.loop("B", stepper(clock, "B", 0.5, steps))
+    clock.advance(1)
+    assert steps == [ (0, "A"), (0, "B"), (0.25, "A"), (0.5, "B"), (0.5, "A"), (0.75, "A"), (1, "B"), (1, "A") ]
+    assert clock.now() == 1
+    clock.sleep(0.1)
+    assert clock.now() == 1.1 and len(steps) == 8
+
+# a woken loop is stepped right away (and its scheduled step is dropped)
+def test_wake():
+    clock = VirtualClock()
+    steps = []
+    wake = Event()
+    clock.loop("A", stepper(clock, "A", 10, steps), wake)
+    clock.advance(1)
+    wake.set()
+    assert clock.wait(wake)
+    clock.advance(12)
+    assert steps == [ (0, "A"), (1, "A"), (11, "A") ]
+    assert not wake.is_set()
+
+# a loop that is done is dropped
+def test_done():
+    clock = VirtualClock()
+    steps = []
+    clock.loop("A", stepper(clock, "A", None, steps))
+    clock.advance(5)
+    assert steps == [ (0, "A") ]
+    assert clock.report() == "Clock: virtual, 5.000s simulated, 1 loop steps"
+
+# a delay that is too small to move a large time still moves it (so that a loop can't stall the clock)
+def test_tiny_delay():
+    clock = VirtualClock(1e9)
+    steps = []
+    clock.loop("A", stepper(clock, "A", 1e-12, steps))
+    clock.advance(1e9 + 1e-6)
+    assert 1 < len(steps) < 20
+    assert [ time for time, name in steps ] == sorted(set(time for time, name in steps))
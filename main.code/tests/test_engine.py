@@ -0,0 +1,17 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Engine tests
+# The engine's games, played again on the game itself (on the virtual clock), must conclude the same (needs NumPy)
+#################################
+
+# other imports
+import pytest
+
+pytest.importorskip("numpy")
+# import the engine's cross-check (once NumPy is known to be there)
+from bomb_engine import crossCheck
+
+# careful and sloppy players, slow and fast ones, and a shorter countdown (so that some games run out of time)
+@pytest.mark.parametrize("seed, countdown, rate, accuracy", [ (1, 120, 2, 0.9), (2, 120, 0.5, 0.7), (3, 120, 4, 0.7), (4, 60, 2, 0.9) ])
+def test_cross_check(seed, countdown, rate, accuracy):
+    assert crossCheck(50, seed, countdown, rate, accuracy) == []
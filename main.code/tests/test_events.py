@@ -0,0 +1,48 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Phase event channel tests
+# Strikes and defusals are never dropped and are handled in the order they were posted, even once the channel is full
+#################################
+
+# import the event channel and the virtual clock
+from bomb_phases import EventChannel, PhaseEvent, EVENT_STRIKE, EVENT_DEFUSED, EVENT_VALUE
+from bomb_clock import VirtualClock
+
+# returns an event of a kind (numbered, so that the events can be told apart)
+def event(kind, n):
+    return PhaseEvent(kind, f"Phase{n}", n, n)
+
+# a full channel drops the value changes, and the strikes and defusals overflow (in order) after the channel's events
+def test_overflow_keeps_order():
+    channel = EventChannel(size=2, clock=VirtualClock())
+    posted = [ event(EVENT_VALUE, 1), event(EVENT_STRIKE, 2), event(EVENT_STRIKE, 3), event(EVENT_VALUE, 4),\
+               event(EVENT_DEFUSED, 5), event(EVENT_VALUE, 6) ]
+    for e in posted:
+        channel.post(e)
+    assert list(channel.drain()) == [ posted[0], posted[1], posted[2], posted[4] ]
+    assert channel.overflowed()
+    assert not channel.overflowed()
+    assert list(channel.drain()) == []
+
+# once a strike has overflowed, the events posted after it wait behind it (even if the channel has room again)
+def test_overflow_waits_behind():
+    channel = EventChannel(size=2, clock=VirtualClock())
+    for n, kind in enumerate([ EVENT_STRIKE, EVENT_STRIKE, EVENT_STRIKE ]):
+        channel.post(event(kind, n))
+    drained = channel.drain()
+    assert next(drained).time == 0
+    # (the channel has room for one again)
+    channel.post(event(EVENT_DEFUSED, 3))
+    channel.post(event(EVENT_VALUE, 4))
+    assert [ e.time for e in drained ] == [ 1, 2, 3 ]
+    assert list(channel.drain()) == []
+
+# a channel that never fills drops nothing, and counts what was handled
+def test_no_overflow():
+    channel = EventChannel(size=4, clock=VirtualClock())
+    posted = [ event(EVENT_VALUE, 0), event(EVENT_STRIKE, 1), event(EVENT_DEFUSED, 2) ]
+    for e in posted:
+        channel.post(e)
+    assert list(channel.drain()) == posted
+    assert not channel.overflowed()
+    assert channel.report().startswith("Events: 3 handled (1 value, 1 strike, 1 defused), 0 dropped")
@@ -0,0 +1,85 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Flight recorder tests
+# Records are written into each thread's ring (on the virtual clock), dumped, and loaded back as one timeline
+#################################
+
+# import the flight recorder and the clocks
+import bomb_flight as flight
+import bomb_clock
+from bomb_clock import VirtualClock
+# other imports
+import sys
+import signal
+import threading
+import pytest
+
+# the records are timed by the process's clock -> a virtual one (for each test)
+@pytest.fixture
+def clock(monkeypatch):
+    clock = VirtualClock()
+    monkeypatch.setattr(bomb_clock, "_clock", clock)
+    return clock
+
+# the rings keep each thread's last records, and the dump is loaded back as one timeline (oldest first)
+def test_dump_and_load(clock, tmp_path):
+    recorder = flight.FlightRecorder(size=4, file=tmp_path / "flight.dump")
+    keypad = recorder.source("Keypad")
+    wires = recorder.source("Wires")
+    assert recorder.source("Keypad") == keypad
+    for i in range(6):
+        clock.advance(i + 1)
+        recorder.note(flight.PRESS, keypad, i, -i)
+        # (another thread writes to its own ring, in between)
+        if (i == 3):
+            thread = threading.Thread(target=recorder.note, args=(flight.EDGE, wires, 2, 1), name="Edges")
+            thread.start()
+            thread.join()
+    assert recorder.dump("test") == tmp_path / "flight.dump"
+
+    description, records = flight.load(tmp_path / "flight.dump")
+    assert description["why"] == "test" and description["time"] == 6
+    assert description["sources"] == [ "", "Keypad", "Wires" ]
+    main = threading.current_thread().name
+    assert records == [ (3, main, "press", "Keypad", 2, -2), (4, main, "press", "Keypad", 3, -3), (4, "Edges", "edge", "Wires", 2, 1),\
+                        (5, main, "press", "Keypad", 4, -4), (6, main, "press", "Keypad", 5, -5) ]
+
+# a finished thread's ring is given to the next thread
+def test_ring_reuse(clock, tmp_path):
+    recorder = flight.FlightRecorder(size=4, file=tmp_path / "flight.dump")
+    for name in ("First", "Second"):
+        thread = threading.Thread(target=recorder.note, args=(flight.FRAME,), name=name)
+        thread.start()
+        thread.join()
+    recorder.dump()
+    description, records = flight.load(tmp_path / "flight.dump")
+    assert description["rings"] == [ [ "Second", 2 ] ]
+
+# without a dump file, nothing is dumped
+def test_no_dump_file(clock):
+    recorder = flight.FlightRecorder(size=4)
+    recorder.note(flight.OFF)
+    assert recorder.dump() is None
+    assert recorder.report().endswith("0 dumps (no dump file)")
+
+# once it is installed, an unhandled exception dumps the rings
+def test_install(clock, tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "excepthook", lambda *args: None)
+    monkeypatch.setattr(threading, "excepthook", lambda args: None)
+    usr2 = (signal.getsignal(signal.SIGUSR2) if hasattr(signal, "SIGUSR2") else None)
+    recorder = flight.FlightRecorder(size=4)
+    try:
+        recorder.install(tmp_path / "flight.dump")
+        recorder.note(flight.STRIKE)
+        sys.excepthook(ValueError, ValueError("crash"), None)
+    finally:
+        if (usr2 is not None):
+            signal.signal(signal.SIGUSR2, usr2)
+    description, records = flight.load(tmp_path / "flight.dump")
+    assert description["why"] == "exception" and [ record[2] for record in records ] == [ "strike" ]
+
+# a file that isn't a dump is refused
+def test_not_a_dump(tmp_path):
+    (tmp_path / "junk.dump").write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        flight.load(tmp_path / "junk.dump")
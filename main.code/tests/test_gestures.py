@@ -0,0 +1,66 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Pushbutton gesture tests
+# The recognizer is fed timestamped pushbutton changes (like the edge log's), with 5ms of debounce, 1s long presses,
+#  and 400ms between the clicks of a multi-click series
+#################################
+
+# import the gesture recognizer and the virtual clock
+from bomb_inputs import Gestures, Gesture, CLICK, LONG, MULTI
+from bomb_clock import VirtualClock
+# other imports
+import pytest
+
+# returns a recognizer
+def makeGestures():
+    return Gestures(debounce=0.005, long_press=1.0, multi_click=0.4, clock=VirtualClock())
+
+# returns a gesture (at about the specified time)
+def gesture(kind, clicks, time):
+    return Gesture(kind, clicks, pytest.approx(time))
+
+# returns the changes of clicks that are pressed at each of the specified times (and held for 100ms)
+def clicks(*times):
+    return [ change for time in times for change in ((time, True), (time + 0.1, False)) ]
+
+# a click ends when it is released, and a single click is no series
+def test_click():
+    gestures = makeGestures()
+    assert gestures.update(clicks(1.0), 1.2) == [ gesture(CLICK, 1, 1.1) ]
+    assert gestures.due(1.2) == pytest.approx(0.3)
+    assert gestures.update([], 2.0) == []
+    assert gestures.due(2.0) is None
+
+# the contact bounces after a press and a release are ignored
+def test_bounce():
+    gestures = makeGestures()
+    changes = [ (1.0, True), (1.001, False), (1.002, True), (1.2, False), (1.201, True), (1.202, False) ]
+    assert gestures.update(changes, 1.3) == [ gesture(CLICK, 1, 1.2) ]
+    assert gestures.report().startswith("Button: 1 clicks (0 long, 0 multi-click series) from 6 changes (2 bounces)")
+
+# a change within the debounce time of the last one counts once the debounce time is up
+def test_bounce_settles():
+    gestures = makeGestures()
+    assert gestures.update([ (1.0, True), (1.002, False) ], 1.003) == []
+    assert gestures.due(1.003) == pytest.approx(0.002)
+    assert gestures.update([], 1.005) == [ gesture(CLICK, 1, 1.005) ]
+
+# a press held for the long press time is a long press (and no click)
+def test_long_press():
+    gestures = makeGestures()
+    assert gestures.update([ (1.0, True) ], 1.5) == []
+    assert gestures.update([ (2.0, False) ], 2.0) == [ gesture(LONG, 1, 2.0) ]
+    assert gestures.update([], 3.0) == []
+
+# clicks that follow each other quickly form a series, which ends once no click follows it
+def test_multi_click():
+    gestures = makeGestures()
+    assert gestures.update(clicks(1.0, 1.3, 1.6), 1.8) == [ gesture(CLICK, 1, 1.1), gesture(CLICK, 1, 1.4), gesture(CLICK, 1, 1.7) ]
+    assert gestures.update([], 2.0) == []
+    assert gestures.update([], 2.11) == [ gesture(MULTI, 3, 1.7) ]
+
+# clicks that are too far apart are no series (even when their changes are fed together)
+def test_clicks_apart():
+    gestures = makeGestures()
+    assert gestures.update(clicks(1.0, 1.6, 1.9), 2.5) == [ gesture(CLICK, 1, 1.1), gesture(CLICK, 1, 1.7), gesture(CLICK, 1, 2.0),\
+                                                           gesture(MULTI, 2, 2.0) ]
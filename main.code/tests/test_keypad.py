@@ -0,0 +1,86 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Keypad driver tests
+# The driver is polled on a virtual clock (like the scanner polls it), and the simulated keypad's keys are pressed and
+#  released between its scans: a key must last for the debounce scans, and a bounce is never a key event
+#################################
+
+# import the keypad driver, the simulated keypad, and the virtual clock
+from bomb_inputs import KeypadDriver, KeyEvent, PRESS, RELEASE
+from bomb_sim import SimKeypad
+from bomb_clock import VirtualClock
+# other imports
+import pytest
+
+# returns a keypad, its driver (idle scans every 20ms, 5ms while a key is down, and 2 scans of debounce), and the clock
+#  that polls it (the driver is started at 0)
+def makeDriver():
+    clock = VirtualClock()
+    keypad = SimKeypad()
+    driver = KeypadDriver(keypad, rate=200, idle_rate=50, debounce=2, clock=clock)
+    driver.start()
+    clock.loop("Keypad", lambda: (driver.poll(), driver.due())[1])
+    return clock, keypad, driver
+
+# a press and a release each count once they have lasted for two scans, and are timed when they were first scanned
+def test_press_and_release():
+    clock, keypad, driver = makeDriver()
+    clock.advance(0.03)
+    keypad.press(5)
+    # (seen by the idle scan at 40ms, then the driver scans every 5ms)
+    clock.advance(0.0425)
+    assert driver.take() == []
+    clock.advance(0.0475)
+    assert driver.take() == [ KeyEvent(PRESS, 5, pytest.approx(0.04)) ]
+    clock.advance(0.1025)
+    keypad.release(5)
+    clock.advance(0.2)
+    assert driver.take() == [ KeyEvent(RELEASE, 5, pytest.approx(0.105)) ]
+
+# a key that bounces up before its press has lasted for two scans isn't pressed
+def test_press_bounce():
+    clock, keypad, driver = makeDriver()
+    clock.advance(0.03)
+    keypad.press(5)
+    clock.advance(0.042)
+    keypad.release(5)
+    clock.advance(0.2)
+    assert driver.take() == []
+
+# a held key that bounces up for a single scan isn't released
+def test_release_bounce():
+    clock, keypad, driver = makeDriver()
+    clock.advance(0.03)
+    keypad.press("#")
+    clock.advance(0.1025)
+    keypad.release("#")
+    clock.advance(0.1065)
+    keypad.press("#")
+    clock.advance(0.2025)
+    assert [ event.kind for event in driver.take() ] == [ PRESS ]
+    keypad.release("#")
+    clock.advance(0.3)
+    assert driver.take() == [ KeyEvent(RELEASE, "#", pytest.approx(0.205)) ]
+
+# keys that are pressed together are each pressed, and the events wait in the queue until they are taken
+def test_type_ahead():
+    clock, keypad, driver = makeDriver()
+    clock.advance(0.03)
+    keypad.hold([ 1, 2 ])
+    clock.advance(0.1025)
+    keypad.hold([ 2 ])
+    clock.advance(0.2025)
+    keypad.release()
+    clock.advance(0.3)
+    events = driver.take()
+    assert [ (event.kind, event.key) for event in events ] == [ (PRESS, 1), (PRESS, 2), (RELEASE, 1), (RELEASE, 2) ]
+    assert [ event.time for event in events ] == sorted(event.time for event in events)
+
+# an idle keypad is scanned at the idle rate, and a held key at the keypad rate
+def test_scan_rates():
+    clock, keypad, driver = makeDriver()
+    clock.advance(1)
+    assert driver._scans == 51
+    keypad.press(7)
+    clock.advance(1.5)
+    assert 95 <= driver._scans - 51 <= 101
@@ -0,0 +1,54 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Numeric phase tests
+# The bitmask pin state check must agree with the original (string) one, for any pins, display length, and target
+#################################
+
+# import the numeric phase, the original one, and the simulated pins
+from bomb_phases import NumericPhase
+from bench_phases import LegacyPhase
+from bomb_inputs import SimPin
+# other imports
+import random
+import pytest
+
+# (the toggles and wires, more pins than that, and a display that is wider than the pins)
+@pytest.mark.parametrize("pins, display_length", [ (4, 4), (5, 5), (16, 16), (32, 32), (4, 6) ])
+def test_check_state_matches_legacy(pins, display_length):
+    rng = random.Random(pins * 100 + display_length)
+    component = [ SimPin() for i in range(pins) ]
+    legacy = LegacyPhase("Legacy", component, 0, display_length)
+    current = NumericPhase("Current", component, 0, display_length)
+    try:
+        for i in range(500):
+            for pin in component:
+                pin.value = (rng.random() < 0.5)
+            previous = rng.getrandbits(pins)
+            # the target changes now and then (and is sometimes wider than the pins, like the wires' initial one)
+            if (i % 10 == 0):
+                target = (rng.getrandbits(pins + 3) if i % 20 == 0 else rng.getrandbits(pins))
+            for phase in (legacy, current):
+                phase._value = phase._get_int_state()
+                phase._prev_value = previous
+                phase._target = target
+            assert legacy._get_int_state() == current._get_int_state()
+            assert current._check_state() == legacy._check_state(), (bin(current._value), bin(previous), bin(target))
+    finally:
+        legacy._edges.close()
+        current._edges.close()
+
+# a single pin that changes to its target is fine, and one that changes away from it is a strike
+def test_check_state_single_change():
+    component = [ SimPin(False) for i in range(5) ]
+    phase = NumericPhase("Wires", component, 0b10000, 5)
+    try:
+        phase._prev_value = phase._value
+        component[0].value = True
+        phase._value = phase._get_int_state()
+        assert phase._check_state()
+        phase._prev_value = phase._value
+        component[4].value = True
+        phase._value = phase._get_int_state()
+        assert not phase._check_state()
+    finally:
+        phase._edges.close()
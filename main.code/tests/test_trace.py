@@ -0,0 +1,62 @@
+#################################
+# CSC 102 Defuse the Bomb Project
+# Input trace tests
+# A scripted game is recorded, and its trace is played back (and recorded again) on the virtual clock: the replay must
+#  conclude the same, and read the same changes at the same (sub-millisecond) times
+#################################
+
+# import the bomb, the trace recorder and player, the simulated components, and the virtual clock
+from bomb_game import Bomb
+from bomb_trace import TraceRecorder, TracePlayer, keysValue, valueKeys, KEYS, KEYPAD, BUTTON
+from bomb_sim import SimLcd, SimAudio, SimScript, setupComponents
+from bomb_clock import VirtualClock
+# other imports
+import random
+import pytest
+
+# the scripted inputs: pushbutton clicks with contact bounces, the switches, and keys (one of them too short to count)
+#  (the keys are last, since a wrong one is a strike)
+STEPS = [ (0.5, "button", "1"), (0.5004, "button", "0"), (0.5007, "button", "1"), (0.8, "button", "0"),\
+          (1.5, "click", "0.05"), (1.58, "click", "0.05"), (2.0, "toggle", "0", "1"), (2.5, "wire", "2", "0"),\
+          (3.0, "toggle", "3", "1"), (3.5, "key", "2", "0.3"), (4.0, "key", "9", "0.0503"), (4.1, "key", "3", "0.004") ]
+
+# plays a headless game (on its own virtual clock) with the specified inputs, and records its trace to the file;
+#  returns the game's result
+def playGame(inputs, file):
+    clock = VirtualClock()
+    recorder = TraceRecorder(file, clock=clock)
+    bomb = Bomb(recorder.wrap(setupComponents()), SimLcd(clock), SimAudio(clock), inputs=inputs, recorder=recorder,\
+                clock=clock, debug=False)
+    bomb.start()
+    bomb.gui.mainloop()
+    recorder.stop()
+    return bomb.result(), bomb.puzzle_seed
+
+# the keypad values and keys convert both ways
+def test_keys_value():
+    assert keysValue([]) == 0
+    assert valueKeys(keysValue([ 1, "#", 0 ])) == [ 1, 0, "#" ]
+    assert valueKeys((1 << len(KEYS)) - 1) == KEYS
+
+# a replayed game concludes the same as the recorded one, and its trace is the same (through another generation too)
+def test_round_trip(tmp_path):
+    random.seed(1)
+    result, seed = playGame(SimScript(STEPS), tmp_path / "game.trace")
+    player = TracePlayer(tmp_path / "game.trace")
+    assert player.seed == seed and player.record is None
+    # (the keys, the pushbutton, and the sub-millisecond bounces were all read)
+    inputs = [ input for time, input, value in player.changes() ]
+    assert KEYPAD in inputs and inputs.count(BUTTON) >= 4
+    assert any(time * 1000 != round(time * 1000) for time, input, value in player.changes())
+
+    replayed, replayed_seed = playGame(player, tmp_path / "replay.trace")
+    assert replayed == result and replayed_seed == seed
+    assert TracePlayer(tmp_path / "replay.trace").changes() == player.changes()
+    playGame(TracePlayer(tmp_path / "replay.trace"), tmp_path / "replay2.trace")
+    assert (tmp_path / "replay2.trace").read_bytes() == (tmp_path / "game.trace").read_bytes()
+
+# a file that isn't a trace is refused
+def test_not_a_trace(tmp_path):
+    (tmp_path / "junk.trace").write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        TracePlayer(tmp_path / "junk.trace")